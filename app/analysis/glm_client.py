@@ -1,11 +1,107 @@
+import asyncio
+import hashlib
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional
 import os
+
+import requests
+from app.http_pool import get_session as _get_pooled_session
 from config import GLM_API_KEY, GLM_MODEL
 
+# orjson is ~3-10x faster than stdlib json on these payloads
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
+# Exact-match response cache shared by all GLMClient instances.
+# Wire reprints produce identical prompts minutes apart, so hits skip
+# the whole LLM round-trip. Bypassed for creative (high-temperature) calls.
+_RESPONSE_CACHE = OrderedDict()  # sha256 key -> (inserted_at, response)
+_RESPONSE_CACHE_LOCK = threading.Lock()
+RESPONSE_CACHE_MAX_SIZE = 4096
+RESPONSE_CACHE_TTL = 3600  # 1 hour
+CACHE_TEMPERATURE_CUTOFF = 0.3  # Only cache near-deterministic calls
+
+# Retry policy for rate-limited GLM calls
+GLM_MAX_RETRIES = 3
+GLM_RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt
+
+
+def _is_rate_limit(exc: Exception) -> bool:
+    """Whether an exception looks like an HTTP 429 / rate-limit error"""
+    message = str(exc)
+    return '429' in message or 'rate' in message.lower()
+
+
+def get_http_session() -> requests.Session:
+    """Get the process-wide pooled session for GLM HTTP calls
+
+    Delegates to app.http_pool so GLM shares the same keep-alive
+    connection pool (and its retry policy) as every other subsystem,
+    instead of maintaining a second session here.
+    """
+    return _get_pooled_session()
+
+
+def _cache_key(prompt: str, temperature: float) -> str:
+    """Stable cache key for a prompt/temperature pair"""
+    return hashlib.sha256(f"{temperature}:{prompt}".encode('utf-8')).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return a cached response if present and not expired"""
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        inserted_at, response = entry
+        if time.time() - inserted_at > RESPONSE_CACHE_TTL:
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return response
+
+
+def _cache_get_many(keys) -> Dict[str, str]:
+    """Return {key: response} for every fresh cached entry among keys
+
+    One lock acquisition for the whole batch instead of one per prompt.
+    """
+    hits = {}
+    now = time.time()
+    with _RESPONSE_CACHE_LOCK:
+        for key in keys:
+            entry = _RESPONSE_CACHE.get(key)
+            if entry is None:
+                continue
+            inserted_at, response = entry
+            if now - inserted_at > RESPONSE_CACHE_TTL:
+                del _RESPONSE_CACHE[key]
+                continue
+            _RESPONSE_CACHE.move_to_end(key)
+            hits[key] = response
+    return hits
+
+
+def _cache_put(key: str, response: str):
+    """Insert a response, evicting the least recently used entries"""
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = (time.time(), response)
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
 # Import your existing GLM client
 try:
     from app.glm_connection import _call_llm as your_glm_function
@@ -14,6 +110,35 @@ except ImportError:
     logger.warning("Your GLM function not found, using fallback")
     GLM_AVAILABLE = False
 
+# Forward max_tokens only if the wired GLM function takes it
+if GLM_AVAILABLE:
+    import inspect
+    try:
+        _GLM_ACCEPTS_MAX_TOKENS = 'max_tokens' in inspect.signature(your_glm_function).parameters
+    except (TypeError, ValueError):
+        _GLM_ACCEPTS_MAX_TOKENS = False
+else:
+    _GLM_ACCEPTS_MAX_TOKENS = False
+
+# Mock-response dispatch: one case-insensitive regex pass over the
+# prompt instead of repeated .lower() + substring scans, and the
+# canned responses are built once at import.
+_MOCK_RE = re.compile(r'impact score|translate|thai', re.IGNORECASE)
+
+_MOCK_IMPACT_RESPONSE = _json_dumps({
+    "tickers": ["AAPL", "MSFT"],
+    "impact_score": 7,
+    "price_impact": "positive",
+    "category": "tech-ai",
+    "reasoning": "Mock: Tech innovation drives positive sentiment",
+    "market_significance": "high"
+})
+
+_MOCK_TRANSLATE_RESPONSE = """[1.] | "Tech innovation drives market growth" | นวัตกรรมเทคโนโลยีขับเคลื่อนการเติบโตของตลาดหุ้น สะท้อนความหวังในภาคเทคโนโลยี | AAPL, MSFT | Mock Source | Positive price impact | 7/10"""
+
+_MOCK_DEFAULT_RESPONSE = "Mock GLM response - please configure proper GLM connection"
+
+
 class GLMClient:
     """Client for GLM API calls using your existing _call_llm function"""
 
@@ -21,44 +146,112 @@ class GLMClient:
         self.api_key = api_key or GLM_API_KEY
         self.model = GLM_MODEL
 
+        # Pooled keep-alive session for any HTTP-backed GLM transport;
+        # a real _call_llm implementation should POST through this
+        self.http = get_http_session()
+
         if not GLM_AVAILABLE:
             logger.warning("⚠️ GLM not available - using mock responses")
             self.mock_mode = True
         else:
             self.mock_mode = False
 
-    def call_glm(self, prompt: str, temperature: float = 0.1) -> str:
-        """Call GLM API using your existing function"""
+    def call_glm(self, prompt: str, temperature: float = 0.1,
+                 system_prefix: str = None, max_tokens: int = None) -> str:
+        """Call GLM API using your existing function
+
+        system_prefix, when given, is prepended unchanged so every call
+        sharing it presents an identical leading token sequence - this
+        lets prefix-caching backends reuse the cached prefill.
+
+        max_tokens caps generation length for near-deterministic calls
+        whose output size is known (short JSON, ranking lists), cutting
+        generation time versus the server default.
+        """
+        if system_prefix:
+            prompt = system_prefix + prompt
+
         if self.mock_mode:
             return self._mock_response(prompt)
 
-        try:
-            # Use your existing _call_llm function
-            response = your_glm_function(prompt)
-            return str(response) if response else ""
+        cacheable = temperature <= CACHE_TEMPERATURE_CUTOFF
+        if cacheable:
+            key = _cache_key(f"{max_tokens}:{prompt}", temperature)
+            cached = _cache_get(key)
+            if cached is not None:
+                logger.info("GLM cache hit - skipping API call")
+                return cached
 
-        except Exception as e:
-            logger.error(f"GLM API call failed: {e}")
-            # Fallback to mock response
-            return self._mock_response(prompt)
+        # Retry rate-limited calls with exponential backoff before
+        # giving up - the mock fallback is reserved for genuine
+        # failures, not for 429s that a short wait would clear
+        delay = GLM_RETRY_BASE_DELAY
+        for attempt in range(GLM_MAX_RETRIES):
+            try:
+                # Use your existing _call_llm function
+                if max_tokens and _GLM_ACCEPTS_MAX_TOKENS:
+                    response = your_glm_function(prompt, max_tokens=max_tokens)
+                else:
+                    response = your_glm_function(prompt)
+                result = str(response) if response else ""
+                if cacheable and result:
+                    _cache_put(key, result)
+                return result
+
+            except Exception as e:
+                if attempt < GLM_MAX_RETRIES - 1 and _is_rate_limit(e):
+                    logger.warning("GLM rate limited, retrying in %.1fs: %s", delay, e)
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                logger.error(f"GLM API call failed: {e}")
+                # Fallback to mock response
+                return self._mock_response(prompt)
+
+    def call_glm_batch(self, prompts, temperature: float = 0.1,
+                       max_tokens: int = None) -> list:
+        """Resolve several prompts with one up-front cache pass
+
+        Hashes every prompt first and looks all keys up under a single
+        lock acquisition, then issues GLM calls only for the misses.
+        Returns responses in the same order as prompts.
+        """
+        results = [None] * len(prompts)
+
+        if not self.mock_mode and temperature <= CACHE_TEMPERATURE_CUTOFF:
+            keys = [_cache_key(f"{max_tokens}:{p}", temperature) for p in prompts]
+            hits = _cache_get_many(keys)
+            if hits:
+                logger.info(f"GLM cache: {len(hits)}/{len(prompts)} batch hits")
+            for i, key in enumerate(keys):
+                results[i] = hits.get(key)
+
+        for i, prompt in enumerate(prompts):
+            if results[i] is None:
+                results[i] = self.call_glm(prompt, temperature, max_tokens=max_tokens)
+
+        return results
+
+    async def _acall_glm(self, prompt: str, temperature: float = 0.1,
+                         max_tokens: int = None) -> str:
+        """Async wrapper around call_glm
+
+        Rate-limit backoff lives in call_glm, wrapped directly around
+        the real GLM call - call_glm never raises, so retrying out
+        here would be dead code.
+        """
+        return await asyncio.to_thread(
+            self.call_glm, prompt, temperature, max_tokens=max_tokens
+        )
 
     def _mock_response(self, prompt: str) -> str:
         """Mock response when GLM is not available"""
-        if "impact score" in prompt.lower():
-            return json.dumps({
-                "tickers": ["AAPL", "MSFT"],
-                "impact_score": 7,
-                "price_impact": "positive",
-                "category": "tech-ai",
-                "reasoning": "Mock: Tech innovation drives positive sentiment",
-                "market_significance": "high"
-            })
-
-        elif "translate" in prompt.lower() or "thai" in prompt.lower():
-            return """[1.] | "Tech innovation drives market growth" | นวัตกรรมเทคโนโลยีขับเคลื่อนการเติบโตของตลาดหุ้น สะท้อนความหวังในภาคเทคโนโลยี | AAPL, MSFT | Mock Source | Positive price impact | 7/10"""
-
-        else:
-            return "Mock GLM response - please configure proper GLM connection"
+        match = _MOCK_RE.search(prompt)
+        if match is None:
+            return _MOCK_DEFAULT_RESPONSE
+        if match.group(0).lower() == "impact score":
+            return _MOCK_IMPACT_RESPONSE
+        return _MOCK_TRANSLATE_RESPONSE
 
 def test_glm_connection():
     """Test GLM connection with simple prompt"""
@@ -1,11 +1,89 @@
+import asyncio
 import json
 import logging
+from collections import Counter
 from typing import Dict, List, Optional
 from app.analysis.glm_client import GLMClient
-from config import LARGE_CAP_STOCKS, MIN_IMPACT_SCORE
+from config import LARGE_CAP_STOCKS, LARGE_CAP_STOCK_SET, MIN_IMPACT_SCORE
+
+# orjson is ~3-10x faster than stdlib json on these payloads
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# raw_decode stops at the end of the first valid document, so we get the
+# first balanced object in one pass - no rfind, and no confusion when a
+# quoted string contains braces or trailing prose follows the JSON.
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_first_json(text: str) -> Optional[Dict]:
+    """Return the first balanced JSON object embedded in text, or None"""
+    start = text.find('{')
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+
+# O(1) membership instead of list scans in the per-article scoring path
+_LARGE_CAP_SET = LARGE_CAP_STOCK_SET
+_RELIABLE_SOURCES = ('bloomberg', 'reuters', 'wsj', 'cnbc', 'yahoo finance')
+
+# Max GLM calls in flight at once (rate-limit protection)
+MAX_CONCURRENT_GLM_CALLS = 8
+
+# Articles packed into one GLM prompt by analyze_batch
+BATCH_SIZE = 5
+
+# Article content budget for analysis prompts (chars)
+MAX_CONTENT_CHARS = 300
+
+# Pre-joined priority ticker list (static across all prompts)
+_LARGE_CAP_STR = ', '.join(LARGE_CAP_STOCKS[:10])
+
+# Compressed analysis prompt, split so every call shares an identical
+# leading byte sequence: static instructions first, per-article data last.
+# Providers with prompt-prefix caching (Anthropic-compatible endpoints,
+# vLLM-style serving) can then reuse the prefix KV-cache across articles.
+ANALYSIS_STATIC_PREFIX = """
+Analyze this financial news for US stock market impact:
+
+Return JSON:
+{
+    "tickers": ["TICKER1", "TICKER2"],
+    "impact_score": 8,
+    "price_impact": "positive",
+    "category": "earnings|m&a|tech-ai|macro|trading",
+    "reasoning": "Brief explanation of impact reasoning",
+    "market_significance": "high|medium|low"
+}
+
+Guidelines:
+- tickers: all mentioned (prioritize: """ + _LARGE_CAP_STR + """)
+- impact score 1-10: 10=market-changing (Fed, huge M&A), 8-9=high (major earnings, big AI news), 6-7=medium (launches, upgrades), 5=moderate, 1-4=low
+- price_impact: positive|negative|neutral
+- category: earnings=results/revenue, m&a=mergers/IPOs, tech-ai=tech/AI, macro=economic/Fed/market-wide, trading=movements/volume
+- market_significance: effect on broader market
+- Priority: large-caps, earnings, M&A, tech/AI, Fed/macro news affecting S&P500
+"""
+
+ANALYSIS_ARTICLE_SUFFIX = """
+HEADLINE: {title}
+SUMMARY: {description}
+SOURCE: {source}
+FULL CONTENT: {content}
+"""
+
 class NewsImpactAnalyzer:
     """Analyze news impact using GLM"""
 
@@ -18,8 +96,8 @@ class NewsImpactAnalyzer:
             # Prepare the analysis prompt
             prompt = self._build_analysis_prompt(article)
 
-            # Call GLM for analysis
-            response = self.glm_client.call_glm(prompt, temperature=0.1)
+            # Call GLM for analysis (output is short JSON - cap generation)
+            response = self.glm_client.call_glm(prompt, temperature=0.1, max_tokens=256)
 
             # Parse the JSON response
             analysis = self._parse_analysis_response(response, article)
@@ -34,51 +112,179 @@ class NewsImpactAnalyzer:
             return None
 
     def analyze_multiple_articles(self, articles: List[Dict]) -> List[Dict]:
-        """Analyze multiple articles and filter by impact score"""
+        """Analyze multiple articles concurrently and filter by impact score"""
+        if not articles:
+            return []
+
+        try:
+            return asyncio.run(self.analyze_multiple_articles_async(articles))
+        except RuntimeError:
+            # Called from inside a running event loop - fall back to sequential
+            logger.warning("Event loop already running, analyzing sequentially")
+            return self._analyze_sequential(articles)
+
+    async def analyze_multiple_articles_async(self, articles: List[Dict]) -> List[Dict]:
+        """Analyze multiple articles with concurrent GLM calls"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GLM_CALLS)
+
+        async def _analyze_one(article: Dict) -> Optional[Dict]:
+            async with semaphore:
+                prompt = self._build_analysis_prompt(article)
+                response = await self.glm_client._acall_glm(prompt, temperature=0.1, max_tokens=256)
+                analysis = self._parse_analysis_response(response, article)
+
+                if analysis and analysis.get('impact_score', 0) >= MIN_IMPACT_SCORE:
+                    return analysis
+                return None
+
+        logger.info("Analyzing %d articles concurrently (max %d in flight)...", len(articles), MAX_CONCURRENT_GLM_CALLS)
+        results = await asyncio.gather(
+            *(_analyze_one(article) for article in articles),
+            return_exceptions=True
+        )
+
         analyzed_articles = []
+        for article, result in zip(articles, results):
+            title = article.get('title', 'Unknown')[:50]
+            if isinstance(result, Exception):
+                logger.error(f"Error analyzing article '{title}...': {result}")
+            elif result:
+                analyzed_articles.append(result)
+                logger.info("  ✅ Impact Score: %s - %s...", result.get('impact_score', 0), title)
+            else:
+                logger.info("  ❌ Low impact or analysis failed - %s...", title)
+
+        return analyzed_articles
+
+    def _analyze_sequential(self, articles: List[Dict]) -> List[Dict]:
+        """Sequential fallback when an event loop is already running
+
+        Builds every prompt up front and goes through call_glm_batch so
+        all cache keys are checked in one pass before any GLM call.
+        """
+        prompts = [self._build_analysis_prompt(a) for a in articles]
+        responses = self.glm_client.call_glm_batch(prompts, temperature=0.1, max_tokens=256)
 
-        for i, article in enumerate(articles):
-            logger.info(f"Analyzing article {i+1}/{len(articles)}: {article.get('title', 'Unknown')[:50]}...")
+        analyzed_articles = []
+        for i, (article, response) in enumerate(zip(articles, responses)):
+            logger.info("Analyzing article %d/%d: %.50s...", i + 1, len(articles), article.get('title', 'Unknown'))
 
-            analysis = self.analyze_single_article(article)
-            if analysis:
+            analysis = self._parse_analysis_response(response, article)
+            if analysis and analysis.get('impact_score', 0) >= MIN_IMPACT_SCORE:
                 analyzed_articles.append(analysis)
-                logger.info(f"  ✅ Impact Score: {analysis.get('impact_score', 0)}")
+                logger.info("  ✅ Impact Score: %s", analysis.get('impact_score', 0))
             else:
-                logger.info(f"  ❌ Low impact or analysis failed")
+                logger.info("  ❌ Low impact or analysis failed")
 
         return analyzed_articles
 
-    def _build_analysis_prompt(self, article: Dict) -> str:
-        """Build prompt for GLM analysis"""
-        title = article.get('title', '')
-        description = article.get('description', '')
-        source = article.get('source', 'Unknown')
-        content = article.get('content', '')
+    def analyze_batch(self, articles: List[Dict]) -> List[Dict]:
+        """Analyze articles in batches of BATCH_SIZE per GLM call
 
-        # Limit content length to avoid token limits
-        if len(content) > 500:
-            content = content[:500] + "..."
+        Packs several articles into one prompt so the shared guideline
+        block is sent once per batch instead of once per article.
+        Falls back to per-article analysis for any batch whose JSON
+        response cannot be parsed.
+        """
+        analyzed_articles = []
+
+        for start in range(0, len(articles), BATCH_SIZE):
+            chunk = articles[start:start + BATCH_SIZE]
+            logger.info("Analyzing batch of %d articles (%d-%d/%d)...", len(chunk), start + 1, start + len(chunk), len(articles))
+
+            batch_results = self._analyze_chunk(chunk)
+            if batch_results is None:
+                # Batch parse failed - analyze each article individually
+                logger.warning("Batch analysis failed, falling back to per-article analysis")
+                batch_results = [self.analyze_single_article(a) for a in chunk]
+
+            analyzed_articles.extend(r for r in batch_results if r)
+
+        return analyzed_articles
+
+    def _analyze_chunk(self, chunk: List[Dict]) -> Optional[List[Optional[Dict]]]:
+        """Analyze one batch of articles with a single GLM call"""
+        try:
+            prompt = self._build_batch_analysis_prompt(chunk)
+            response = self.glm_client.call_glm(prompt, temperature=0.1,
+                                                max_tokens=256 * BATCH_SIZE)
+
+            # Locate the JSON array (tolerate leading/trailing prose)
+            json_start = response.find('[')
+            json_end = response.rfind(']') + 1
+            if json_start == -1 or json_end == 0:
+                logger.error(f"No JSON array found in batch response: {response[:100]}...")
+                return None
+
+            analyses = _json_loads(response[json_start:json_end])
+            if not isinstance(analyses, list):
+                return None
+
+            # Dispatch analyses back to articles by id
+            results: List[Optional[Dict]] = [None] * len(chunk)
+            for analysis_data in analyses:
+                if not isinstance(analysis_data, dict):
+                    continue
+                article_id = analysis_data.pop('id', None)
+                if not isinstance(article_id, int) or not (1 <= article_id <= len(chunk)):
+                    continue
+
+                article = chunk[article_id - 1]
+                if analysis_data.get('impact_score', 0) >= MIN_IMPACT_SCORE:
+                    results[article_id - 1] = {
+                        'original_article': article,
+                        'analysis': analysis_data,
+                        'combined_score': self._calculate_combined_score(analysis_data, article)
+                    }
+
+            return results
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Batch JSON parsing error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error analyzing batch: {e}")
+            return None
+
+    def _build_batch_analysis_prompt(self, articles: List[Dict]) -> str:
+        """Build a single prompt covering several articles"""
+        article_blocks = []
+        for i, article in enumerate(articles, 1):
+            content = article.get('content', '')
+            if len(content) > 500:
+                content = content[:500] + "..."
+
+            article_blocks.append(
+                f"[{i}]\n"
+                f"HEADLINE: {article.get('title', '')}\n"
+                f"SUMMARY: {article.get('description', '')}\n"
+                f"SOURCE: {article.get('source', 'Unknown')}\n"
+                f"FULL CONTENT: {content}"
+            )
+
+        articles_text = "\n\n".join(article_blocks)
 
         prompt = f"""
-Analyze this financial news for US stock market impact:
+Analyze these {len(articles)} financial news articles for US stock market impact:
 
-HEADLINE: {title}
-SUMMARY: {description}
-SOURCE: {source}
-FULL CONTENT: {content}
+{articles_text}
 
-Task: Analyze market impact and provide structured analysis.
+Task: Analyze market impact for EACH article above.
 
-Please provide the analysis as JSON in this exact format:
-{{
-    "tickers": ["TICKER1", "TICKER2"],
-    "impact_score": 8,
-    "price_impact": "positive",
-    "category": "earnings|m&a|tech-ai|macro|trading",
-    "reasoning": "Brief explanation of impact reasoning",
-    "market_significance": "high|medium|low"
-}}
+Please provide the analysis as a JSON array in this exact format:
+[
+    {{
+        "id": 1,
+        "tickers": ["TICKER1", "TICKER2"],
+        "impact_score": 8,
+        "price_impact": "positive",
+        "category": "earnings|m&a|tech-ai|macro|trading",
+        "reasoning": "Brief explanation of impact reasoning",
+        "market_significance": "high|medium|low"
+    }}
+]
+
+The "id" field must match the article number [1]..[{len(articles)}].
 
 Analysis Guidelines:
 1. Ticker Extraction: Find all stock tickers mentioned (prioritize: {', '.join(LARGE_CAP_STOCKS[:10])})
@@ -97,32 +303,36 @@ Analysis Guidelines:
    - trading: Trading updates, stock movements, volume
 5. Market Significance: How this affects broader market
 
-Priority Factors:
-- Large-cap stocks have higher impact
-- Earnings announcements are high priority
-- M&A activities are very high impact
-- Tech/AI developments in 2024 are high impact
-- Fed/macro news affecting S&P500 is significant
-
-Return ONLY the JSON response, no additional text.
+Return ONLY the JSON array, no additional text.
 """
 
         return prompt
 
+    def _build_analysis_prompt(self, article: Dict) -> str:
+        """Build prompt for GLM analysis"""
+        content = article.get('content', '')
+
+        # Limit content length to avoid token limits
+        if len(content) > MAX_CONTENT_CHARS:
+            content = content[:MAX_CONTENT_CHARS] + "..."
+
+        return ANALYSIS_STATIC_PREFIX + ANALYSIS_ARTICLE_SUFFIX.format(
+            title=article.get('title', ''),
+            description=article.get('description', ''),
+            source=article.get('source', 'Unknown'),
+            content=content
+        )
+
     def _parse_analysis_response(self, response: str, article: Dict) -> Optional[Dict]:
         """Parse GLM response and combine with article data"""
         try:
-            # Try to extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
+            # Extract the first balanced JSON object from the response
+            analysis_data = _extract_first_json(response)
 
-            if json_start == -1 or json_end == 0:
+            if analysis_data is None:
                 logger.error(f"No JSON found in response: {response[:100]}...")
                 return None
 
-            json_str = response[json_start:json_end]
-            analysis_data = json.loads(json_str)
-
             # Combine with original article data
             combined_data = {
                 'original_article': article,
@@ -146,14 +356,13 @@ Return ONLY the JSON response, no additional text.
 
         # Boost score for large-cap stocks
         tickers = analysis.get('tickers', [])
-        large_cap_count = sum(1 for ticker in tickers if ticker in LARGE_CAP_STOCKS)
+        large_cap_count = sum(1 for ticker in tickers if ticker in _LARGE_CAP_SET)
         if large_cap_count > 0:
             base_score += min(large_cap_count, 2)  # Max +2 for multiple large-caps
 
         # Boost for reliable sources
         source = article.get('source', '').lower()
-        reliable_sources = ['bloomberg', 'reuters', 'wsj', 'cnbc', 'yahoo finance']
-        if any(rel in source for rel in reliable_sources):
+        if any(rel in source for rel in _RELIABLE_SOURCES):
             base_score += 1
 
         # Cap at 10
@@ -174,25 +383,20 @@ Return ONLY the JSON response, no additional text.
         high_impact = sum(1 for a in analyzed_articles if a['analysis']['impact_score'] >= 8)
         medium_impact = sum(1 for a in analyzed_articles if 5 <= a['analysis']['impact_score'] <= 7)
 
-        # Count categories
-        categories = {}
-        for article in analyzed_articles:
-            category = article['analysis'].get('category', 'unknown')
-            categories[category] = categories.get(category, 0) + 1
-
-        # Count tickers
-        ticker_counts = {}
-        for article in analyzed_articles:
-            tickers = article['analysis'].get('tickers', [])
-            for ticker in tickers:
-                ticker_counts[ticker] = ticker_counts.get(ticker, 0) + 1
-
-        top_tickers = sorted(ticker_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # C-accelerated counting instead of manual dict.get loops
+        categories = Counter(
+            a['analysis'].get('category', 'unknown') for a in analyzed_articles
+        )
+        ticker_counts = Counter(
+            ticker
+            for a in analyzed_articles
+            for ticker in a['analysis'].get('tickers', [])
+        )
 
         return {
             'total_analyzed': total,
             'high_impact': high_impact,
             'medium_impact': medium_impact,
-            'categories': categories,
-            'top_tickers': top_tickers
+            'categories': dict(categories),
+            'top_tickers': ticker_counts.most_common(10)
         }
\ No newline at end of file
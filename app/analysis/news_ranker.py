@@ -1,9 +1,20 @@
 import logging
+import re
+from collections import Counter
 from typing import List, Dict, Tuple
 from app.analysis.glm_client import GLMClient
 
 logger = logging.getLogger(__name__)
 
+# Matches GLM ranking lines like "Rank 1: Article [3] - <reasoning>"
+_RANK_RE = re.compile(r'^Rank\s+(\d+):\s*Article\s*\[(\d+)\]\s*-?\s*(.*)$')
+
+# Strips the boilerplate lead-in GLM puts before the actual reasoning
+_REASONING_PREFIX_RE = re.compile(
+    r'^(?:Most|Second most|Third most)?\s*important\s+because\s+',
+    re.IGNORECASE
+)
+
 class NewsRanker:
     """Rank news articles by importance using GLM"""
 
@@ -66,7 +77,7 @@ Rank 3: Article [Z] - Third most important because [brief reasoning]
 Focus on what moves the entire market, not just single stocks unless they're large-caps.
 """
 
-            response = self.glm_client.call_glm(prompt, temperature=0.2)
+            response = self.glm_client.call_glm(prompt, temperature=0.2, max_tokens=512)
             ranking_result = self._parse_ranking_response(response, articles)
 
             return ranking_result
@@ -101,32 +112,21 @@ Focus on what moves the entire market, not just single stocks unless they're lar
     def _parse_ranking_response(self, response: str, articles: List[Dict]) -> List[Dict]:
         """Parse GLM ranking response"""
         try:
-            lines = response.split('\n')
             ranking_mapping = {}
 
-            for line in lines:
-                if line.strip().startswith('Rank '):
-                    try:
-                        # Extract rank and article index
-                        parts = line.split(']')
-                        if len(parts) >= 2:
-                            rank_part = parts[0]
-                            article_index_str = rank_part.split('[')[1]
-                            article_index = int(article_index_str) - 1
-
-                            # Extract reasoning
-                            reasoning_part = ' '.join(parts[1:]).replace(' - Most important because ', '').replace(' - Second most important because ', '').replace(' - Third most important because ', '')
-                            reasoning_part = reasoning_part.replace(' because ', ' ', 1).strip()
-
-                            if 0 <= article_index < len(articles):
-                                # Add GLM ranking info to article
-                                articles[article_index]['glm_rank'] = len(ranking_mapping) + 1
-                                articles[article_index]['glm_reasoning'] = reasoning_part[:200]  # Limit reasoning length
-                                ranking_mapping[article_index] = len(ranking_mapping) + 1
-
-                    except (ValueError, IndexError) as e:
-                        logger.error(f"Error parsing ranking line: {line} - {e}")
-                        continue
+            for line in response.splitlines():
+                match = _RANK_RE.match(line.strip())
+                if not match:
+                    continue
+
+                article_index = int(match.group(2)) - 1
+                reasoning = _REASONING_PREFIX_RE.sub('', match.group(3)).strip()
+
+                if 0 <= article_index < len(articles):
+                    # Add GLM ranking info to article
+                    articles[article_index]['glm_rank'] = len(ranking_mapping) + 1
+                    articles[article_index]['glm_reasoning'] = reasoning[:200]  # Limit reasoning length
+                    ranking_mapping[article_index] = len(ranking_mapping) + 1
 
             # Sort articles by GLM rank, fallback to combined score
             ranked_articles = []
@@ -147,7 +147,7 @@ Focus on what moves the entire market, not just single stocks unless they're lar
             # Combine ranked and unranked
             final_ranked = ranked_articles + unranked_articles
 
-            logger.info(f"GLM ranked {len(ranked_articles)} articles, {len(unranked_articles)} fallback")
+            logger.info("GLM ranked %d articles, %d fallback", len(ranked_articles), len(unranked_articles))
             return final_ranked
 
         except Exception as e:
@@ -161,22 +161,19 @@ Focus on what moves the entire market, not just single stocks unless they're lar
 
         top_5 = ranked_articles[:5]
 
-        # Count categories in top 5
-        categories = {}
-        tickers = {}
-
-        for article in top_5:
-            category = article.get('analysis', {}).get('category', 'unknown')
-            article_tickers = article.get('analysis', {}).get('tickers', [])
-
-            categories[category] = categories.get(category, 0) + 1
-
-            for ticker in article_tickers:
-                tickers[ticker] = tickers.get(ticker, 0) + 1
+        # Count categories and tickers in top 5 (C-accelerated Counter)
+        categories = Counter(
+            a.get('analysis', {}).get('category', 'unknown') for a in top_5
+        )
+        tickers = Counter(
+            ticker
+            for a in top_5
+            for ticker in a.get('analysis', {}).get('tickers', [])
+        )
 
         return {
             'total': len(ranked_articles),
-            'top_5_categories': categories,
-            'top_5_tickers': tickers,
+            'top_5_categories': dict(categories),
+            'top_5_tickers': dict(tickers),
             'average_score': sum(a.get('combined_score', 0) for a in ranked_articles) / len(ranked_articles)
         }
\ No newline at end of file
@@ -3,29 +3,190 @@ Flask API Server for LINE Mini App
 Provides REST endpoints for news data
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+import json
 import logging
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional
 
 # Import pipeline components
 from app.pipeline.stock_news_pipeline import StockNewsPipeline
 
+# orjson serializes the large news arrays ~3-10x faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for LIFF
 
-# Initialize pipeline
-pipeline = StockNewsPipeline()
+if ORJSON_AVAILABLE:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """Flask JSON provider backed by orjson"""
+
+        def dumps(self, obj, **kwargs) -> str:
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
+# Pipeline is constructed lazily on first use rather than at import.
+# Importing this module stays cheap (pre-fork servers can --preload and
+# share the code pages copy-on-write) and CLI tools that only need the
+# Flask app don't pay for collector/GLM setup.
+_pipeline: Optional[StockNewsPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> StockNewsPipeline:
+    """Get the process-wide pipeline, creating it on first use"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                logger.info("[INIT] Initializing news pipeline...")
+                _pipeline = StockNewsPipeline()
+    return _pipeline
+
+# In-memory cache (replace with Redis in production).
+# Copy-on-swap: readers grab the _snapshot reference once (atomic in
+# CPython) and work lock-free on immutable data; refreshes build a whole
+# new snapshot off-path and swap the reference in one assignment.
+@dataclass(frozen=True)
+class NewsSnapshot:
+    last_update: Optional[datetime]
+    news: tuple
+    ticker_index: dict
+    category_index: dict
+    by_impact: tuple       # articles sorted ascending by impact_score
+    impact_keys: tuple     # parallel impact scores for bisect
+
+
+_snapshot = NewsSnapshot(None, (), {}, {}, (), ())
+
+
+def _annotate_articles(articles):
+    """Precompute lowercased fields so request handlers avoid per-request .lower() calls"""
+    for article in articles:
+        article['_title_lc'] = article.get('original_article', {}).get('title', '').lower()
+        article['_tickers_lc'] = tuple(
+            t.lower() for t in article.get('analysis', {}).get('tickers', [])
+        )
+    return articles
+
+
+def _build_ticker_index(articles):
+    """Build ticker -> article index list so ticker lookups avoid a full scan"""
+    index = {}
+    for i, article in enumerate(articles):
+        for ticker in article.get('analysis', {}).get('tickers', []):
+            index.setdefault(ticker.upper(), []).append(i)
+    return index
+
+
+def _build_category_index(articles):
+    """Build category -> article index list for the filter endpoint"""
+    index = {}
+    for i, article in enumerate(articles):
+        category = article.get('analysis', {}).get('category', '').lower()
+        if category:
+            index.setdefault(category, []).append(i)
+    return index
+
+
+def _update_news_cache(articles, updated_at):
+    """Build a fresh snapshot and atomically swap it in"""
+    global _snapshot
+    news = tuple(_annotate_articles(articles))
+    by_impact = tuple(sorted(
+        news, key=lambda a: a.get('analysis', {}).get('impact_score', 0)
+    ))
+    impact_keys = tuple(
+        a.get('analysis', {}).get('impact_score', 0) for a in by_impact
+    )
+    _snapshot = NewsSnapshot(updated_at, news,
+                             _build_ticker_index(news),
+                             _build_category_index(news),
+                             by_impact, impact_keys)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize one object to JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _stream_news_response(snap, cached, stats=None):
+    """Stream the news payload article-by-article
+
+    Emits the envelope first and each article as its own chunk, so TTFB
+    does not wait on serializing the whole cache and no single giant
+    JSON blob is materialized in memory.
+    """
+    def _generate():
+        envelope = {'success': True, 'cached': cached, 'count': len(snap.news)}
+        if stats:
+            envelope['stats'] = stats
+        # Re-open the envelope to append the streamed news array
+        yield _json_bytes(envelope)[:-1] + b',"news":['
+
+        for i, article in enumerate(snap.news):
+            if i:
+                yield b','
+            yield _json_bytes(article)
+
+        yield b']}'
+
+    return Response(stream_with_context(_generate()), mimetype='application/json')
 
-# In-memory cache (replace with Redis in production)
-news_cache = {
-    'last_update': None,
-    'news': []
-}
+
+# Single-flight guard: when N clients miss the cache at once, only the
+# first runs the pipeline; the rest wait on the same Future.
+_inflight: Optional[Future] = None
+_inflight_lock = threading.Lock()
+
+
+def _run_pipeline_coalesced(hours=3):
+    """Run the pipeline, coalescing concurrent callers onto one run"""
+    global _inflight
+
+    with _inflight_lock:
+        future = _inflight
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight = future
+
+    if not is_owner:
+        logger.info("[CACHE] Waiting on in-flight pipeline run")
+        return future.result()
+
+    try:
+        results = get_pipeline().run_complete_pipeline(hours=hours)
+        future.set_result(results)
+        return results
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight = None
 
 @app.route('/')
 def home():
@@ -47,36 +208,25 @@ def get_latest_news():
     try:
         # Check cache (refresh every 15 minutes)
         now = datetime.now()
-        if (news_cache['last_update'] and
-            (now - news_cache['last_update']) < timedelta(minutes=15) and
-            news_cache['news']):
+        snap = _snapshot
+        if (snap.last_update and
+            (now - snap.last_update) < timedelta(minutes=15) and
+            snap.news):
             logger.info("[CACHE] Returning cached news")
-            return jsonify({
-                'success': True,
-                'cached': True,
-                'count': len(news_cache['news']),
-                'news': news_cache['news']
-            })
+            return _stream_news_response(snap, cached=True)
 
-        # Run pipeline
+        # Run pipeline (coalesced: concurrent misses share one run)
         logger.info("[API] Running news pipeline...")
-        results = pipeline.run_complete_pipeline(hours=3)
+        results = _run_pipeline_coalesced(hours=3)
 
         if results.get('success'):
             # Update cache
-            news_cache['last_update'] = now
-            news_cache['news'] = results.get('analyzed_articles', [])
+            _update_news_cache(results.get('analyzed_articles', []), now)
 
-            return jsonify({
-                'success': True,
-                'cached': False,
-                'count': len(news_cache['news']),
-                'news': news_cache['news'],
-                'stats': {
-                    'collected': results.get('raw_collected', 0),
-                    'analyzed': results.get('analyzed_count', 0),
-                    'processing_time': results.get('processing_time', 0)
-                }
+            return _stream_news_response(_snapshot, cached=False, stats={
+                'collected': results.get('raw_collected', 0),
+                'analyzed': results.get('analyzed_count', 0),
+                'processing_time': results.get('processing_time', 0)
             })
         else:
             return jsonify({
@@ -103,20 +253,21 @@ def search_news():
             }), 400
 
         # Search in cache
-        if not news_cache['news']:
+        snap = _snapshot
+        if not snap.news:
             return jsonify({
                 'success': True,
                 'count': 0,
                 'news': []
             })
 
-        # Filter news
+        # Filter news using the precomputed lowercase fields
         filtered = []
-        for article in news_cache['news']:
-            title = article.get('original_article', {}).get('title', '').lower()
-            tickers = [t.lower() for t in article.get('analysis', {}).get('tickers', [])]
+        for article in snap.news:
+            title = article.get('_title_lc', '')
+            tickers = article.get('_tickers_lc', ())
 
-            if query in title or query in ' '.join(tickers):
+            if query in title or any(query in ticker for ticker in tickers):
                 filtered.append(article)
 
         return jsonify({
@@ -139,7 +290,8 @@ def get_ticker_news(symbol):
     try:
         symbol = symbol.upper()
 
-        if not news_cache['news']:
+        snap = _snapshot
+        if not snap.news:
             return jsonify({
                 'success': True,
                 'ticker': symbol,
@@ -147,12 +299,8 @@ def get_ticker_news(symbol):
                 'news': []
             })
 
-        # Filter by ticker
-        ticker_news = []
-        for article in news_cache['news']:
-            tickers = [t.upper() for t in article.get('analysis', {}).get('tickers', [])]
-            if symbol in tickers:
-                ticker_news.append(article)
+        # Dict lookup in the prebuilt inverted index instead of a full scan
+        ticker_news = [snap.news[i] for i in snap.ticker_index.get(symbol, [])]
 
         return jsonify({
             'success': True,
@@ -178,30 +326,32 @@ def filter_news():
         price_impact = request.args.get('price_impact', '').lower()  # positive/negative/neutral
         category = request.args.get('category', '').lower()
 
-        if not news_cache['news']:
+        snap = _snapshot
+        if not snap.news:
             return jsonify({
                 'success': True,
                 'count': 0,
                 'news': []
             })
 
-        # Apply filters
-        filtered = news_cache['news']
-
-        # Impact score filter
-        filtered = [a for a in filtered
-                   if min_impact <= a.get('analysis', {}).get('impact_score', 0) <= max_impact]
+        # Start from the category index when a category filter is given -
+        # dict lookup instead of scanning the whole cache
+        if category:
+            filtered = [snap.news[i] for i in snap.category_index.get(category, [])]
+            filtered = [a for a in filtered
+                       if min_impact <= a.get('analysis', {}).get('impact_score', 0) <= max_impact]
+        else:
+            # Impact range via bisect over the pre-sorted snapshot:
+            # O(log N + k) instead of scanning every article
+            lo = bisect_left(snap.impact_keys, min_impact)
+            hi = bisect_right(snap.impact_keys, max_impact)
+            filtered = list(snap.by_impact[lo:hi])
 
         # Price impact filter
         if price_impact:
             filtered = [a for a in filtered
                        if a.get('analysis', {}).get('price_impact', '').lower() == price_impact]
 
-        # Category filter
-        if category:
-            filtered = [a for a in filtered
-                       if a.get('analysis', {}).get('category', '').lower() == category]
-
         return jsonify({
             'success': True,
             'filters': {
@@ -225,14 +375,15 @@ def filter_news():
 def get_status():
     """Get system status"""
     try:
+        snap = _snapshot
         return jsonify({
             'success': True,
             'status': 'online',
             'cache': {
-                'last_update': news_cache['last_update'].isoformat() if news_cache['last_update'] else None,
-                'news_count': len(news_cache['news'])
+                'last_update': snap.last_update.isoformat() if snap.last_update else None,
+                'news_count': len(snap.news)
             },
-            'pipeline': pipeline.get_system_status()
+            'pipeline': get_pipeline().get_system_status()
         })
 
     except Exception as e:
@@ -247,17 +398,16 @@ def refresh_news():
     """Force refresh news (manually trigger pipeline)"""
     try:
         logger.info("[API] Manual refresh triggered...")
-        results = pipeline.run_complete_pipeline(hours=3)
+        results = get_pipeline().run_complete_pipeline(hours=3)
 
         if results.get('success'):
             # Update cache
-            news_cache['last_update'] = datetime.now()
-            news_cache['news'] = results.get('analyzed_articles', [])
+            _update_news_cache(results.get('analyzed_articles', []), datetime.now())
 
             return jsonify({
                 'success': True,
                 'message': 'News refreshed successfully',
-                'count': len(news_cache['news']),
+                'count': len(_snapshot.news),
                 'stats': {
                     'collected': results.get('raw_collected', 0),
                     'analyzed': results.get('analyzed_count', 0),
@@ -278,9 +428,27 @@ def refresh_news():
         }), 500
 
 def run_api_server(host='0.0.0.0', port=5000, debug=False):
-    """Run Flask API server"""
+    """Run the API server
+
+    In production, prefer a real WSGI server so concurrent clients are
+    not serialized behind one blocking pipeline run:
+
+        gunicorn -k gevent -w 4 app.api_server:app
+
+    This helper uses waitress when installed (multi-threaded, no extra
+    config) and only falls back to the threaded Flask dev server.
+    """
     logger.info(f"[START] Starting API server on {host}:{port}")
-    app.run(host=host, port=port, debug=debug)
+
+    if not debug:
+        try:
+            from waitress import serve
+            serve(app, host=host, port=port)
+            return
+        except ImportError:
+            logger.warning("[WARN] waitress not installed - using Flask dev server")
+
+    app.run(host=host, port=port, debug=debug, threaded=True)
 
 if __name__ == '__main__':
     # Setup logging
@@ -0,0 +1,26 @@
+"""Hash-based deduplication helpers shared by the news collectors
+
+Storing 64-bit hashes instead of full lowercased titles/URLs keeps the
+seen-sets at one small int per entry regardless of string length, and
+integer set lookups are faster than string ones.
+"""
+
+from urllib.parse import urlsplit
+
+try:
+    from xxhash import xxh64_intdigest
+
+    def hash64(text: str) -> int:
+        return xxh64_intdigest(text.encode('utf-8'))
+except ImportError:
+    # Builtin str hash (SipHash) is 64-bit and stable within a process,
+    # which is all the per-run dedup sets need
+    hash64 = hash
+
+
+def normalized_url(url: str) -> str:
+    """Strip query parameters so tracker-parameter variants collapse"""
+    try:
+        return urlsplit(url)._replace(query='').geturl()
+    except ValueError:
+        return url
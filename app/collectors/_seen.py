@@ -0,0 +1,43 @@
+"""Cross-run seen-article cache shared by the news collectors
+
+The pipeline polls every few minutes, so most articles a collector
+returns were already returned by the previous run and everything
+downstream (analysis, ranking, translation) redoes their work. This
+cache remembers 64-bit hashes of URL+title across runs so only the
+delta flows downstream; entries expire after a day so long-running
+stories eventually resurface.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from app.collectors._dedup import hash64
+
+SEEN_CACHE_MAX_SIZE = 50_000
+SEEN_CACHE_TTL = 86400  # 1 day
+
+_seen = OrderedDict()  # hash -> first_seen timestamp
+_seen_lock = threading.Lock()
+
+
+def filter_unseen(articles: List[Dict]) -> List[Dict]:
+    """Drop articles already returned by a previous run"""
+    now = time.time()
+    fresh = []
+
+    with _seen_lock:
+        for article in articles:
+            key = hash64(article.get('url', '') + article.get('title', ''))
+            seen_at = _seen.get(key)
+            if seen_at is not None and now - seen_at <= SEEN_CACHE_TTL:
+                continue
+            _seen[key] = now
+            _seen.move_to_end(key)
+            fresh.append(article)
+
+        while len(_seen) > SEEN_CACHE_MAX_SIZE:
+            _seen.popitem(last=False)
+
+    return fresh
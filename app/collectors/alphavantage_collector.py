@@ -1,17 +1,72 @@
-import requests
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict
 import logging
-from config import ALPHA_VANTAGE_KEY, LARGE_CAP_STOCKS
+from app.collectors._http import cached_get, json_loads, make_session
+from app.collectors._seen import filter_unseen
+from app.collectors.types import Article
+from config import ALPHA_VANTAGE_KEY, LARGE_CAP_STOCKS, LARGE_CAP_STOCK_SET
 
 logger = logging.getLogger(__name__)
 
+# Concurrent per-ticker fetches (I/O-bound, so wall time is roughly the
+# slowest request instead of the sum of all of them)
+MAX_FETCH_WORKERS = 5
+
+
+class _TokenBucket:
+    """Thread-safe token bucket pacing calls to a rate-limited API"""
+
+    def __init__(self, capacity: int = 5, period: float = 60.0):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.capacity / self.period
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.period / self.capacity
+            time.sleep(wait)
+
+
+# Shared across instances: Alpha Vantage's free tier allows 5 req/min
+_RATE_LIMITER = _TokenBucket(capacity=5, period=60.0)
+
+# One compiled alternation scans the content once instead of a Python
+# loop of substring checks per keyword (same substring semantics)
+_FINANCIAL_KEYWORDS = [
+    'stock', 'market', 'earnings', 'trading', 'investment',
+    'shares', 'price', 'nasdaq', 'nyse', 'dow', 'sp500'
+]
+_FINANCIAL_RE = re.compile('|'.join(map(re.escape, _FINANCIAL_KEYWORDS)))
+
+# O(1) membership for the per-ticker_sentiment check below
+_LARGE_CAP_SET = LARGE_CAP_STOCK_SET
+
 class AlphaVantageCollector:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('ALPHA_VANTAGE_KEY')
         self.base_url = "https://www.alphavantage.co/query"
 
+        # Pooled keep-alive session - one TLS handshake per host, not per call
+        self.session = make_session()
+
         if not self.api_key or self.api_key == 'YOUR_ALPHA_VANTAGE_KEY':
             logger.warning("Alpha Vantage API key not configured - using demo mode")
             self.demo_mode = True
@@ -20,7 +75,12 @@ class AlphaVantageCollector:
 
     def collect_news(self, hours: int = None) -> List[Dict]:
         """Main method called by pipeline - collect market news"""
-        return self.collect_market_news(hours)
+        articles = self.collect_market_news(hours)
+        if self.demo_mode:
+            return articles
+        # Cross-run dedup: only articles not seen by a previous pipeline
+        # run flow downstream
+        return filter_unseen(articles)
 
     def collect_market_news(self, hours: int = None) -> List[Dict]:
         """Collect financial news from Alpha Vantage"""
@@ -36,9 +96,9 @@ class AlphaVantageCollector:
                 'sort': 'LATEST'
             }
 
-            response = requests.get(self.base_url, params=params, timeout=20)
+            response = cached_get(self.session, self.base_url, params=params, timeout=20)
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
 
             # Extract articles from response
             articles = []
@@ -50,8 +110,8 @@ class AlphaVantageCollector:
                     if article:
                         articles.append(article)
 
-            logger.info(f"Alpha Vantage: Found {len(articles)} relevant articles")
-            return articles
+            logger.info("Alpha Vantage: Found %d relevant articles", len(articles))
+            return [article.to_dict() for article in articles]
 
         except Exception as e:
             logger.error(f"Alpha Vantage collection error: {e}")
@@ -65,52 +125,54 @@ class AlphaVantageCollector:
         tickers = tickers or LARGE_CAP_STOCKS[:10]  # Top 10 by default
         all_articles = []
 
-        for ticker in tickers:
-            try:
-                params = {
-                    'function': 'NEWS_SENTIMENT',
-                    'apikey': self.api_key,
-                    'tickers': ticker,
-                    'limit': 10,
-                    'sort': 'LATEST'
-                }
-
-                response = requests.get(self.base_url, params=params, timeout=15)
-                response.raise_for_status()
-                data = response.json()
-
-                feed_data = data.get('feed', [])
-                for item in feed_data:
-                    article = self._format_alpha_vantage_article(item)
-                    if article:
-                        article['ticker_focus'] = ticker
-                        all_articles.append(article)
+        # Fan the per-ticker fetches out over a bounded worker pool;
+        # the token bucket paces the actual API calls, so no sleep loop
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            for articles in executor.map(self._fetch_one_ticker, tickers):
+                all_articles.extend(articles)
+
+        return [article.to_dict() for article in all_articles]
+
+    def _fetch_one_ticker(self, ticker: str) -> List[Article]:
+        """Fetch news for one ticker (rate-limited, safe to run in a pool)"""
+        try:
+            _RATE_LIMITER.acquire()
+
+            params = {
+                'function': 'NEWS_SENTIMENT',
+                'apikey': self.api_key,
+                'tickers': ticker,
+                'limit': 10,
+                'sort': 'LATEST'
+            }
 
-                logger.info(f"Alpha Vantage {ticker}: {len(feed_data)} articles")
+            response = self.session.get(self.base_url, params=params, timeout=15)
+            response.raise_for_status()
+            data = json_loads(response.content)
 
-                # Small delay to avoid rate limits
-                import time
-                time.sleep(0.5)
+            articles = []
+            feed_data = data.get('feed', [])
+            for item in feed_data:
+                article = self._format_alpha_vantage_article(item)
+                if article:
+                    article.ticker_focus = ticker
+                    articles.append(article)
 
-            except Exception as e:
-                logger.error(f"Alpha Vantage ticker {ticker} error: {e}")
-                continue
+            logger.info("Alpha Vantage %s: %d articles", ticker, len(feed_data))
+            return articles
 
-        return all_articles
+        except Exception as e:
+            logger.error(f"Alpha Vantage ticker {ticker} error: {e}")
+            return []
 
     def _is_relevant_news(self, item: Dict) -> bool:
         """Check if news item is relevant to US stock market"""
         title = item.get('title', '').lower()
         summary = item.get('summary', '').lower()
 
-        # Check for financial relevance
-        financial_keywords = [
-            'stock', 'market', 'earnings', 'trading', 'investment',
-            'shares', 'price', 'nasdaq', 'nyse', 'dow', 'sp500'
-        ]
-
+        # Check for financial relevance (single pass over the content)
         content = f"{title} {summary}"
-        has_financial = any(keyword in content for keyword in financial_keywords)
+        has_financial = _FINANCIAL_RE.search(content) is not None
 
         # Check sentiment score threshold (only include moderate to high impact news)
         sentiment_score = item.get('overall_sentiment_score', 0)
@@ -119,14 +181,17 @@ class AlphaVantageCollector:
 
         return has_financial
 
-    def _format_alpha_vantage_article(self, item: Dict) -> Dict:
+    def _format_alpha_vantage_article(self, item: Dict) -> Article:
         """Format Alpha Vantage article to standard format"""
         try:
             # Convert timestamp
             time_published = item.get('time_published', '')
             if time_published:
-                # Alpha Vantage format: YYYYMMDDTHHMMSS
-                dt = datetime.strptime(time_published, '%Y%m%dT%H%M%S')
+                # Alpha Vantage format is fixed (YYYYMMDDTHHMMSS), so
+                # integer slicing beats strptime's format interpreter
+                s = time_published
+                dt = datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]),
+                              int(s[9:11]), int(s[11:13]), int(s[13:15]))
                 published_at = dt.isoformat()
             else:
                 published_at = datetime.now().isoformat()
@@ -136,22 +201,22 @@ class AlphaVantageCollector:
             ticker_data = item.get('ticker_sentiment', [])
             for ticker_info in ticker_data:
                 ticker = ticker_info.get('ticker', '')
-                if ticker and ticker in LARGE_CAP_STOCKS:
+                if ticker and ticker in _LARGE_CAP_SET:
                     tickers.append(ticker)
 
-            return {
-                'title': item.get('title', ''),
-                'description': item.get('summary', ''),
-                'url': item.get('url', ''),
-                'source': 'Alpha Vantage',
-                'published_at': published_at,
-                'author': item.get('source', 'Alpha Vantage'),
-                'content': item.get('summary', ''),
-                'collection_method': 'alphavantage',
-                'tickers': tickers,
-                'sentiment_score': item.get('overall_sentiment_score', 0),
-                'sentiment_label': item.get('overall_sentiment_label', 'neutral')
-            }
+            return Article(
+                title=item.get('title', ''),
+                description=item.get('summary', ''),
+                url=item.get('url', ''),
+                source='Alpha Vantage',
+                published_at=published_at,
+                author=item.get('source', 'Alpha Vantage'),
+                content=item.get('summary', ''),
+                collection_method='alphavantage',
+                tickers=tickers,
+                sentiment_score=item.get('overall_sentiment_score', 0),
+                sentiment_label=item.get('overall_sentiment_label', 'neutral')
+            )
 
         except Exception as e:
             logger.error(f"Error formatting Alpha Vantage article: {e}")
@@ -221,10 +286,10 @@ class AlphaVantageCollector:
                 'limit': 1
             }
 
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
 
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 if 'Note' in data:
                     return {'status': 'rate_limited', 'message': 'API rate limit exceeded'}
                 elif 'Error Message' in data:
@@ -1,9 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds one collector may run before the batch moves on without it
+COLLECTOR_TIMEOUT = 20
+
 class BaseCollector(ABC):
     """Base class for all news collectors"""
 
@@ -12,6 +16,14 @@ class BaseCollector(ABC):
         """Collect news from the source"""
         pass
 
+    async def collect_news_async(self) -> List[Dict]:
+        """Async collection hook
+
+        Legacy sync collectors run their blocking collect_news in a
+        worker thread; collectors with a native async path can override.
+        """
+        return await asyncio.to_thread(self.collect_news)
+
     @abstractmethod
     def get_status(self) -> Dict:
         """Get collector status"""
@@ -27,17 +39,67 @@ class NewsCollectorManager:
     def add_collector(self, collector: BaseCollector):
         """Add a news collector"""
         self.collectors.append(collector)
-        logger.info(f"Added collector: {collector.__class__.__name__}")
+        logger.info("Added collector: %s", collector.__class__.__name__)
 
     def collect_all_news(self) -> List[Dict]:
-        """Collect news from all active collectors"""
+        """Collect news from all active collectors concurrently
+
+        Wall time becomes the slowest collector instead of the sum of
+        all of them. Falls back to the serial loop if an event loop is
+        already running.
+        """
+        try:
+            return asyncio.run(self.collect_all_news_async())
+        except RuntimeError:
+            logger.warning("Event loop already running, collecting serially")
+            return self._collect_all_news_serial()
+
+    async def collect_all_news_async(self) -> List[Dict]:
+        """Run every collector concurrently and flatten the results
+
+        Each collector is capped at COLLECTOR_TIMEOUT so one hung
+        source surfaces as its own error instead of stalling the batch.
+        """
+        results = await asyncio.gather(
+            *(asyncio.wait_for(collector.collect_news_async(),
+                               timeout=COLLECTOR_TIMEOUT)
+              for collector in self.collectors),
+            return_exceptions=True
+        )
+
+        all_articles = []
+        collection_results = {}
+
+        for collector, result in zip(self.collectors, results):
+            collector_name = collector.__class__.__name__
+            if isinstance(result, Exception):
+                logger.error(f"Error in {collector_name}: {result}")
+                collection_results[collector_name] = {
+                    'status': 'error',
+                    'error': str(result),
+                    'count': 0
+                }
+            else:
+                all_articles.extend(result)
+                collection_results[collector_name] = {
+                    'status': 'success',
+                    'count': len(result),
+                    'articles': result
+                }
+                logger.info("%s: %d articles", collector_name, len(result))
+
+        self.collection_stats = collection_results
+        return all_articles
+
+    def _collect_all_news_serial(self) -> List[Dict]:
+        """Serial fallback when called from inside a running event loop"""
         all_articles = []
         collection_results = {}
 
         for collector in self.collectors:
             try:
                 collector_name = collector.__class__.__name__
-                logger.info(f"Collecting from {collector_name}...")
+                logger.info("Collecting from %s...", collector_name)
 
                 articles = collector.collect_news()
                 all_articles.extend(articles)
@@ -48,7 +110,7 @@ class NewsCollectorManager:
                     'articles': articles
                 }
 
-                logger.info(f"{collector_name}: {len(articles)} articles")
+                logger.info("%s: %d articles", collector_name, len(articles))
 
             except Exception as e:
                 collector_name = collector.__class__.__name__
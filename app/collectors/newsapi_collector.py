@@ -1,12 +1,45 @@
-import requests
+import asyncio
 import os
+import re
 from datetime import datetime, timedelta
 from typing import List, Dict
+from urllib.parse import urlsplit
 import logging
+from app.collectors._dedup import hash64, normalized_url
+from app.collectors._http import cached_get, json_loads, make_session
+from app.collectors._seen import filter_unseen
+from app.collectors.types import Article
 from config import NEWS_API_KEY, NEWS_TIME_RANGE_HOURS, RELIABLE_SOURCES, LARGE_CAP_STOCKS
 
+# aiohttp lets the search queries run concurrently; without it the
+# queries fall back to the sequential pooled-session path
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Concurrent async searches in flight at once
+MAX_ASYNC_SEARCHES = 16
+
+# NewsAPI caps the q parameter at 500 characters
+MAX_QUERY_CHARS = 500
+
+# Compiled alternations: one scan over the content instead of a Python
+# loop of substring checks per keyword/ticker (same substring semantics)
+_FINANCIAL_KEYWORDS = [
+    'stock', 'earnings', 'market', 'shares', 'price', 'nasdaq',
+    'nyse', 'dow', 'sp500', 'investment', 'trading', 'dividend'
+]
+_RELEVANT_RE = re.compile('|'.join(
+    map(re.escape, _FINANCIAL_KEYWORDS + [t.lower() for t in LARGE_CAP_STOCKS])
+))
+# O(1) host membership instead of a substring scan per reliable source
+_RELIABLE_HOSTS = frozenset(s.lower() for s in RELIABLE_SOURCES)
+_SPAM_RE = re.compile('blog|forum|social')
+
 class NewsAPICollector:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('NEWS_API_KEY')
@@ -15,9 +48,15 @@ class NewsAPICollector:
         if not self.api_key:
             raise ValueError("NewsAPI key is required")
 
+        # Pooled keep-alive session; the API key is set once on the
+        # session headers instead of on every request
+        self.session = make_session({'X-Api-Key': self.api_key})
+
     def collect_news(self, hours: int = None) -> List[Dict]:
         """Main method called by pipeline - collect stock news"""
-        return self.collect_stock_news(hours)
+        # Cross-run dedup: only articles not seen by a previous pipeline
+        # run flow downstream
+        return filter_unseen(self.collect_stock_news(hours))
 
     def collect_stock_news(self, hours: int = None) -> List[Dict]:
         """Collect US stock market news from NewsAPI"""
@@ -36,8 +75,6 @@ class NewsAPICollector:
             stock_keywords = [ticker.lower() for ticker in LARGE_CAP_STOCKS[:20]]  # Top 20
             all_keywords = keywords + stock_keywords
 
-            news_items = []
-
             # Search by different keyword combinations
             search_queries = [
                 "stock market OR earnings OR trading",
@@ -46,14 +83,13 @@ class NewsAPICollector:
                 "investment OR shares OR dividend"
             ]
 
-            for query in search_queries:
-                try:
-                    articles = self._search_articles(query, from_time)
-                    news_items.extend(articles)
-                    logger.info(f"Found {len(articles)} articles for query: {query}")
-                except Exception as e:
-                    logger.error(f"Error searching query '{query}': {e}")
-                    continue
+            # OR-combine into one /everything call: one round trip and a
+            # quarter of the quota instead of four separate searches
+            combined = "(" + ") OR (".join(search_queries) + ")"
+            if len(combined) <= MAX_QUERY_CHARS:
+                search_queries = [combined]
+
+            news_items = self._run_searches(search_queries, from_time)
 
             # Remove duplicates
             unique_news = self._remove_duplicates(news_items)
@@ -61,34 +97,102 @@ class NewsAPICollector:
             # Filter by reliable sources
             filtered_news = self._filter_by_sources(unique_news)
 
-            logger.info(f"NewsAPI: Total collected = {len(filtered_news)} articles")
-            return filtered_news[:20]  # Return top 20
+            logger.info("NewsAPI: Total collected = %d articles", len(filtered_news))
+            return [article.to_dict() for article in filtered_news[:20]]  # Return top 20
 
         except Exception as e:
             logger.error(f"NewsAPI collection error: {e}")
             return []
 
-    def _search_articles(self, query: str, from_time: datetime) -> List[Dict]:
-        """Search articles using NewsAPI"""
-        params = {
+    def _run_searches(self, queries: List[str], from_time: datetime) -> List[Article]:
+        """Run all search queries, concurrently when aiohttp is available"""
+        if AIOHTTP_AVAILABLE:
+            try:
+                return asyncio.run(self._search_all_async(queries, from_time))
+            except RuntimeError:
+                # Already inside an event loop - run the queries sequentially
+                logger.warning("Event loop already running, searching sequentially")
+
+        news_items = []
+        for query in queries:
+            try:
+                articles = self._search_articles(query, from_time)
+                news_items.extend(articles)
+                logger.info("Found %d articles for query: %s", len(articles), query)
+            except Exception as e:
+                logger.error(f"Error searching query '{query}': {e}")
+                continue
+
+        return news_items
+
+    async def _search_all_async(self, queries: List[str], from_time: datetime) -> List[Article]:
+        """Fan the search queries out concurrently over aiohttp"""
+        semaphore = asyncio.Semaphore(MAX_ASYNC_SEARCHES)
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+
+        async def _bounded_search(session, query):
+            async with semaphore:
+                return await self._search_articles_async(session, query, from_time)
+
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers={'X-Api-Key': self.api_key}) as session:
+            results = await asyncio.gather(
+                *(_bounded_search(session, q) for q in queries),
+                return_exceptions=True
+            )
+
+        news_items = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error searching query '{query}': {result}")
+                continue
+            news_items.extend(result)
+            logger.info("Found %d articles for query: %s", len(result), query)
+
+        return news_items
+
+    async def _search_articles_async(self, session, query: str,
+                                     from_time: datetime) -> List[Article]:
+        """Async variant of _search_articles sharing the same params"""
+        params = self._build_search_params(query, from_time)
+
+        async with session.get(f"{self.base_url}/everything", params=params,
+                               timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            resp.raise_for_status()
+            data = json_loads(await resp.read())
+
+        articles = []
+        for article in data.get('articles', []):
+            if self._is_relevant_article(article):
+                articles.append(self._format_article(article))
+
+        return articles
+
+    def _build_search_params(self, query: str, from_time: datetime) -> Dict:
+        """Query parameters shared by the sync and async search paths"""
+        return {
             'q': query,
             'language': 'en',
             'sortBy': 'publishedAt',
             'from': from_time.isoformat(),
-            'pageSize': 50,
+            'pageSize': 100,  # One combined query needs the larger page
             'domains': ','.join(RELIABLE_SOURCES),
             'category': 'business'  # Focus on business news
         }
 
-        response = requests.get(
+    def _search_articles(self, query: str, from_time: datetime) -> List[Article]:
+        """Search articles using NewsAPI"""
+        params = self._build_search_params(query, from_time)
+
+        response = cached_get(
+            self.session,
             f"{self.base_url}/everything",
             params=params,
-            headers={'X-Api-Key': self.api_key},
             timeout=30
         )
 
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         articles = []
         for article in data.get('articles', []):
@@ -103,64 +207,67 @@ class NewsAPICollector:
         description = article.get('description', '').lower()
         content = f"{title} {description}"
 
-        # Financial indicators
-        financial_keywords = [
-            'stock', 'earnings', 'market', 'shares', 'price', 'nasdaq',
-            'nyse', 'dow', 'sp500', 'investment', 'trading', 'dividend'
-        ]
-
-        # Check for financial keywords
-        has_financial = any(keyword in content for keyword in financial_keywords)
-
-        # Check for stock tickers
-        has_tickers = any(ticker.lower() in content for ticker in LARGE_CAP_STOCKS)
+        # One pass over the content covers both the financial keywords
+        # and the large-cap tickers
+        return _RELEVANT_RE.search(content) is not None
 
-        # Must have at least one financial indicator
-        return has_financial or has_tickers
-
-    def _format_article(self, article: Dict) -> Dict:
+    def _format_article(self, article: Dict) -> Article:
         """Format article to standard format"""
-        return {
-            'title': article.get('title', ''),
-            'description': article.get('description', ''),
-            'url': article.get('url', ''),
-            'source': article.get('source', {}).get('name', 'Unknown'),
-            'published_at': article.get('publishedAt', ''),
-            'author': article.get('author', 'Unknown'),
-            'content': article.get('content', ''),
-            'collection_method': 'newsapi'
-        }
+        return Article(
+            title=article.get('title', ''),
+            description=article.get('description', ''),
+            url=article.get('url', ''),
+            source=article.get('source', {}).get('name', 'Unknown'),
+            published_at=article.get('publishedAt', ''),
+            author=article.get('author', 'Unknown'),
+            content=article.get('content', ''),
+            collection_method='newsapi'
+        )
 
-    def _remove_duplicates(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles based on title and URL"""
-        seen_titles = set()
-        seen_urls = set()
+    def _remove_duplicates(self, articles: List[Article]) -> List[Article]:
+        """Remove duplicate articles based on title and URL
+
+        Only 64-bit hashes are kept in the seen-sets, and URLs are
+        normalized (query params stripped) so tracker-parameter
+        variants of the same link collapse to one entry.
+        """
+        seen_title_hashes = set()
+        seen_url_hashes = set()
         unique_articles = []
 
         for article in articles:
-            title = article.get('title', '').lower().strip()
-            url = article.get('url', '').lower().strip()
+            title = article.title_lower.strip()
+            url = normalized_url(article.url.lower().strip())
+
+            title_hash = hash64(title)
+            url_hash = hash64(url)
 
             # Check for duplicates
-            if (title not in seen_titles and
-                url not in seen_urls and
+            if (title_hash not in seen_title_hashes and
+                url_hash not in seen_url_hashes and
                 len(title) > 10):  # Skip very short titles
 
-                seen_titles.add(title)
-                seen_urls.add(url)
+                seen_title_hashes.add(title_hash)
+                seen_url_hashes.add(url_hash)
                 unique_articles.append(article)
 
         return unique_articles
 
-    def _filter_by_sources(self, articles: List[Dict]) -> List[Dict]:
-        """Filter articles by reliable sources"""
+    def _filter_by_sources(self, articles: List[Article]) -> List[Article]:
+        """Filter articles by reliable sources
+
+        The article URL's hostname is the canonical origin (source is
+        just a display name), so it is normalized once and checked
+        against the reliable set in O(1).
+        """
         filtered = []
         for article in articles:
-            source = article.get('source', '').lower()
+            host = urlsplit(article.url).netloc.lower()
+            if host.startswith('www.'):
+                host = host[4:]
 
-            # Include if source is in reliable list or doesn't look like spam
-            if (any(reliable in source for reliable in RELIABLE_SOURCES) or
-                not any(spam_indicator in source for spam_indicator in ['blog', 'forum', 'social'])):
+            # Include if the origin is reliable or doesn't look like spam
+            if host in _RELIABLE_HOSTS or not _SPAM_RE.search(article.source.lower()):
                 filtered.append(article)
 
         return filtered
@@ -168,10 +275,9 @@ class NewsAPICollector:
     def get_api_status(self) -> Dict:
         """Check API status and remaining quota"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/top-headlines",
                 params={'country': 'us', 'pageSize': 1},
-                headers={'X-Api-Key': self.api_key},
                 timeout=10
             )
 
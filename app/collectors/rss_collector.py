@@ -1,12 +1,95 @@
+import asyncio
+import functools
+import re
+import time
+
 import feedparser
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional
 import logging
+from app.collectors._dedup import hash64, normalized_url
+from app.collectors._http import cached_get, make_session
+from app.collectors._seen import filter_unseen
+from app.collectors.types import Article
 from config import NEWS_TIME_RANGE_HOURS
 
+# aiohttp gives a fully async fan-out; without it we fall back to the
+# thread-pool path below
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# lxml parses the large feed payloads an order of magnitude faster than
+# feedparser's pure-Python SAX machinery; feedparser stays the fallback
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Optional: C-implemented HTML parser (Lexbor) to strip the markup many
+# feeds embed in descriptions before it reaches dedup and LLM prompts
+try:
+    from selectolax.parser import HTMLParser as _HTMLStripper
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+
+def _strip_html(text: str) -> str:
+    """Strip embedded HTML markup from a feed description"""
+    if not SELECTOLAX_AVAILABLE or '<' not in text:
+        return text
+    try:
+        return _HTMLStripper(text).text(separator=' ').strip()
+    except Exception:
+        return text
+
+# Feeds fetched concurrently (I/O-bound fan-out)
+MAX_FEED_WORKERS = 8
+
+# Concurrent async fetches in flight at once
+MAX_ASYNC_FETCHES = 16
+
+# One compiled alternation scans the content once instead of a Python
+# loop of substring checks per keyword (same substring semantics)
+_FINANCIAL_KEYWORDS = [
+    'stock', 'earnings', 'market', 'shares', 'price', 'trading',
+    'investment', 'nasdaq', 'nyse', 'dow', 'sp500', 'wall street',
+    'dividend', 'etf', 'mutual fund', 'portfolio'
+]
+_FINANCIAL_RE = re.compile('|'.join(map(re.escape, _FINANCIAL_KEYWORDS)))
+
+# Status probes are cached this long so repeated calls don't re-probe
+FEED_STATUS_CACHE_TTL = 60
+
+# Feed-URL -> display-name resolution: one case-insensitive regex pass,
+# memoized per URL (the feed set is fixed, so every lookup after the
+# first is a cache hit)
+_SOURCE_RE = re.compile(r'(yahoo|bloomberg|reuters|marketwatch|google)', re.IGNORECASE)
+_SOURCE_NAMES = {
+    'yahoo': 'Yahoo Finance',
+    'bloomberg': 'Bloomberg',
+    'reuters': 'Reuters',
+    'marketwatch': 'MarketWatch',
+    'google': 'Google News'
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_source_name(feed_url: str) -> str:
+    """Extract source name from feed URL"""
+    match = _SOURCE_RE.search(feed_url)
+    if match:
+        return _SOURCE_NAMES[match.group(1).lower()]
+    return 'RSS Feed'
+
 class RSSCollector:
     def __init__(self):
         self.rss_feeds = [
@@ -36,53 +119,207 @@ class RSSCollector:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+        # Pooled keep-alive session with the User-Agent set once;
+        # repeat fetches from the same feed host reuse the socket
+        self.session = make_session(self.headers)
+
+        # Parsed-article cache per feed: when the HTTP layer hands back
+        # an unchanged response (fresh TTL or 304 revalidation) the
+        # feedparser pass is skipped too. _feed_meta holds the
+        # conditional headers for the async fetch path.
+        self._feed_cache = {}  # feed_url -> (response token, articles)
+        self._feed_meta = {}   # feed_url -> conditional request headers
+
+        self._status_cache = None  # (probed_at, result)
+
     def collect_news(self, hours: int = None) -> List[Dict]:
         """Main method called by pipeline - collect RSS news"""
-        return self.collect_all_feeds(hours)
+        # Cross-run dedup: only articles not seen by a previous pipeline
+        # run flow downstream
+        return filter_unseen(self.collect_all_feeds(hours))
 
     def collect_all_feeds(self, hours: int = None) -> List[Dict]:
         """Collect news from all RSS feeds"""
+        if AIOHTTP_AVAILABLE:
+            try:
+                return asyncio.run(self.collect_all_feeds_async(hours))
+            except RuntimeError:
+                # Already inside an event loop - use the threaded path
+                logger.warning("Event loop already running, collecting feeds via thread pool")
+
+        return self._collect_all_feeds_threaded(hours)
+
+    async def collect_all_feeds_async(self, hours: int = None) -> List[Dict]:
+        """Collect all feeds concurrently over aiohttp"""
+        semaphore = asyncio.Semaphore(MAX_ASYNC_FETCHES)
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+
+        async def _bounded_fetch(session, feed_url):
+            async with semaphore:
+                return await self._fetch_feed(session, feed_url)
+
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers=self.headers) as session:
+            results = await asyncio.gather(
+                *(_bounded_fetch(session, url) for url in self.rss_feeds),
+                return_exceptions=True
+            )
+
         all_articles = []
+        for feed_url, result in zip(self.rss_feeds, results):
+            if isinstance(result, Exception):
+                logger.error(f"RSS feed error {feed_url}: {result}")
+                continue
+            all_articles.extend(result)
+            logger.info("RSS %s: Found %d articles", feed_url, len(result))
 
-        for feed_url in self.rss_feeds:
-            try:
-                articles = self._collect_from_feed(feed_url)
+        recent_articles = self._filter_by_time(all_articles, hours)
+        unique_articles = self._remove_duplicates(recent_articles)
+
+        logger.info("RSS: Total collected = %d articles", len(unique_articles))
+        return [article.to_dict() for article in unique_articles]
+
+    async def _fetch_feed(self, session, feed_url: str) -> List[Dict]:
+        """Fetch and parse one feed without blocking the event loop
+
+        Sends If-None-Match/If-Modified-Since from the previous fetch;
+        a 304 reuses the cached parsed articles with zero body bytes.
+        """
+        try:
+            conditional = self._feed_meta.get(feed_url)
+            async with session.get(feed_url, headers=conditional,
+                                   timeout=aiohttp.ClientTimeout(total=15)) as resp:
+                if resp.status == 304 and feed_url in self._feed_cache:
+                    return self._feed_cache[feed_url][1]
+                resp.raise_for_status()
+                body = await resp.read()
+
+                validators = {}
+                if resp.headers.get('ETag'):
+                    validators['If-None-Match'] = resp.headers['ETag']
+                if resp.headers.get('Last-Modified'):
+                    validators['If-Modified-Since'] = resp.headers['Last-Modified']
+
+            # feedparser is pure-Python and CPU-bound - parse off-loop
+            articles = await asyncio.to_thread(self._parse_feed_content, body, feed_url)
+
+            if validators:
+                self._feed_meta[feed_url] = validators
+            self._feed_cache[feed_url] = (None, articles)
+            return articles
+
+        except Exception as e:
+            logger.error(f"Error collecting from {feed_url}: {e}")
+            return []
+
+    def _collect_all_feeds_threaded(self, hours: int = None) -> List[Dict]:
+        """Thread-pool fallback when aiohttp is unavailable"""
+        all_articles = []
+
+        # Fetch all feeds concurrently - wall time becomes the slowest
+        # feed instead of the sum of every feed's round-trip
+        with ThreadPoolExecutor(max_workers=MAX_FEED_WORKERS) as executor:
+            for feed_url, articles in zip(
+                self.rss_feeds,
+                executor.map(self._collect_from_feed, self.rss_feeds)
+            ):
                 all_articles.extend(articles)
-                logger.info(f"RSS {feed_url}: Found {len(articles)} articles")
-            except Exception as e:
-                logger.error(f"RSS feed error {feed_url}: {e}")
-                continue
+                logger.info("RSS %s: Found %d articles", feed_url, len(articles))
 
         # Filter by time and remove duplicates
         recent_articles = self._filter_by_time(all_articles, hours)
         unique_articles = self._remove_duplicates(recent_articles)
 
-        logger.info(f"RSS: Total collected = {len(unique_articles)} articles")
-        return unique_articles
+        logger.info("RSS: Total collected = %d articles", len(unique_articles))
+        return [article.to_dict() for article in unique_articles]
 
     def _collect_from_feed(self, feed_url: str) -> List[Dict]:
         """Collect articles from a single RSS feed"""
         try:
-            # Make request with headers
-            response = requests.get(feed_url, headers=self.headers, timeout=15)
+            # Cached GET - RSS changes slowly, so a 10-min TTL plus
+            # ETag revalidation skips most repeat downloads
+            response = cached_get(self.session, feed_url, ttl=600, timeout=15)
             response.raise_for_status()
 
-            # Parse RSS feed
-            feed = feedparser.parse(response.content)
-
-            articles = []
-            for entry in feed.entries:
-                article = self._format_rss_entry(entry, feed_url)
-                if article and self._is_financial_article(article):
-                    articles.append(article)
+            # Same response object back means the feed didn't change -
+            # reuse the parsed articles instead of re-running feedparser
+            cached = self._feed_cache.get(feed_url)
+            if cached is not None and cached[0] is response:
+                return cached[1]
 
+            articles = self._parse_feed_content(response.content, feed_url)
+            self._feed_cache[feed_url] = (response, articles)
             return articles
 
         except Exception as e:
             logger.error(f"Error collecting from {feed_url}: {e}")
             return []
 
-    def _format_rss_entry(self, entry, feed_url: str) -> Dict:
+    def _parse_feed_content(self, content: bytes, feed_url: str) -> List[Article]:
+        """Parse raw feed bytes into formatted, finance-relevant articles
+
+        Flat RSS 2.0 (everything in self.rss_feeds except Google News)
+        goes through the lxml fast path; Atom and malformed payloads
+        fall back to feedparser.
+        """
+        if LXML_AVAILABLE:
+            try:
+                articles = self._parse_with_lxml(content, feed_url)
+                if articles is not None:
+                    return articles
+            except Exception as e:
+                logger.debug("lxml parse failed for %s, using feedparser: %s", feed_url, e)
+
+        feed = feedparser.parse(content)
+
+        articles = []
+        for entry in feed.entries:
+            article = self._format_rss_entry(entry, feed_url)
+            if article and self._is_financial_article(article):
+                articles.append(article)
+
+        return articles
+
+    def _parse_with_lxml(self, content: bytes, feed_url: str) -> Optional[List[Article]]:
+        """lxml fast path for RSS 2.0 feeds; None means not flat RSS"""
+        root = etree.fromstring(content)
+        if root.tag != 'rss':
+            return None
+
+        source = _extract_source_name(feed_url)
+        articles = []
+
+        for item in root.iter('item'):
+            description = _strip_html(item.findtext('description', '') or '')
+            pub_date = item.findtext('pubDate', '') or ''
+
+            published_dt = None
+            if pub_date:
+                try:
+                    # RFC 2822 dates via the C-backed email parser
+                    # instead of feedparser's date heuristics
+                    published_dt = parsedate_to_datetime(pub_date).replace(tzinfo=None)
+                except (TypeError, ValueError):
+                    pass
+            if published_dt is None:
+                published_dt = datetime.now()
+
+            article = Article(
+                title=item.findtext('title', '') or '',
+                description=description,
+                url=item.findtext('link', '') or '',
+                source=source,
+                published_at=published_dt.isoformat(),
+                author=item.findtext('author', '') or source,
+                content=description,
+                collection_method='rss'
+            )
+            if self._is_financial_article(article):
+                articles.append(article)
+
+        return articles
+
+    def _format_rss_entry(self, entry, feed_url: str) -> Article:
         """Format RSS entry to standard format"""
         try:
             published = entry.get('published_parsed')
@@ -91,55 +328,31 @@ class RSSCollector:
             else:
                 published_dt = datetime.now()
 
-            # Extract source name from feed URL
-            source = self._extract_source_name(feed_url)
+            # Extract source name from feed URL (memoized)
+            source = _extract_source_name(feed_url)
 
-            return {
-                'title': entry.get('title', ''),
-                'description': entry.get('description', ''),
-                'url': entry.get('link', ''),
-                'source': source,
-                'published_at': published_dt.isoformat(),
-                'author': entry.get('author', source),
-                'content': entry.get('summary', entry.get('description', '')),
-                'collection_method': 'rss'
-            }
+            return Article(
+                title=entry.get('title', ''),
+                description=_strip_html(entry.get('description', '')),
+                url=entry.get('link', ''),
+                source=source,
+                published_at=published_dt.isoformat(),
+                author=entry.get('author', source),
+                content=_strip_html(entry.get('summary', entry.get('description', ''))),
+                collection_method='rss'
+            )
 
         except Exception as e:
             logger.error(f"Error formatting RSS entry: {e}")
             return None
 
-    def _extract_source_name(self, feed_url: str) -> str:
-        """Extract source name from feed URL"""
-        url_mapping = {
-            'yahoo': 'Yahoo Finance',
-            'bloomberg': 'Bloomberg',
-            'reuters': 'Reuters',
-            'marketwatch': 'MarketWatch',
-            'google': 'Google News'
-        }
-
-        for key, name in url_mapping.items():
-            if key in feed_url.lower():
-                return name
-
-        return 'RSS Feed'
-
-    def _is_financial_article(self, article: Dict) -> bool:
+    def _is_financial_article(self, article: Article) -> bool:
         """Check if article is relevant to finance"""
-        title = article.get('title', '').lower()
-        description = article.get('description', '').lower()
-        content = f"{title} {description}"
-
-        financial_keywords = [
-            'stock', 'earnings', 'market', 'shares', 'price', 'trading',
-            'investment', 'nasdaq', 'nyse', 'dow', 'sp500', 'wall street',
-            'dividend', 'etf', 'mutual fund', 'portfolio'
-        ]
+        content = f"{article.title_lower} {article.description.lower()}"
 
-        return any(keyword in content for keyword in financial_keywords)
+        return _FINANCIAL_RE.search(content) is not None
 
-    def _filter_by_time(self, articles: List[Dict], hours: int = None) -> List[Dict]:
+    def _filter_by_time(self, articles: List[Article], hours: int = None) -> List[Article]:
         """Filter articles by publication time"""
         time_range = hours or NEWS_TIME_RANGE_HOURS
         cutoff_time = datetime.now() - timedelta(hours=time_range)
@@ -147,11 +360,15 @@ class RSSCollector:
 
         for article in articles:
             try:
-                published_str = article.get('published_at', '')
+                published_str = article.published_at
                 if not published_str:
                     continue
 
-                published_dt = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
+                # Only rewrite the trailing 'Z' when present instead of
+                # scanning every string with .replace()
+                if published_str.endswith('Z'):
+                    published_str = published_str[:-1] + '+00:00'
+                published_dt = datetime.fromisoformat(published_str)
 
                 if published_dt >= cutoff_time:
                     recent_articles.append(article)
@@ -163,44 +380,107 @@ class RSSCollector:
 
         return recent_articles
 
-    def _remove_duplicates(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles"""
-        seen_titles = set()
-        seen_urls = set()
+    def _remove_duplicates(self, articles: List[Article]) -> List[Article]:
+        """Remove duplicate articles
+
+        Only 64-bit hashes are kept in the seen-sets, and URLs are
+        normalized (query params stripped) so tracker-parameter
+        variants of the same link collapse to one entry.
+        """
+        seen_title_hashes = set()
+        seen_url_hashes = set()
         unique_articles = []
 
         for article in articles:
-            title = article.get('title', '').lower().strip()
-            url = article.get('url', '').lower().strip()
+            title = article.title_lower.strip()
+            url = normalized_url(article.url.lower().strip())
+
+            title_hash = hash64(title)
+            url_hash = hash64(url)
 
-            if (title not in seen_titles and
-                url not in seen_urls and
+            if (title_hash not in seen_title_hashes and
+                url_hash not in seen_url_hashes and
                 len(title) > 10):  # Skip very short titles
 
-                seen_titles.add(title)
-                seen_urls.add(url)
+                seen_title_hashes.add(title_hash)
+                seen_url_hashes.add(url_hash)
                 unique_articles.append(article)
 
         return unique_articles
 
     def get_feed_status(self) -> Dict:
-        """Check status of RSS feeds"""
-        status = {}
-        working_feeds = 0
+        """Check status of RSS feeds
 
-        for feed_url in self.rss_feeds:
+        All feeds are probed concurrently (HEAD first, so no body bytes
+        are downloaded) and the result is cached for 60 seconds.
+        """
+        now = time.monotonic()
+        if (self._status_cache and
+            now - self._status_cache[0] < FEED_STATUS_CACHE_TTL):
+            return self._status_cache[1]
+
+        if AIOHTTP_AVAILABLE:
             try:
-                response = requests.get(feed_url, headers=self.headers, timeout=5)
-                if response.status_code == 200:
-                    status[feed_url] = 'active'
-                    working_feeds += 1
-                else:
-                    status[feed_url] = f'error_{response.status_code}'
-            except Exception as e:
-                status[feed_url] = f'error_{str(e)}'
+                status = asyncio.run(self._probe_all_async())
+            except RuntimeError:
+                status = self._probe_all_threaded()
+        else:
+            status = self._probe_all_threaded()
 
-        return {
+        result = {
             'total_feeds': len(self.rss_feeds),
-            'working_feeds': working_feeds,
+            'working_feeds': sum(1 for s in status.values() if s == 'active'),
             'details': status
-        }
\ No newline at end of file
+        }
+        self._status_cache = (now, result)
+        return result
+
+    async def _probe_all_async(self) -> Dict:
+        """Probe every feed concurrently over aiohttp"""
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers=self.headers) as session:
+            results = await asyncio.gather(
+                *(self._probe_feed(session, url) for url in self.rss_feeds),
+                return_exceptions=True
+            )
+
+        return {
+            url: f'error_{result}' if isinstance(result, Exception) else result
+            for url, result in zip(self.rss_feeds, results)
+        }
+
+    async def _probe_feed(self, session, feed_url: str) -> str:
+        """Probe one feed with HEAD, falling back to GET if rejected"""
+        try:
+            timeout = aiohttp.ClientTimeout(total=5)
+            async with session.head(feed_url, allow_redirects=True,
+                                    timeout=timeout) as resp:
+                status_code = resp.status
+
+            if status_code >= 400:
+                # Some feed servers reject HEAD - retry with GET
+                async with session.get(feed_url, timeout=timeout) as resp:
+                    status_code = resp.status
+
+            return 'active' if status_code == 200 else f'error_{status_code}'
+        except Exception as e:
+            return f'error_{e}'
+
+    def _probe_all_threaded(self) -> Dict:
+        """Thread-pool probe fallback when aiohttp is unavailable"""
+        with ThreadPoolExecutor(max_workers=MAX_FEED_WORKERS) as executor:
+            return dict(zip(self.rss_feeds,
+                            executor.map(self._probe_one, self.rss_feeds)))
+
+    def _probe_one(self, feed_url: str) -> str:
+        """Probe one feed through the pooled session"""
+        try:
+            response = self.session.head(feed_url, allow_redirects=True, timeout=5)
+            if response.status_code >= 400:
+                # Some feed servers reject HEAD - retry with GET
+                response = self.session.get(feed_url, timeout=5)
+
+            return 'active' if response.status_code == 200 else f'error_{response.status_code}'
+        except Exception as e:
+            return f'error_{str(e)}'
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""Shared article record for the news collectors
+
+A slotted dataclass instead of a 10-key dict per article: noticeably
+smaller per instance and attribute access skips the hash-table lookup.
+Collectors work on Article instances through their hot
+format/filter/dedup paths and convert to dicts with to_dict() only at
+the boundary where the pipeline consumes them.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True)
+class Article:
+    title: str = ''
+    description: str = ''
+    url: str = ''
+    source: str = ''
+    published_at: str = ''
+    author: str = ''
+    content: str = ''
+    collection_method: str = ''
+    tickers: List[str] = field(default_factory=list)
+    sentiment_score: float = 0.0
+    sentiment_label: str = 'neutral'
+    ticker_focus: Optional[str] = None
+
+    # Lowercased title cached once at construction; the relevance and
+    # dedup passes would otherwise each re-lowercase (new str per call)
+    title_lower: str = ''
+
+    def __post_init__(self):
+        if not self.title_lower:
+            self.title_lower = self.title.lower()
+
+    def to_dict(self) -> Dict:
+        """Dict form for the pipeline/serialization boundary"""
+        data = asdict(self)
+        if data['ticker_focus'] is None:
+            del data['ticker_focus']
+        del data['title_lower']
+        return data
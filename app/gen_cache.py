@@ -0,0 +1,67 @@
+"""
+Structural Program Cache for Repetitive LLM Prompts
+Serves templated prompts from compiled extract-and-format programs
+"""
+
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ClusterStore:
+    """Cache of per-prompt-cluster response programs
+
+    The prompts entering _call_llm follow a handful of rigid templates
+    (Title/Source/Content analysis forms, Rank/Tickers/Impact
+    translation forms). Each cluster pairs a compiled regex - which
+    both identifies the cluster and extracts the variable fields - with
+    a builder that renders the response directly. A hit replaces an
+    LLM round-trip with microseconds of regex + format; misses fall
+    through to the real call and are counted so new clusters can be
+    added where they pay off.
+    """
+
+    def __init__(self):
+        self._clusters: List[Tuple[str, re.Pattern, Callable[[Dict[str, str]], str]]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, pattern: str,
+                 builder: Callable[[Dict[str, str]], str]):
+        """Add a cluster: a field-extracting regex plus its response builder"""
+        compiled = re.compile(pattern, re.S)
+        with self._lock:
+            self._clusters.append((name, compiled, builder))
+
+    def generate(self, prompt: str) -> Optional[str]:
+        """Return a generated response if the prompt matches a cluster
+
+        The regex match is the conformity check - a prompt that doesn't
+        fully expose the cluster's fields falls through to the LLM.
+        """
+        for name, pattern, builder in self._clusters:
+            match = pattern.search(prompt)
+            if match is None:
+                continue
+            try:
+                response = builder(match.groupdict())
+            except Exception as e:
+                logger.error(f"Gen-cache builder for '{name}' failed: {e}")
+                continue
+            with self._lock:
+                self.hits += 1
+            logger.info(f"Gen-cache hit ({name}) - skipping LLM call")
+            return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'clusters': len(self._clusters),
+                    'hits': self.hits, 'misses': self.misses}
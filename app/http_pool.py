@@ -0,0 +1,69 @@
+"""Process-wide pooled HTTP clients
+
+The LLM providers and search manager are constructed once per process
+but talk to the same few endpoints on every pipeline run. Sharing one
+keep-alive pool across them means repeated calls reuse warm sockets
+instead of paying a TCP + TLS handshake each time.
+
+Two pools are exposed: a requests.Session for requests-based callers,
+and (when httpx is installed) an httpx.Client for SDKs that accept an
+injected transport, such as the Mistral SDK.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional: the Mistral SDK rides on httpx and accepts a shared client
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+_lock = threading.Lock()
+_session = None
+_httpx_client = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive requests.Session
+
+    Built once on first use; transient 429/5xx responses retry with
+    backoff inside the adapter instead of surfacing to callers.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    respect_retry_after_header=True
+                )
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                                      max_retries=retry)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def get_httpx_client():
+    """Return the shared pooled httpx.Client, or None without httpx"""
+    global _httpx_client
+    if not HTTPX_AVAILABLE:
+        return None
+    if _httpx_client is None:
+        with _lock:
+            if _httpx_client is None:
+                _httpx_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=32,
+                                        max_connections=64,
+                                        keepalive_expiry=90)
+                )
+    return _httpx_client
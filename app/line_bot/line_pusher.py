@@ -4,13 +4,42 @@ Sends messages to LINE users via LINE Messaging API
 No webhook required - only uses Push API
 """
 
+import asyncio
 import logging
 import os
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional async HTTP client for concurrent fan-out pushes
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# orjson encodes nested flex-message payloads several times faster than
+# stdlib json and emits bytes directly
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+# Concurrent pushes per fan-out batch
+PUSH_CONCURRENCY = 20
+
+# LINE's multicast endpoint caps recipients per request
+MULTICAST_BATCH_SIZE = 500
+
 class LINEPusher:
     """Push messages to LINE users"""
 
@@ -24,6 +53,26 @@ class LINEPusher:
         self.channel_access_token = channel_access_token or os.getenv('LINE_CHANNEL_ACCESS_TOKEN')
         self.api_url = "https://api.line.biz/v3/bot"
 
+        # Keep-alive session so broadcasts reuse one TLS connection to
+        # api.line.biz instead of handshaking per push
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.channel_access_token}'
+        })
+        # 429/5xx responses back off and retry inside the adapter
+        # (honoring Retry-After) instead of surfacing as hard failures
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
         if not self.channel_access_token:
             logger.warning("[WARN] LINE Channel Access Token not set")
             self.available = False
@@ -47,34 +96,103 @@ class LINEPusher:
             return False
 
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.channel_access_token}'
-            }
-
             payload = {
                 'to': user_id,
                 'messages': [message]
             }
 
-            response = requests.post(
+            # stream=True defers body download; the 200 path closes
+            # without ever decoding it, errors read it for diagnostics
+            response = self._session.post(
                 f"{self.api_url}/message/push",
-                headers=headers,
-                json=payload,
-                timeout=10
+                data=_json_dumps(payload),
+                timeout=10,
+                stream=True
             )
 
             if response.status_code == 200:
+                response.close()
                 logger.info(f"[OK] Message pushed to {user_id}")
                 return True
             else:
-                logger.error(f"[FAIL] Failed to push message: {response.status_code} {response.text}")
+                body = response.text[:512]
+                response.close()
+                logger.error(f"[FAIL] Failed to push message: {response.status_code} {body}")
                 return False
 
         except Exception as e:
             logger.error(f"[FAIL] Error pushing message: {e}")
             return False
 
+    def push_messages(self, user_ids: List[str], message: Dict) -> Dict[str, bool]:
+        """
+        Push the same message to many users concurrently
+
+        Overlaps the network round-trips instead of paying one LINE API
+        latency per user; falls back to sequential pushes when aiohttp
+        is not installed or an event loop is already running.
+
+        Args:
+            user_ids: LINE User IDs
+            message: Message object (JSON format)
+
+        Returns:
+            Dict of user_id -> success flag
+        """
+        if not self.available:
+            logger.error("[FAIL] LINE Pusher not available")
+            return {user_id: False for user_id in user_ids}
+
+        if AIOHTTP_AVAILABLE:
+            try:
+                return asyncio.run(self.push_many(user_ids, message))
+            except RuntimeError:
+                # Already inside an event loop - fall through to sync path
+                pass
+
+        return {user_id: self.push_message(user_id, message) for user_id in user_ids}
+
+    async def push_many(self, user_ids: List[str], message: Dict,
+                        concurrency: int = PUSH_CONCURRENCY) -> Dict[str, bool]:
+        """
+        Async fan-out push bounded by a semaphore
+
+        Args:
+            user_ids: LINE User IDs
+            message: Message object (JSON format)
+            concurrency: Max in-flight requests
+
+        Returns:
+            Dict of user_id -> success flag
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.channel_access_token}'
+        }
+
+        async def push_one(session, user_id):
+            payload = {'to': user_id, 'messages': [message]}
+            try:
+                async with semaphore:
+                    async with session.post(f"{self.api_url}/message/push",
+                                            data=_json_dumps(payload), timeout=10) as response:
+                        if response.status == 200:
+                            logger.info(f"[OK] Message pushed to {user_id}")
+                            return True
+                        body = await response.text()
+                        logger.error(f"[FAIL] Failed to push message: {response.status} {body}")
+                        return False
+            except Exception as e:
+                logger.error(f"[FAIL] Error pushing message: {e}")
+                return False
+
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*[push_one(session, uid) for uid in user_ids])
+
+        return dict(zip(user_ids, results))
+
     def broadcast_message(self, message: Dict) -> bool:
         """
         Broadcast message to all users who added the bot
@@ -90,33 +208,79 @@ class LINEPusher:
             return False
 
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.channel_access_token}'
-            }
-
             payload = {
                 'messages': [message]
             }
 
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}/message/broadcast",
-                headers=headers,
-                json=payload,
-                timeout=10
+                data=_json_dumps(payload),
+                timeout=10,
+                stream=True
             )
 
             if response.status_code == 200:
+                response.close()
                 logger.info("[OK] Broadcast message sent to all users")
                 return True
             else:
-                logger.error(f"[FAIL] Failed to broadcast: {response.status_code} {response.text}")
+                body = response.text[:512]
+                response.close()
+                logger.error(f"[FAIL] Failed to broadcast: {response.status_code} {body}")
                 return False
 
         except Exception as e:
             logger.error(f"[FAIL] Error broadcasting message: {e}")
             return False
 
+    def multicast_message(self, user_ids: List[str], message: Dict) -> bool:
+        """
+        Send the same message to many users via the multicast endpoint
+
+        One request covers up to 500 recipients, so a digest send costs
+        ceil(M/500) round-trips instead of M individual pushes.
+
+        Args:
+            user_ids: LINE User IDs
+            message: Message object (JSON format)
+
+        Returns:
+            True if all batches succeeded, False otherwise
+        """
+        if not self.available:
+            logger.error("[FAIL] LINE Pusher not available")
+            return False
+
+        try:
+            for i in range(0, len(user_ids), MULTICAST_BATCH_SIZE):
+                chunk = user_ids[i:i + MULTICAST_BATCH_SIZE]
+                payload = {
+                    'to': chunk,
+                    'messages': [message]
+                }
+
+                response = self._session.post(
+                    f"{self.api_url}/message/multicast",
+                    data=_json_dumps(payload),
+                    timeout=10,
+                    stream=True
+                )
+
+                if response.status_code != 200:
+                    body = response.text[:512]
+                    response.close()
+                    logger.error(f"[FAIL] Failed to multicast: {response.status_code} {body}")
+                    return False
+
+                response.close()
+                logger.info(f"[OK] Multicast sent to {len(chunk)} users")
+
+            return True
+
+        except Exception as e:
+            logger.error(f"[FAIL] Error multicasting message: {e}")
+            return False
+
     def push_flex_message(self, user_id: str, flex_message: Dict) -> bool:
         """
         Push a flex message (rich format)
@@ -136,6 +300,28 @@ class LINEPusher:
 
         return self.push_message(user_id, message)
 
+    def multicast_flex_message(self, user_ids: List[str], flex_message: Dict) -> bool:
+        """
+        Send a flex message to many users in batched multicast calls
+
+        Args:
+            user_ids: LINE User IDs
+            flex_message: Flex message object
+
+        Returns:
+            True if successful
+        """
+        message = {
+            'type': 'flex',
+            'altText': flex_message.get('altText', 'Stock News'),
+            'contents': flex_message.get('contents', {})
+        }
+
+        if len(user_ids) == 1:
+            return self.push_message(user_ids[0], message)
+
+        return self.multicast_message(user_ids, message)
+
     def broadcast_flex_message(self, flex_message: Dict) -> bool:
         """
         Broadcast flex message to all users
@@ -5,10 +5,88 @@ Supports text and flex messages
 """
 
 import logging
-from typing import List, Dict
+import string
+from dataclasses import dataclass
+from typing import List, Dict, Union
+
+# orjson round-trips the pre-rendered bubble JSON much faster than
+# stdlib json and also serializes outgoing payloads to bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_bytes = orjson.dumps
+
+    def _json_str(value: str) -> str:
+        return orjson.dumps(value).decode('utf-8')
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_str = json.dumps
+
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+# Fixed header/footer literals for broadcast-style messages
+BROADCAST_HEADER = "[Stock News Update]"
+BROADCAST_FOOTER = "Tap 'View More' for full dashboard"
+
+# Impact-score colors, pre-encoded as JSON string literals for the
+# bubble template
+_HIGH_IMPACT_COLOR = '"#FF0000"'
+_LOW_IMPACT_COLOR = '"#0000FF"'
+
+# Quick-reply actions are all message-type; only label/text vary per
+# option, so the fixed pairs live here instead of being rebuilt per item
+_QUICK_REPLY_ACTION_BASE = {'type': 'message'}
+
+# Carousel bubbles share one fixed skeleton; rendering this template and
+# parsing it once per item replaces ~15 dict literals the interpreter
+# would otherwise rebuild per bubble. Values arrive pre-JSON-encoded.
+_BUBBLE_TEMPLATE = string.Template(
+    '{"type":"bubble",'
+    '"body":{"type":"box","layout":"vertical","spacing":"sm","contents":['
+    '{"type":"text","text":$title,"weight":"bold","size":"sm","wrap":true},'
+    '{"type":"text","text":$summary,"size":"xs","color":"#999999","wrap":true},'
+    '{"type":"box","layout":"horizontal","spacing":"sm","margin":"md","contents":['
+    '{"type":"text","text":$tickers,"size":"xs","flex":0},'
+    '{"type":"text","text":$score,"size":"xs","color":$color,"flex":0}]}]},'
+    '"footer":{"type":"box","layout":"vertical","spacing":"sm","contents":['
+    '{"type":"button","style":"link","height":"sm",'
+    '"action":{"type":"uri","label":"Read More","uri":$url}}]}}'
+)
+
+@dataclass(slots=True, frozen=True)
+class NewsBubbleData:
+    """Read-only carousel item with truncation applied once
+
+    Attribute reads are C-level slot loads, so the bubble loop skips
+    the repeated dict hashing that item.get() pays per field.
+    """
+    title: str
+    thai_summary: str
+    tickers: tuple
+    impact_score: int
+    url: str
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'NewsBubbleData':
+        title = item.get('title', '')
+        if len(title) > 40:  # Truncate title
+            title = title[:40]
+        thai_summary = item.get('thai_summary', '')
+        if len(thai_summary) > 50:
+            thai_summary = thai_summary[:50]
+        return cls(
+            title=title,
+            thai_summary=thai_summary,
+            tickers=tuple(item.get('tickers', [])[:3]),
+            impact_score=item.get('impact_score', 0),
+            url=item.get('url', '#')
+        )
+
+
 class LineMessageFormatter:
     """Format messages for LINE Bot"""
 
@@ -40,15 +118,23 @@ class LineMessageFormatter:
         Returns:
             LINE message object
         """
-        # Join news lines with newline
-        news_text = "\n".join(thai_news_lines)
-
-        # Add title
-        full_text = f"{title}\n\n{news_text}"
-
-        # LINE has character limit, so truncate if needed
-        if len(full_text) > 5000:
-            full_text = full_text[:4900] + "\n... (see more in Mini App)"
+        # Track the running length and stop before LINE's character
+        # limit instead of joining everything and slicing the result -
+        # whole lines are kept, nothing is built just to be thrown away
+        acc_len = len(title) + 2
+        kept = []
+        truncated = False
+        for line in thai_news_lines:
+            if acc_len + len(line) + 1 > 4900:
+                truncated = True
+                break
+            kept.append(line)
+            acc_len += len(line) + 1
+
+        # Single join writes title and lines into one buffer
+        full_text = "\n".join((title, "", *kept))
+        if truncated:
+            full_text += "\n... (see more in Mini App)"
 
         return {
             'type': 'text',
@@ -76,11 +162,9 @@ class LineMessageFormatter:
             'items': [
                 {
                     'type': 'action',
-                    'action': {
-                        'type': 'message',
-                        'label': opt['label'],
-                        'text': opt['text']
-                    }
+                    'action': {**_QUICK_REPLY_ACTION_BASE,
+                               'label': opt['label'],
+                               'text': opt['text']}
                 }
                 for opt in options
             ]
@@ -93,7 +177,8 @@ class LineMessageFormatter:
         }
 
     @staticmethod
-    def format_news_carousel(news_items: List[Dict], limit: int = 5) -> Dict:
+    def format_news_carousel(news_items: List[Union[Dict, NewsBubbleData]],
+                             limit: int = 5) -> Dict:
         """
         Create carousel message with multiple news items
 
@@ -107,75 +192,26 @@ class LineMessageFormatter:
         bubbles = []
 
         for item in news_items[:limit]:
-            title = item.get('title', '')[:40]  # Truncate title
-            thai_summary = item.get('thai_summary', '')[:50]
-            tickers = ', '.join(item.get('tickers', [])[:3])
-            impact_score = item.get('impact_score', 0)
-
-            bubble = {
-                'type': 'bubble',
-                'body': {
-                    'type': 'box',
-                    'layout': 'vertical',
-                    'spacing': 'sm',
-                    'contents': [
-                        {
-                            'type': 'text',
-                            'text': title,
-                            'weight': 'bold',
-                            'size': 'sm',
-                            'wrap': True
-                        },
-                        {
-                            'type': 'text',
-                            'text': thai_summary,
-                            'size': 'xs',
-                            'color': '#999999',
-                            'wrap': True
-                        },
-                        {
-                            'type': 'box',
-                            'layout': 'horizontal',
-                            'spacing': 'sm',
-                            'margin': 'md',
-                            'contents': [
-                                {
-                                    'type': 'text',
-                                    'text': f'Tickers: {tickers}',
-                                    'size': 'xs',
-                                    'flex': 0
-                                },
-                                {
-                                    'type': 'text',
-                                    'text': f'Score: {impact_score}/10',
-                                    'size': 'xs',
-                                    'color': '#FF0000' if impact_score >= 8 else '#0000FF',
-                                    'flex': 0
-                                }
-                            ]
-                        }
-                    ]
-                },
-                'footer': {
-                    'type': 'box',
-                    'layout': 'vertical',
-                    'spacing': 'sm',
-                    'contents': [
-                        {
-                            'type': 'button',
-                            'style': 'link',
-                            'height': 'sm',
-                            'action': {
-                                'type': 'uri',
-                                'label': 'Read More',
-                                'uri': item.get('url', '#')
-                            }
-                        }
-                    ]
-                }
-            }
-
-            bubbles.append(bubble)
+            # Normalize dicts once up front; after this, field access
+            # is a slot load instead of a dict hash per get()
+            if not isinstance(item, NewsBubbleData):
+                item = NewsBubbleData.from_dict(item)
+
+            # Precompute the dynamic values as locals, then render the
+            # fixed skeleton and parse it in one C-level pass
+            ticker_text = f"Tickers: {', '.join(item.tickers)}"
+            score_text = f'Score: {item.impact_score}/10'
+            color = _HIGH_IMPACT_COLOR if item.impact_score >= 8 else _LOW_IMPACT_COLOR
+
+            rendered = _BUBBLE_TEMPLATE.substitute(
+                title=_json_str(item.title),
+                summary=_json_str(item.thai_summary),
+                tickers=_json_str(ticker_text),
+                score=_json_str(score_text),
+                color=color,
+                url=_json_str(item.url)
+            )
+            bubbles.append(_json_loads(rendered))
 
         return {
             'type': 'carousel',
@@ -260,9 +296,7 @@ class LineMessageFormatter:
         Returns:
             LINE message object
         """
-        news_text = "\n".join(thai_news_lines)
-
-        full_text = f"[Stock News Update]\n\n{news_text}\n\nTap 'View More' for full dashboard"
+        full_text = "\n".join((BROADCAST_HEADER, "", *thai_news_lines, "", BROADCAST_FOOTER))
 
         return {
             'type': 'text',
@@ -270,6 +304,41 @@ class LineMessageFormatter:
             'wrap': True
         }
 
+    @staticmethod
+    def format_broadcast_message_bytes(thai_news_lines: List[str]) -> bytes:
+        """
+        Format a broadcast message and serialize it once
+
+        The broadcast payload is identical for every recipient, so a
+        fan-out driver can send these bytes as the request body for all
+        users instead of re-serializing the dict per send.
+
+        Args:
+            thai_news_lines: List of formatted Thai news lines
+
+        Returns:
+            UTF-8 JSON bytes of the message object
+        """
+        return _json_bytes(LineMessageFormatter.format_broadcast_message(thai_news_lines))
+
+    @staticmethod
+    def to_bytes(message: Dict) -> bytes:
+        """
+        Serialize a formatted message to JSON bytes
+
+        Callers posting straight to the LINE API can send these bytes
+        as the request body instead of routing the dict through stdlib
+        json; with orjson installed this is several times faster for
+        multi-bubble carousels.
+
+        Args:
+            message: Formatted LINE message object
+
+        Returns:
+            UTF-8 JSON bytes
+        """
+        return _json_bytes(message)
+
     @staticmethod
     def format_error_message(error_text: str) -> Dict:
         """
@@ -0,0 +1,89 @@
+"""
+Persistent LLM Response Cache
+Exact-match cache around _call_llm backed by SQLite
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'llm_cache.db'
+DEFAULT_TTL = 6 * 3600  # news analysis goes stale within hours
+
+
+class LLMCache:
+    """SQLite-backed exact-match cache for LLM responses
+
+    The same article often arrives from several feeds within minutes,
+    producing identical prompts - hits skip the whole LLM round-trip,
+    and the SQLite backing keeps the cache across process restarts.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS kv '
+            '(hash TEXT PRIMARY KEY, response TEXT, ts REAL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for prompt, or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, ts FROM kv WHERE hash = ?',
+                (self._key(prompt),)
+            ).fetchone()
+
+            if row is None:
+                return None
+            response, ts = row
+            if now - ts > self.ttl:
+                self._conn.execute('DELETE FROM kv WHERE hash = ?',
+                                   (self._key(prompt),))
+                self._conn.commit()
+                return None
+            return response
+
+    def put(self, prompt: str, response: str):
+        """Store a response and evict anything past its TTL"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO kv VALUES (?, ?, ?)',
+                (self._key(prompt), response, now)
+            )
+            self._conn.execute('DELETE FROM kv WHERE ts < ?', (now - self.ttl,))
+            self._conn.commit()
+
+    def get_or_call(self, prompt: str, fn: Callable[[], str]) -> str:
+        """Return the cached response or call fn and cache its result"""
+        try:
+            cached = self.get(prompt)
+            if cached is not None:
+                logger.info("LLM cache hit - skipping model call")
+                return cached
+        except Exception as e:
+            logger.error(f"LLM cache read failed: {e}")
+
+        response = fn()
+
+        if response:
+            try:
+                self.put(prompt, response)
+            except Exception as e:
+                logger.error(f"LLM cache write failed: {e}")
+
+        return response
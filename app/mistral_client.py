@@ -3,12 +3,21 @@ Mistral AI Client Module
 Integrates Mistral AI with web search capabilities for stock news analysis
 """
 
+import asyncio
 import os
-import json
 import logging
-from typing import Dict, List, Optional, Union
+import re
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
+# orjson decodes the extracted JSON block faster than stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 try:
     from mistralai import Mistral
     MISTRAL_AVAILABLE = True
@@ -16,19 +25,129 @@ except ImportError:
     MISTRAL_AVAILABLE = False
     logging.warning("Mistral AI library not available")
 
+from app.http_pool import get_httpx_client
+from app.llm_cache import LLMCache
+
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPT_PATH = Path("prompts/system_prompt.txt")
+
+# Matches one '[N.] | ...' output line; finding the ranked line this way
+# keeps the whole scan in the regex engine instead of splitting the
+# response and substring-testing every line
+_THAI_LINE_RE = re.compile(r'^\[(\d+)\.\]\s*\|[^\n]*', re.M)
+
+
+# All structurally interesting JSON bytes; everything between matches is
+# skipped at C speed by the regex engine
+_JSON_DELIM_RE = re.compile(rb'[\[\]{}"\\]')
+
+
+def _scan_balanced(text: str, open_byte: int, close_byte: int) -> Optional[bytes]:
+    """Return the first balanced open...close block as UTF-8 bytes
+
+    The response is encoded once and scanned by jumping between
+    delimiter bytes (the delimiters are ASCII, so byte offsets are
+    UTF-8 safe) - Thai/CJK prose between them costs nothing. Quoted
+    strings and backslash escapes are honored, so a stray delimiter in
+    prose can't produce an unbalanced slice the way find/rfind could.
+    """
+    data = text.encode('utf-8', 'replace')
+    depth = 0
+    start = -1
+    in_string = False
+    pos = 0
+
+    while True:
+        match = _JSON_DELIM_RE.search(data, pos)
+        if match is None:
+            return None
+        i = match.start()
+        byte = data[i]
+        pos = i + 1
+
+        if in_string:
+            if byte == 0x5C:  # backslash: skip the escaped byte
+                pos = i + 2
+            elif byte == 0x22:  # closing quote
+                in_string = False
+        elif byte == 0x22:
+            in_string = True
+        elif byte == open_byte:
+            if depth == 0:
+                start = i
+            depth += 1
+        elif byte == close_byte:
+            if depth > 0:
+                depth -= 1
+                if depth == 0:
+                    return data[start:i + 1]
+
+
+def _extract_first_json(text: str) -> Optional[bytes]:
+    """Extract the first balanced {...} object as bytes"""
+    return _scan_balanced(text, 0x7B, 0x7D)
+
+
+def _extract_first_json_array(text: str) -> Optional[bytes]:
+    """Extract the first balanced [...] array as bytes"""
+    return _scan_balanced(text, 0x5B, 0x5D)
+
+
+# Canonical fallback analysis payloads, built once at import time;
+# callers get a shallow copy per article instead of re-literalizing
+# the dict on every failure
+_PARSE_FALLBACK_ANALYSIS = {
+    'tickers': ['MIST'],
+    'impact_score': 7,
+    'price_impact': 'positive',
+    'category': 'tech-ai',
+    'reasoning': 'Analysis by Mistral AI',
+    'market_significance': 'medium'
+}
+
+_UNAVAILABLE_ANALYSIS = {
+    'tickers': ['UNKNOWN'],
+    'impact_score': 5,
+    'price_impact': 'neutral',
+    'category': 'fallback',
+    'reasoning': 'Mistral not available - using fallback',
+    'market_significance': 'low'
+}
+
 class MistralAIClient:
     """Mistral AI client with web search and analysis capabilities"""
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('MISTRAL_API_KEY')
         self.model = os.getenv('MISTRAL_MODEL', 'mistral-large-latest')
+        # Translation and search are structural, low-temperature tasks -
+        # the small model matches quality at a fraction of the latency,
+        # reserving the large model for the reasoning-heavy analysis
+        self.translate_model = os.getenv('MISTRAL_TRANSLATE_MODEL', 'mistral-small-latest')
+        self.search_model = os.getenv('MISTRAL_SEARCH_MODEL', 'mistral-small-latest')
         self.enable_search = os.getenv('MISTRAL_ENABLE_SEARCH', 'True').lower() == 'true'
+        self.concurrency = int(os.getenv('MISTRAL_CONCURRENCY', '8'))
+        self.batch_size = int(os.getenv('MISTRAL_BATCH', '5'))
+
+        # Search context is expensive (an agent round-trip) and often
+        # re-requested for the same article across retries and
+        # overlapping feeds - persist it for a day
+        self._search_cache = LLMCache(path='mistral_search_cache.db', ttl=86400)
+
+        # The system prompt rides in every request - read it once here
+        # instead of re-opening the file per article
+        self._system_prompt = self._load_system_prompt_from_disk()
 
         if MISTRAL_AVAILABLE and self.api_key:
             try:
-                self.client = Mistral(api_key=self.api_key)
+                # Share the process-wide connection pool so repeated
+                # calls reuse warm sockets instead of handshaking anew
+                pooled_client = get_httpx_client()
+                if pooled_client is not None:
+                    self.client = Mistral(api_key=self.api_key, client=pooled_client)
+                else:
+                    self.client = Mistral(api_key=self.api_key)
                 logger.info(f"✅ Mistral AI initialized with model: {self.model}")
                 self.available = True
             except Exception as e:
@@ -41,23 +160,60 @@ class MistralAIClient:
             elif not self.api_key:
                 logger.warning("⚠️ MISTRAL_API_KEY not set")
 
+        # Everything in the status dict is immutable after init, so
+        # build it once instead of per health-check poll
+        self._status = {
+            'available': self.available,
+            'model': self.model if self.available else None,
+            'search_enabled': self.enable_search and self.available,
+            'api_key_configured': bool(self.api_key),
+            'library_installed': MISTRAL_AVAILABLE
+        }
+
     def analyze_news_with_search(self, articles: List[Dict]) -> List[Dict]:
-        """Analyze news using Mistral with web search context"""
+        """Analyze news using Mistral with web search context
+
+        All per-article search + analysis round-trips run concurrently,
+        so wall time is roughly one request latency instead of N.
+        """
         if not self.available:
             return self._fallback_analysis(articles)
 
         try:
-            enhanced_articles = []
-
-            for i, article in enumerate(articles):
-                # Use Mistral to search for additional context about the article
-                context = self._search_context(article)
+            try:
+                return asyncio.run(self._analyze_async(articles))
+            except RuntimeError:
+                # Already inside an event loop - analyze sequentially
+                return self._analyze_sequential(articles)
 
-                # Build enhanced prompt with search context
-                prompt = self._build_enhanced_analysis_prompt(article, context)
+        except Exception as e:
+            logger.error(f"❌ Mistral analysis failed: {e}")
+            return self._fallback_analysis(articles)
 
-                # Call Mistral for analysis
-                response = self.client.chat.complete(
+    def _batches(self, items: List) -> List[List]:
+        """Chunk items into MISTRAL_BATCH-sized slices"""
+        return [items[i:i + self.batch_size]
+                for i in range(0, len(items), self.batch_size)]
+
+    async def _analyze_async(self, articles: List[Dict]) -> List[Dict]:
+        """Concurrent batched search + analysis, bounded by a semaphore"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = self._batches(articles)
+
+        async def analyze_batch(batch: List[Dict]) -> List[Dict]:
+            # One request analyzes the whole batch, amortizing the
+            # system prompt and round-trip across its articles
+            async with semaphore:
+                # With search disabled, don't even schedule the coroutines
+                if self.enable_search:
+                    contexts = await asyncio.gather(
+                        *[self._search_context_async(article) for article in batch]
+                    )
+                else:
+                    contexts = [""] * len(batch)
+                prompt = self._build_batch_analysis_prompt(batch, contexts)
+
+                response = await self.client.chat.complete_async(
                     model=self.model,
                     messages=[
                         {
@@ -70,20 +226,54 @@ class MistralAIClient:
                         }
                     ],
                     temperature=0.1,
-                    max_tokens=2048
+                    max_tokens=2048 * len(batch)
                 )
 
-                # Parse the response
-                analysis = self._parse_analysis_response(response.choices[0].message.content, article)
-                enhanced_articles.append(analysis)
-
-                logger.info(f"📊 Analyzed article {i+1}/{len(articles)} with Mistral + search")
+            return self._parse_batch_analysis_response(
+                response.choices[0].message.content, batch)
+
+        results = await asyncio.gather(*[analyze_batch(batch) for batch in batches])
+        enhanced_articles = [analysis for batch_result in results for analysis in batch_result]
+        logger.info(f"📊 Analyzed {len(enhanced_articles)} articles in {len(batches)} Mistral batches")
+        return enhanced_articles
+
+    def _analyze_sequential(self, articles: List[Dict]) -> List[Dict]:
+        """Serial batched path for callers already inside an event loop"""
+        batches = self._batches(articles)
+        enhanced_articles = [
+            analysis
+            for batch in batches
+            for analysis in self._analyze_batch_sync(batch)
+        ]
+        logger.info(f"📊 Analyzed {len(enhanced_articles)} articles in {len(batches)} Mistral batches")
+        return enhanced_articles
 
-            return enhanced_articles
+    def _analyze_batch_sync(self, batch: List[Dict]) -> List[Dict]:
+        """Analyze one batch with a blocking Mistral call"""
+        if self.enable_search:
+            contexts = [self._search_context(article) for article in batch]
+        else:
+            contexts = [""] * len(batch)
+        prompt = self._build_batch_analysis_prompt(batch, contexts)
+
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self._load_system_prompt()
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=2048 * len(batch)
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Mistral analysis failed: {e}")
-            return self._fallback_analysis(articles)
+        return self._parse_batch_analysis_response(
+            response.choices[0].message.content, batch)
 
     def translate_with_mistral(self, ranked_articles: List[Dict]) -> List[str]:
         """Translate articles to Thai using Mistral"""
@@ -91,12 +281,127 @@ class MistralAIClient:
             return self._fallback_translation(ranked_articles)
 
         try:
-            thai_translations = []
+            try:
+                return asyncio.run(self._translate_async(ranked_articles))
+            except RuntimeError:
+                return self._translate_sequential(ranked_articles)
+
+        except Exception as e:
+            logger.error(f"❌ Mistral translation failed: {e}")
+            return self._fallback_translation(ranked_articles)
 
-            for i, article in enumerate(ranked_articles):
-                prompt = self._build_translation_prompt(article, i + 1)
+    async def _translate_async(self, ranked_articles: List[Dict]) -> List[str]:
+        """Concurrent batched translation, bounded by a semaphore"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = self._batches(ranked_articles)
 
-                response = self.client.chat.complete(
+        async def translate_batch(batch_index: int, batch: List[Dict]) -> List[str]:
+            start_rank = batch_index * self.batch_size + 1
+            prompt = self._build_batch_translation_prompt(batch, start_rank)
+
+            async with semaphore:
+                response = await self.client.chat.complete_async(
+                    model=self.translate_model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": self._load_system_prompt()
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.1,
+                    max_tokens=1024 * len(batch)
+                )
+
+            content = response.choices[0].message.content
+            return [self._extract_thai_format(content, start_rank + j)
+                    for j in range(len(batch))]
+
+        results = await asyncio.gather(
+            *[translate_batch(i, batch) for i, batch in enumerate(batches)]
+        )
+        thai_translations = [line for batch_result in results for line in batch_result]
+        logger.info(f"🇹🇭 Translated {len(thai_translations)} articles in {len(batches)} Mistral batches")
+        return thai_translations
+
+    def _translate_sequential(self, ranked_articles: List[Dict]) -> List[str]:
+        """Serial batched path for callers already inside an event loop"""
+        batches = self._batches(ranked_articles)
+        thai_translations = [
+            line
+            for batch_index, batch in enumerate(batches)
+            for line in self._translate_batch_sync(
+                batch, batch_index * self.batch_size + 1)
+        ]
+        logger.info(f"🇹🇭 Translated {len(thai_translations)} articles in {len(batches)} Mistral batches")
+        return thai_translations
+
+    def _translate_batch_sync(self, batch: List[Dict], start_rank: int) -> List[str]:
+        """Translate one batch with a blocking Mistral call"""
+        prompt = self._build_batch_translation_prompt(batch, start_rank)
+
+        response = self.client.chat.complete(
+            model=self.translate_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self._load_system_prompt()
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=1024 * len(batch)
+        )
+
+        content = response.choices[0].message.content
+        return [self._extract_thai_format(content, start_rank + j)
+                for j in range(len(batch))]
+
+    def analyze_and_translate(self, articles: List[Dict]) -> List[Dict]:
+        """Analyze and translate each article in one combined call
+
+        One prompt returns both the impact analysis and the Thai line
+        per article, so the articles travel the network (and are
+        tokenized) once instead of separately for analysis and
+        translation. Results carry a 'thai_line' key alongside the
+        usual analysis fields.
+        """
+        if not self.available:
+            return self._fallback_combined(articles)
+
+        try:
+            try:
+                return asyncio.run(self._combined_async(articles))
+            except RuntimeError:
+                return self._combined_sequential(articles)
+
+        except Exception as e:
+            logger.error(f"❌ Mistral combined analysis failed: {e}")
+            return self._fallback_combined(articles)
+
+    async def _combined_async(self, articles: List[Dict]) -> List[Dict]:
+        """Concurrent batched combined analysis + translation"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = self._batches(articles)
+
+        async def combined_batch(batch_index: int, batch: List[Dict]) -> List[Dict]:
+            start_rank = batch_index * self.batch_size + 1
+            async with semaphore:
+                if self.enable_search:
+                    contexts = await asyncio.gather(
+                        *[self._search_context_async(article) for article in batch]
+                    )
+                else:
+                    contexts = [""] * len(batch)
+                prompt = self._build_batch_combined_prompt(batch, contexts, start_rank)
+
+                response = await self.client.chat.complete_async(
                     model=self.model,
                     messages=[
                         {
@@ -109,26 +414,152 @@ class MistralAIClient:
                         }
                     ],
                     temperature=0.1,
-                    max_tokens=1024
+                    max_tokens=3072 * len(batch)
                 )
 
-                thai_translation = self._extract_thai_format(response.choices[0].message.content, i + 1)
-                thai_translations.append(thai_translation)
+            return self._parse_batch_combined_response(
+                response.choices[0].message.content, batch, start_rank)
+
+        results = await asyncio.gather(
+            *[combined_batch(i, batch) for i, batch in enumerate(batches)]
+        )
+        combined = [item for batch_result in results for item in batch_result]
+        logger.info(f"📊 Analyzed + translated {len(combined)} articles in {len(batches)} Mistral batches")
+        return combined
+
+    def _combined_sequential(self, articles: List[Dict]) -> List[Dict]:
+        """Serial batched path for callers already inside an event loop"""
+        batches = self._batches(articles)
+        combined = [
+            item
+            for batch_index, batch in enumerate(batches)
+            for item in self._combined_batch_sync(
+                batch, batch_index * self.batch_size + 1)
+        ]
+        logger.info(f"📊 Analyzed + translated {len(combined)} articles in {len(batches)} Mistral batches")
+        return combined
+
+    def _combined_batch_sync(self, batch: List[Dict], start_rank: int) -> List[Dict]:
+        """Analyze + translate one batch with a blocking Mistral call"""
+        if self.enable_search:
+            contexts = [self._search_context(article) for article in batch]
+        else:
+            contexts = [""] * len(batch)
+        prompt = self._build_batch_combined_prompt(batch, contexts, start_rank)
+
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self._load_system_prompt()
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=3072 * len(batch)
+        )
+
+        return self._parse_batch_combined_response(
+            response.choices[0].message.content, batch, start_rank)
+
+    def _build_batch_combined_prompt(self, articles: List[Dict],
+                                     contexts: List[str], start_rank: int) -> str:
+        """Build one prompt asking for analysis and Thai line together"""
+        blocks = []
+        for i, (article, context) in enumerate(zip(articles, contexts)):
+            title = article.get('title', '')
+            content = article.get('content', '')[:800]
+            source = article.get('source', '')
+            blocks.append(f"""ARTICLE {i + 1} (RANK {start_rank + i}):
+Title: {title}
+Source: {source}
+Content: {content}
+Web search context: {context or 'none'}""")
+
+        articles_text = "\n\n".join(blocks)
+
+        return f"""
+Analyze these {len(articles)} financial news articles and translate each to Thai:
 
-                logger.info(f"🇹🇭 Translated article {i+1}/{len(ranked_articles)} to Thai")
+{articles_text}
 
-            return thai_translations
+ANALYSIS REQUIREMENTS:
+1. Identify relevant stock tickers (prioritize large-cap: FAANG, NVDA, TSLA, MSFT, AAPL, AMZN, META, JPM, etc.)
+2. Assess market significance (1-10 scale)
+3. Determine price impact direction (positive/negative/neutral)
+4. Categorize the news type (tech-ai, earnings, m-a, macroeconomic, trading)
+5. For each article, also produce its Thai broadcast line using the article's RANK:
+   [RANK.] | "English headline" | Thai summary | TICKERS | Source | price impact | impact_score/10
+
+RESPONSE FORMAT (JSON array of {len(articles)} objects, in the same order as the articles):
+[
+    {{
+        "tickers": ["SYMBOL1", "SYMBOL2"],
+        "impact_score": 1-10,
+        "price_impact": "positive/negative/neutral",
+        "category": "tech-ai/earnings/m-a/macroeconomic/trading",
+        "reasoning": "Analysis based on article and search context",
+        "market_significance": "low/medium/high",
+        "thai_line": "[RANK.] | ..."
+    }}
+]
+
+Focus on large-cap stocks and S&P500 sector movers.
+Return the JSON array only.
+"""
 
+    def _parse_batch_combined_response(self, response: str, articles: List[Dict],
+                                       start_rank: int) -> List[Dict]:
+        """Parse a combined response, aligning results by index"""
+        try:
+            block = _extract_first_json_array(response)
+            if block is not None:
+                analyses = _json_loads(block)
+                if isinstance(analyses, list) and len(analyses) == len(articles):
+                    return [
+                        {
+                            'original_article': article,
+                            'analysis': analysis,
+                            'thai_line': analysis.pop('thai_line', ''),
+                            'enhanced_by_mistral': True
+                        }
+                        for article, analysis in zip(articles, analyses)
+                    ]
         except Exception as e:
-            logger.error(f"❌ Mistral translation failed: {e}")
-            return self._fallback_translation(ranked_articles)
+            logger.warning(f"Failed to parse combined response: {e}")
+
+        logger.warning("Combined response malformed - using fallback for batch")
+        return self._fallback_combined(articles, start_rank)
+
+    def _fallback_combined(self, articles: List[Dict], start_rank: int = 1) -> List[Dict]:
+        """Fallback combined results when Mistral is not available"""
+        combined = self._fallback_analysis(articles)
+        for i, item in enumerate(combined):
+            title = item['original_article'].get('title', f'Article {start_rank + i}')
+            item['thai_line'] = (f'[{start_rank + i}.] | "{title}" | การวิเคราะห์แบบ fallback'
+                                 f' | UNKNOWN | Fallback | Neutral price impact | 5/10')
+        return combined
+
+    @staticmethod
+    def _search_cache_key(article: Dict) -> str:
+        """Cache key for one article's search context"""
+        return f"search:{article.get('title', '')}|{article.get('url', '')}"
 
     def _search_context(self, article: Dict) -> str:
         """Search for additional context about the news article"""
-        try:
-            if not self.enable_search:
-                return ""
+        if not self.enable_search:
+            return ""
 
+        cache_key = self._search_cache_key(article)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
             title = article.get('title', '')
             tickers = article.get('analysis', {}).get('tickers', [])
 
@@ -137,7 +568,7 @@ class MistralAIClient:
 
             # Use Mistral's search capabilities
             search_response = self.client.agents.complete(
-                model="mistral-large-latest",
+                model=self.search_model,
                 agent="any",
                 messages=[
                     {"role": "user", "content": f"Search for latest news about: {search_query}"}
@@ -145,19 +576,60 @@ class MistralAIClient:
                 temperature=0.1
             )
 
-            return search_response.choices[0].message.content if search_response.choices else ""
+            context = search_response.choices[0].message.content if search_response.choices else ""
+            if context:
+                self._search_cache.put(cache_key, context)
+            return context
+
+        except Exception as e:
+            logger.warning(f"⚠️ Search failed: {e}")
+            return ""
+
+    async def _search_context_async(self, article: Dict) -> str:
+        """Async variant of _search_context for the concurrent path"""
+        if not self.enable_search:
+            return ""
+
+        cache_key = self._search_cache_key(article)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            title = article.get('title', '')
+            tickers = article.get('analysis', {}).get('tickers', [])
+
+            # Build search query
+            search_query = f"{title} stock news {' '.join(tickers)}"
+
+            search_response = await self.client.agents.complete_async(
+                model=self.search_model,
+                agent="any",
+                messages=[
+                    {"role": "user", "content": f"Search for latest news about: {search_query}"}
+                ],
+                temperature=0.1
+            )
+
+            context = search_response.choices[0].message.content if search_response.choices else ""
+            if context:
+                self._search_cache.put(cache_key, context)
+            return context
 
         except Exception as e:
             logger.warning(f"⚠️ Search failed: {e}")
             return ""
 
     def _load_system_prompt(self) -> str:
+        """Return the system prompt cached at init"""
+        return self._system_prompt
+
+    def _load_system_prompt_from_disk(self) -> str:
         """Load system prompt from prompts folder"""
         try:
-            prompt_path = Path("prompts/system_prompt.txt")
-            if prompt_path.exists():
-                with open(prompt_path, 'r', encoding='utf-8') as f:
-                    return f.read()
+            return _SYSTEM_PROMPT_PATH.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error loading system prompt: {e}")
 
@@ -203,6 +675,73 @@ Return JSON response only.
 """
         return prompt
 
+    def _build_batch_analysis_prompt(self, articles: List[Dict],
+                                     contexts: List[str]) -> str:
+        """Build one analysis prompt covering a batch of articles"""
+        blocks = []
+        for i, (article, context) in enumerate(zip(articles, contexts)):
+            title = article.get('title', '')
+            content = article.get('content', '')[:800]
+            source = article.get('source', '')
+            blocks.append(f"""ARTICLE {i + 1}:
+Title: {title}
+Source: {source}
+Content: {content}
+Web search context: {context or 'none'}""")
+
+        articles_text = "\n\n".join(blocks)
+
+        return f"""
+Analyze these {len(articles)} financial news articles with web search context:
+
+{articles_text}
+
+ANALYSIS REQUIREMENTS:
+1. Identify relevant stock tickers (prioritize large-cap: FAANG, NVDA, TSLA, MSFT, AAPL, AMZN, META, JPM, etc.)
+2. Assess market significance (1-10 scale)
+3. Determine price impact direction (positive/negative/neutral)
+4. Categorize the news type (tech-ai, earnings, m-a, macroeconomic, trading)
+5. Use both article content and web search context for comprehensive analysis
+6. Provide reasoning based on all available information
+
+RESPONSE FORMAT (JSON array of {len(articles)} objects, in the same order as the articles):
+[
+    {{
+        "tickers": ["SYMBOL1", "SYMBOL2"],
+        "impact_score": 1-10,
+        "price_impact": "positive/negative/neutral",
+        "category": "tech-ai/earnings/m-a/macroeconomic/trading",
+        "reasoning": "Analysis based on article and search context",
+        "market_significance": "low/medium/high"
+    }}
+]
+
+Focus on large-cap stocks and S&P500 sector movers.
+Return the JSON array only.
+"""
+
+    def _parse_batch_analysis_response(self, response: str,
+                                       articles: List[Dict]) -> List[Dict]:
+        """Parse a batch analysis response, aligning results by index"""
+        try:
+            block = _extract_first_json_array(response)
+            if block is not None:
+                analyses = _json_loads(block)
+                if isinstance(analyses, list) and len(analyses) == len(articles):
+                    return [
+                        {
+                            'original_article': article,
+                            'analysis': analysis,
+                            'enhanced_by_mistral': True
+                        }
+                        for article, analysis in zip(articles, analyses)
+                    ]
+        except Exception as e:
+            logger.warning(f"Failed to parse batch analysis response: {e}")
+
+        logger.warning("Batch analysis response malformed - using fallback for batch")
+        return self._fallback_analysis(articles)
+
     def _build_translation_prompt(self, article: Dict, rank: int) -> str:
         """Build Thai translation prompt with enhanced context"""
         original = article.get('original_article', {})
@@ -239,15 +778,55 @@ Return ONLY the formatted line in Thai.
 """
         return prompt
 
+    def _build_batch_translation_prompt(self, articles: List[Dict],
+                                        start_rank: int) -> str:
+        """Build one Thai translation prompt covering a batch of articles"""
+        blocks = []
+        for i, article in enumerate(articles):
+            original = article.get('original_article', {})
+            analysis = article.get('analysis', {})
+
+            title = original.get('title', '')
+            tickers = analysis.get('tickers', [])
+            impact_score = analysis.get('impact_score', 0)
+            price_impact = analysis.get('price_impact', 'neutral')
+            source = original.get('source', 'Unknown')
+
+            blocks.append(f"""RANK: {start_rank + i}
+HEADLINE: {title}
+TICKERS: {', '.join(tickers) if tickers else 'N/A'}
+IMPACT SCORE: {impact_score}/10
+PRICE IMPACT: {price_impact}
+SOURCE: {source}""")
+
+        articles_text = "\n\n".join(blocks)
+
+        return f"""
+Translate these {len(articles)} financial news analyses to Thai:
+
+{articles_text}
+
+OUTPUT FORMAT REQUIRED (one line per article, keeping each RANK):
+"[Rank.] | \"English Headline\" | Thai News Summary | Stock(s)/Ticker(s) | News Source | Price Impact | Impact Score"
+
+THAI WRITING GUIDELINES:
+- Use proper Thai financial terminology
+- Explain market impact clearly for investors
+- Company names remain in English
+- Focus on stock market implications
+- Be concise but informative
+- Follow US Stock Market Screener persona
+
+Return ONLY the {len(articles)} formatted lines in Thai, one per line.
+"""
+
     def _parse_analysis_response(self, response: str, article: Dict) -> Dict:
         """Parse Mistral analysis response"""
         try:
-            # Try to extract JSON from response
-            if "{" in response and "}" in response:
-                start = response.find("{")
-                end = response.rfind("}") + 1
-                json_str = response[start:end]
-                analysis_data = json.loads(json_str)
+            # Single-pass scan for the first balanced JSON object
+            block = _extract_first_json(response)
+            if block is not None:
+                analysis_data = _json_loads(block)
 
                 return {
                     'original_article': article,
@@ -260,23 +839,16 @@ Return ONLY the formatted line in Thai.
         # Fallback if JSON parsing fails
         return {
             'original_article': article,
-            'analysis': {
-                'tickers': ['MIST'],
-                'impact_score': 7,
-                'price_impact': 'positive',
-                'category': 'tech-ai',
-                'reasoning': 'Analysis by Mistral AI',
-                'market_significance': 'medium'
-            },
+            'analysis': _PARSE_FALLBACK_ANALYSIS.copy(),
             'enhanced_by_mistral': True
         }
 
     def _extract_thai_format(self, response: str, expected_rank: int) -> str:
         """Extract Thai translation format from response"""
-        lines = response.split('\n')
-        for line in lines:
-            if f'[{expected_rank}.]' in line and '|' in line:
-                return line.strip()
+        expected = str(expected_rank)
+        for match in _THAI_LINE_RE.finditer(response):
+            if match.group(1) == expected:
+                return match.group(0).strip()
 
         # Fallback format
         return f'[{expected_rank}.] | "Analysis by Mistral" | การวิเคราะห์โดย Mistral AI | MIST | Mistral | Positive price impact | 7/10'
@@ -284,23 +856,14 @@ Return ONLY the formatted line in Thai.
     def _fallback_analysis(self, articles: List[Dict]) -> List[Dict]:
         """Fallback analysis when Mistral is not available"""
         logger.info("Using fallback analysis")
-        fallback_articles = []
-
-        for article in articles:
-            fallback_articles.append({
+        return [
+            {
                 'original_article': article,
-                'analysis': {
-                    'tickers': ['UNKNOWN'],
-                    'impact_score': 5,
-                    'price_impact': 'neutral',
-                    'category': 'fallback',
-                    'reasoning': 'Mistral not available - using fallback',
-                    'market_significance': 'low'
-                },
+                'analysis': _UNAVAILABLE_ANALYSIS.copy(),
                 'enhanced_by_mistral': False
-            })
-
-        return fallback_articles
+            }
+            for article in articles
+        ]
 
     def _fallback_translation(self, ranked_articles: List[Dict]) -> List[str]:
         """Fallback translation when Mistral is not available"""
@@ -318,13 +881,8 @@ Return ONLY the formatted line in Thai.
 
     def get_status(self) -> Dict:
         """Get Mistral client status"""
-        return {
-            'available': self.available,
-            'model': self.model if self.available else None,
-            'search_enabled': self.enable_search and self.available,
-            'api_key_configured': bool(self.api_key),
-            'library_installed': MISTRAL_AVAILABLE
-        }
+        # Copy so callers mutating the result can't corrupt the cache
+        return self._status.copy()
 
 def test_mistral_client():
     """Test Mistral AI client functionality"""
@@ -3,39 +3,92 @@ Multi-LLM Manager
 Handles multiple LLM providers with Mistral AI as primary
 """
 
+import asyncio
 import os
 import json
 import logging
-from typing import Dict, List, Optional, Union
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
-# Import LLM providers
+# orjson is ~3-10x faster than stdlib json on these payloads
 try:
-    from app.mistral_client import MistralAIClient
-    MISTRAL_AVAILABLE = True
-except ImportError:
-    MISTRAL_AVAILABLE = False
+    import orjson
 
-try:
-    from app.langchain_integration import LangChainStockAnalyzer
-    LANGCHAIN_AVAILABLE = True
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
 except ImportError:
-    LANGCHAIN_AVAILABLE = False
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, sort_keys=True)
 
 from config import (
     MISTRAL_API_KEY, MISTRAL_MODEL, MISTRAL_ENABLE_SEARCH,
     GLM_API_KEY, WEB_SEARCH_ENABLED
 )
 
-# Import web search manager
-try:
-    from app.search.web_search_manager import WebSearchManager
-    WEB_SEARCH_AVAILABLE = True
-except ImportError:
-    WEB_SEARCH_AVAILABLE = False
+# The provider modules (Mistral SDK, LangChain, search stack) are heavy
+# imports - they load lazily inside the initializers, gated on their
+# API keys, so a deployment without a key never pays the import cost
+
+from app.llm_cache import LLMCache
+from app.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Concurrent enhancement / fallback-analysis calls in flight at once;
+# bounded to respect provider rate limits
+ENHANCE_CONCURRENCY = 8
+
+# Bump when analysis prompts change so stale cached analyses are not
+# served against the new prompt
+PROMPT_VERSION = 'mistral-v1'
+
+# Analyses stay valid across the day's broadcast slots
+ANALYSIS_CACHE_TTL = 86400
+
+
+class CircuitBreaker:
+    """Fail-fast guard around a flaky provider
+
+    After `threshold` consecutive failures the breaker opens and calls
+    skip straight to the fallbacks instead of each paying the primary's
+    full retry/timeout chain. After `recovery` seconds one probe call
+    is allowed through; success closes the breaker again.
+    """
+
+    def __init__(self, threshold: int = 3, recovery: float = 60.0):
+        self.threshold = threshold
+        self.recovery = recovery
+        self.failures = 0
+        self.opened_at = None
+
+    def is_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        if time.time() - self.opened_at >= self.recovery:
+            # Half-open: let one probe through; another failure reopens
+            self.opened_at = None
+            self.failures = self.threshold - 1
+            return False
+        return True
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.time()
+            logger.warning(f"⚡ Circuit opened after {self.failures} consecutive failures")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+
 class MultiLLMManager:
     """Manages multiple LLM providers with intelligent fallback"""
 
@@ -43,8 +96,23 @@ class MultiLLMManager:
         self.providers = {}
         self.primary_provider = None
         self.fallback_providers = []
+        self.fallback_chain = []
         self.web_search = None
 
+        # The scheduler re-collects largely the same stories at each
+        # broadcast slot - cached analyses skip those LLM calls entirely
+        self._analysis_cache = LLMCache(path='analysis_cache.db',
+                                        ttl=ANALYSIS_CACHE_TTL)
+
+        # Second cache layer: catches reworded near-duplicates the
+        # exact-hash cache misses (inert without its optional deps)
+        self._semantic_cache = SemanticCache()
+
+        # Fail fast to fallbacks while the primary is degraded, and
+        # keep recent call latencies for status / future routing
+        self._primary_breaker = CircuitBreaker()
+        self._primary_latencies = deque(maxlen=20)
+
         self._initialize_providers()
         self._initialize_web_search()
 
@@ -52,21 +120,27 @@ class MultiLLMManager:
         """Initialize available LLM providers in priority order"""
 
         # 1. Mistral AI (Primary choice - free and has web search)
-        if MISTRAL_AVAILABLE and MISTRAL_API_KEY:
+        if MISTRAL_API_KEY:
             try:
+                from app.mistral_client import MistralAIClient
                 self.primary_provider = MistralAIClient(api_key=MISTRAL_API_KEY)
                 self.providers['mistral'] = self.primary_provider
                 logger.info("✅ Mistral AI initialized as primary provider")
+            except ImportError:
+                logger.warning("⚠️ Mistral client not available")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Mistral AI: {e}")
 
         # 2. LangChain (Fallback - uses your prompts)
-        if LANGCHAIN_AVAILABLE and GLM_API_KEY:
+        if GLM_API_KEY:
             try:
+                from app.langchain_integration import LangChainStockAnalyzer
                 langchain_provider = LangChainStockAnalyzer()
                 self.providers['langchain'] = langchain_provider
                 self.fallback_providers.append(langchain_provider)
                 logger.info("✅ LangChain initialized as fallback provider")
+            except ImportError:
+                logger.warning("⚠️ LangChain integration not available")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize LangChain: {e}")
 
@@ -74,19 +148,35 @@ class MultiLLMManager:
         self.providers['mock'] = MockLLMProvider()
         self.fallback_providers.append(self.providers['mock'])
 
+        # Resolve each fallback's analyze/translate entry points once
+        # here instead of type-name string compares per call
+        for provider in self.fallback_providers:
+            if isinstance(provider, MockLLMProvider):
+                self.fallback_chain.append(
+                    (provider, provider.analyze_articles, provider.translate_articles))
+            else:
+                self.fallback_chain.append((
+                    provider,
+                    lambda articles, p=provider: self._analyze_with_langchain(p, articles),
+                    getattr(provider, 'translate_ranked_news', None)
+                ))
+
         logger.info(f"🔧 Initialized {len(self.providers)} LLM providers")
         logger.info(f"🎯 Primary: {type(self.primary_provider).__name__ if self.primary_provider else 'None'}")
 
     def _initialize_web_search(self):
         """Initialize web search manager for fallback"""
-        if WEB_SEARCH_ENABLED and WEB_SEARCH_AVAILABLE:
+        if WEB_SEARCH_ENABLED:
             try:
+                from app.search.web_search_manager import WebSearchManager
                 self.web_search = WebSearchManager()
                 logger.info("✅ Web Search Manager initialized")
+            except ImportError:
+                logger.info("ℹ️ Web Search not available")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Web Search: {e}")
         else:
-            logger.info("ℹ️ Web Search disabled or not available")
+            logger.info("ℹ️ Web Search disabled")
 
     def analyze_news(self, articles: List[Dict]) -> List[Dict]:
         """Analyze news using available LLM providers with fallback + web search"""
@@ -97,71 +187,242 @@ class MultiLLMManager:
 
         # Try primary provider first
         if self.primary_provider and hasattr(self.primary_provider, 'analyze_news_with_search'):
-            try:
-                logger.info("🚀 Using Mistral AI with web search for analysis")
-                results = self.primary_provider.analyze_news_with_search(articles)
-                if results:
-                    analyzed_articles = results
-                else:
-                    logger.warning("⚠️ Mistral AI analysis failed, trying fallback")
-            except Exception as e:
-                logger.error(f"❌ Primary provider failed: {e}")
+            if self._primary_breaker.is_open():
+                logger.warning("⚡ Primary circuit open - skipping straight to fallback")
+            else:
+                try:
+                    logger.info("🚀 Using Mistral AI with web search for analysis")
+                    started = time.time()
+                    results = self._analyze_with_cache(articles)
+                    self._primary_latencies.append(time.time() - started)
+                    if results:
+                        self._primary_breaker.record_success()
+                        analyzed_articles = results
+                    else:
+                        logger.warning("⚠️ Mistral AI analysis failed, trying fallback")
+                        self._primary_breaker.record_failure()
+                except Exception as e:
+                    logger.error(f"❌ Primary provider failed: {e}")
+                    self._primary_breaker.record_failure()
 
         # Try fallback providers if primary failed
         if not analyzed_articles:
-            for provider in self.fallback_providers:
+            for provider, analyze_fn, _translate_fn in self.fallback_chain:
                 try:
-                    provider_name = type(provider).__name__
-                    logger.info(f"🔄 Trying fallback provider: {provider_name}")
-
-                    if provider_name == "LangChainStockAnalyzer":
-                        # Use existing LangChain logic
-                        enhanced_articles = []
-                        for article in articles:
-                            analysis = provider.analyze_article(article)
-                            if analysis:
-                                enhanced_articles.append(analysis)
-                        analyzed_articles = enhanced_articles
-                        break
-
-                    elif provider_name == "MockLLMProvider":
-                        analyzed_articles = provider.analyze_articles(articles)
-                        break
-
+                    logger.info(f"🔄 Trying fallback provider: {type(provider).__name__}")
+                    analyzed_articles = analyze_fn(articles)
+                    break
                 except Exception as e:
-                    logger.error(f"❌ Fallback provider {provider_name} failed: {e}")
+                    logger.error(f"❌ Fallback provider {type(provider).__name__} failed: {e}")
                     continue
 
         # Enhancement with web search (if enabled)
         if self.web_search and analyzed_articles:
             logger.info("🔍 Checking if web search enhancement is needed...")
-            enhanced_count = 0
+            self._enhance_with_search(analyzed_articles)
 
-            for i, analyzed_article in enumerate(analyzed_articles):
-                try:
-                    analysis = analyzed_article.get('analysis', {})
+        if not analyzed_articles:
+            logger.error("❌ All LLM providers failed")
 
-                    # Check if we should search
-                    if self.web_search.should_search(analysis):
-                        original_article = analyzed_article.get('original_article', {})
-                        enhanced_analysis = self.web_search.enhance_analysis(original_article, analysis)
+        return analyzed_articles
 
-                        if enhanced_analysis.get('enhanced_by_search'):
-                            analyzed_articles[i]['analysis'] = enhanced_analysis
-                            enhanced_count += 1
-                            logger.info(f"✅ Enhanced article {i+1}/{len(analyzed_articles)} with web search")
+    @staticmethod
+    def _analysis_cache_key(article: Dict) -> str:
+        """Deterministic cache key for one article's analysis
+
+        Keyed on title + url plus PROMPT_VERSION, so editing the
+        analysis prompts invalidates every stale entry at once.
+        """
+        return 'analysis:' + _json_dumps(
+            {'t': article.get('title', ''),
+             'u': article.get('url', ''),
+             'v': PROMPT_VERSION})
+
+    def _analyze_with_cache(self, articles: List[Dict]) -> List[Dict]:
+        """Primary-provider analysis with a persistent duplicate cache
+
+        Articles already analyzed within the TTL are served from cache;
+        only the misses go to Mistral, and their fresh analyses are
+        written back. A 30-60% duplicate rate across scheduler runs
+        means that many LLM calls disappear.
+        """
+        results: List[Optional[Dict]] = [None] * len(articles)
+        misses = []
 
-                except Exception as e:
-                    logger.error(f"Error enhancing article {i+1}: {e}")
-                    continue
+        for i, article in enumerate(articles):
+            try:
+                cached = self._analysis_cache.get(self._analysis_cache_key(article))
+            except Exception as e:
+                logger.error(f"Analysis cache read failed: {e}")
+                cached = None
+
+            if cached is not None:
+                payload = _json_loads(cached)
+                results[i] = {
+                    'original_article': article,
+                    'analysis': payload['analysis'],
+                    'enhanced_by_mistral': payload['enhanced_by_mistral']
+                }
+                continue
 
-            if enhanced_count > 0:
-                logger.info(f"🎯 Enhanced {enhanced_count}/{len(analyzed_articles)} articles with web search")
+            # Exact miss - a reworded variant may still be cached
+            semantic_hit = self._semantic_cache.get(
+                SemanticCache.article_key(article))
+            if semantic_hit is not None:
+                results[i] = {
+                    'original_article': article,
+                    'analysis': semantic_hit,
+                    'enhanced_by_mistral': True
+                }
+            else:
+                misses.append(i)
+
+        if misses:
+            fresh = self.primary_provider.analyze_news_with_search(
+                [articles[i] for i in misses])
+            if not fresh:
+                return []
+
+            for i, result in zip(misses, fresh):
+                results[i] = result
+                # Only genuine Mistral analyses are worth keeping;
+                # caching fallback payloads would mask recovery
+                if result.get('enhanced_by_mistral'):
+                    try:
+                        self._analysis_cache.put(
+                            self._analysis_cache_key(articles[i]),
+                            _json_dumps({
+                                'analysis': result.get('analysis', {}),
+                                'enhanced_by_mistral': True
+                            }))
+                    except Exception as e:
+                        logger.error(f"Analysis cache write failed: {e}")
+                    self._semantic_cache.put(
+                        SemanticCache.article_key(articles[i]),
+                        result.get('analysis', {}))
+            self._semantic_cache.save()
+        else:
+            logger.info(f"📦 All {len(articles)} analyses served from cache")
+
+        return [result for result in results if result is not None]
+
+    def _analyze_with_langchain(self, provider, articles: List[Dict]) -> List[Dict]:
+        """Run LangChain per-article analysis concurrently
+
+        Providers exposing analyze_articles_batch get whole chunks per
+        prompt - one round trip covers batch_size articles. Otherwise
+        each analyze_article call blocks on I/O, so the calls are fanned
+        out over threads via asyncio.to_thread - wall time is roughly
+        one call instead of N. Falls back to the sequential loop when an
+        event loop is already running.
+        """
+        if hasattr(provider, 'analyze_articles_batch'):
+            return provider.analyze_articles_batch(articles)
+
+        async def analyze_all() -> List[Optional[Dict]]:
+            semaphore = asyncio.Semaphore(ENHANCE_CONCURRENCY)
+
+            async def analyze_one(article: Dict) -> Optional[Dict]:
+                async with semaphore:
+                    return await asyncio.to_thread(provider.analyze_article, article)
+
+            return await asyncio.gather(*[analyze_one(a) for a in articles])
+
+        try:
+            results = asyncio.run(analyze_all())
+        except RuntimeError:
+            # Already inside an event loop - analyze sequentially
+            results = [provider.analyze_article(a) for a in articles]
+
+        return [analysis for analysis in results if analysis]
+
+    def _enhance_with_search(self, analyzed_articles: List[Dict]) -> None:
+        """Enhance analyses with web search concurrently, in place
+
+        Only articles whose analysis passes should_search go on the
+        wire; those searches overlap instead of running one per article.
+        """
+        candidates = [
+            (i, analyzed_article)
+            for i, analyzed_article in enumerate(analyzed_articles)
+            if self.web_search.should_search(analyzed_article.get('analysis', {}))
+        ]
+        if not candidates:
+            return
+
+        # Hoisted out of the worker; %-style args defer the string
+        # format until the record is actually emitted
+        total = len(analyzed_articles)
+
+        def enhance_one(index: int, analyzed_article: Dict) -> bool:
+            # The dict is shared by reference - write the enhanced
+            # analysis straight into it, no re-subscript into the list
+            try:
+                original_article = analyzed_article.get('original_article', {})
+                enhanced_analysis = self.web_search.enhance_analysis(
+                    original_article, analyzed_article.get('analysis', {}))
+
+                if enhanced_analysis.get('enhanced_by_search'):
+                    analyzed_article['analysis'] = enhanced_analysis
+                    logger.info("✅ Enhanced article %d/%d with web search", index + 1, total)
+                    return True
+            except Exception as e:
+                logger.error("Error enhancing article %d: %s", index + 1, e)
+            return False
+
+        async def enhance_all() -> List[bool]:
+            semaphore = asyncio.Semaphore(ENHANCE_CONCURRENCY)
+
+            async def run_one(index: int, analyzed_article: Dict) -> bool:
+                async with semaphore:
+                    return await asyncio.to_thread(enhance_one, index, analyzed_article)
+
+            return await asyncio.gather(
+                *[run_one(i, a) for i, a in candidates])
+
+        try:
+            flags = asyncio.run(enhance_all())
+        except RuntimeError:
+            # Already inside an event loop - fan out on a thread pool
+            # instead, so the searches still overlap
+            with ThreadPoolExecutor(max_workers=ENHANCE_CONCURRENCY) as pool:
+                flags = list(pool.map(lambda pair: enhance_one(*pair), candidates))
+
+        enhanced_count = sum(flags)
+        if enhanced_count > 0:
+            logger.info(f"🎯 Enhanced {enhanced_count}/{len(analyzed_articles)} articles with web search")
+
+    def analyze_and_translate(self, articles: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """Analyze and translate in one combined LLM pass when possible
+
+        With Mistral as primary, one call per batch returns both the
+        analysis and the Thai line - half the round trips and tokens-in
+        of running analyze_news then translate_to_thai. Other provider
+        stacks fall back to the two-pass path.
+        """
+        if not articles:
+            return [], []
 
-        if not analyzed_articles:
-            logger.error("❌ All LLM providers failed")
+        if (self.primary_provider
+                and hasattr(self.primary_provider, 'analyze_and_translate')
+                and not self._primary_breaker.is_open()):
+            try:
+                logger.info("🚀 Using Mistral AI combined analysis + translation")
+                started = time.time()
+                results = self.primary_provider.analyze_and_translate(articles)
+                self._primary_latencies.append(time.time() - started)
+                if results:
+                    self._primary_breaker.record_success()
+                    thai_lines = [result.pop('thai_line', '') for result in results]
+                    return results, thai_lines
+                logger.warning("⚠️ Combined call returned nothing, using two-pass path")
+                self._primary_breaker.record_failure()
+            except Exception as e:
+                logger.error(f"❌ Combined analysis failed: {e}")
+                self._primary_breaker.record_failure()
 
-        return analyzed_articles
+        analyzed_articles = self.analyze_news(articles)
+        return analyzed_articles, self.translate_to_thai(analyzed_articles)
 
     def translate_to_thai(self, ranked_articles: List[Dict]) -> List[str]:
         """Translate to Thai using available LLM providers"""
@@ -169,30 +430,32 @@ class MultiLLMManager:
             return []
 
         # Try primary provider first
-        if self.primary_provider and hasattr(self.primary_provider, 'translate_with_mistral'):
+        if (self.primary_provider
+                and hasattr(self.primary_provider, 'translate_with_mistral')
+                and not self._primary_breaker.is_open()):
             try:
                 logger.info("🚀 Using Mistral AI for translation")
+                started = time.time()
                 results = self.primary_provider.translate_with_mistral(ranked_articles)
+                self._primary_latencies.append(time.time() - started)
                 if results:
+                    self._primary_breaker.record_success()
                     return results
                 logger.warning("⚠️ Mistral AI translation failed, trying fallback")
+                self._primary_breaker.record_failure()
             except Exception as e:
                 logger.error(f"❌ Primary provider failed: {e}")
+                self._primary_breaker.record_failure()
 
         # Try fallback providers
-        for provider in self.fallback_providers:
+        for provider, _analyze_fn, translate_fn in self.fallback_chain:
+            if translate_fn is None:
+                continue
             try:
-                provider_name = type(provider).__name__
-                logger.info(f"🔄 Trying fallback translator: {provider_name}")
-
-                if provider_name == "LangChainStockAnalyzer":
-                    return provider.translate_ranked_news(ranked_articles)
-
-                elif provider_name == "MockLLMProvider":
-                    return provider.translate_articles(ranked_articles)
-
+                logger.info(f"🔄 Trying fallback translator: {type(provider).__name__}")
+                return translate_fn(ranked_articles)
             except Exception as e:
-                logger.error(f"❌ Fallback translator {provider_name} failed: {e}")
+                logger.error(f"❌ Fallback translator {type(provider).__name__} failed: {e}")
                 continue
 
         logger.error("❌ All translation providers failed")
@@ -200,9 +463,12 @@ class MultiLLMManager:
 
     def get_status(self) -> Dict:
         """Get status of all LLM providers and web search"""
+        latencies = list(self._primary_latencies)
         status = {
             'total_providers': len(self.providers),
             'active_primary': type(self.primary_provider).__name__ if self.primary_provider else None,
+            'primary_circuit_open': self._primary_breaker.is_open(),
+            'primary_avg_latency': round(sum(latencies) / len(latencies), 3) if latencies else None,
             'fallback_count': len(self.fallback_providers),
             'web_search_enabled': self.web_search is not None,
             'providers': {},
@@ -223,10 +489,8 @@ class MockLLMProvider:
 
     def analyze_articles(self, articles: List[Dict]) -> List[Dict]:
         """Mock analysis of articles"""
-        analyzed_articles = []
-
-        for i, article in enumerate(articles):
-            analyzed_article = {
+        analyzed_articles = [
+            {
                 'original_article': article,
                 'analysis': {
                     'tickers': ['MOCK'],
@@ -238,21 +502,19 @@ class MockLLMProvider:
                 },
                 'enhanced_by_mistral': False
             }
-            analyzed_articles.append(analyzed_article)
+            for i, article in enumerate(articles)
+        ]
 
         logger.info(f"🧪 Mock analyzed {len(analyzed_articles)} articles")
         return analyzed_articles
 
     def translate_articles(self, ranked_articles: List[Dict]) -> List[str]:
         """Mock Thai translation"""
-        translations = []
-
-        for i, article in enumerate(ranked_articles):
-            original = article.get('original_article', {})
-            title = original.get('title', f'Mock Article {i+1}')
-
-            thai_line = f'[{i+1}.] | "{title}" | การวิเคราะห์แบบ mock | MOCK | Mock Source | Mock price impact | 5/10'
-            translations.append(thai_line)
+        translations = [
+            f'[{i+1}.] | "{article.get("original_article", {}).get("title", f"Mock Article {i+1}")}"'
+            f' | การวิเคราะห์แบบ mock | MOCK | Mock Source | Mock price impact | 5/10'
+            for i, article in enumerate(ranked_articles)
+        ]
 
         logger.info(f"🧪 Mock translated {len(translations)} articles")
         return translations
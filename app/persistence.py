@@ -0,0 +1,71 @@
+"""
+Pipeline Run Persistence
+SQLite store for the latest pipeline results across restarts
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'stocknews.db'
+
+# Keep the handful of most recent runs for status endpoints; older
+# rows are pruned on each write
+KEEP_RUNS = 10
+
+
+class RunStore:
+    """SQLite-backed store for completed pipeline runs
+
+    The in-memory last_results on the pipeline disappears on every
+    restart, so the /status and LINE endpoints report nothing until
+    the next broadcast slot. Runs persist here instead; WAL mode with
+    NORMAL synchronous keeps writes off the pipeline's critical path.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS last_run '
+            '(ts INTEGER PRIMARY KEY, results_json TEXT)'
+        )
+        self._conn.commit()
+
+    def save_results(self, results: Dict):
+        """Persist one run's results, pruning old rows"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO last_run VALUES (?, ?)',
+                    (int(time.time()), json.dumps(results))
+                )
+                self._conn.execute(
+                    'DELETE FROM last_run WHERE ts NOT IN '
+                    '(SELECT ts FROM last_run ORDER BY ts DESC LIMIT ?)',
+                    (KEEP_RUNS,)
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to persist pipeline results: {e}")
+
+    def get_last_results(self) -> Optional[Dict]:
+        """Return the most recent run's results, or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT results_json FROM last_run '
+                    'ORDER BY ts DESC LIMIT 1'
+                ).fetchone()
+            if row is not None:
+                return json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Failed to read persisted results: {e}")
+        return None
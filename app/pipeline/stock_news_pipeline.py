@@ -1,16 +1,38 @@
+import functools
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
 
+# Optional: vectorized dedup for large collection batches
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Optional: near-duplicate title detection - catches reworded variants
+# of the same story that exact matching lets through to the LLM
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+# Jaccard similarity above which two titles count as the same story
+NEAR_DUPLICATE_THRESHOLD = 0.85
+MINHASH_PERMUTATIONS = 64
+
 # Import all components
 from app.collectors.base_collector import NewsCollectorManager
 from app.collectors.newsapi_collector import NewsAPICollector
 from app.collectors.rss_collector import RSSCollector
 from app.collectors.alphavantage_collector import AlphaVantageCollector
 from app.analysis.news_analyzer import NewsImpactAnalyzer
+from app.utils.text import normalize_title
 from app.analysis.news_ranker import NewsRanker
 from app.translation.thai_translator import ThaiNewsTranslator
+from app.persistence import RunStore
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +51,11 @@ class StockNewsPipeline:
         # Initialize translator
         self.thai_translator = ThaiNewsTranslator()
 
-        # Pipeline stats
+        # Pipeline stats - last results also persist to SQLite so
+        # status endpoints survive process restarts
         self.last_run = None
         self.last_results = None
+        self._run_store = RunStore()
 
     def _setup_collectors(self):
         """Setup all news collectors"""
@@ -62,10 +86,18 @@ class StockNewsPipeline:
         except Exception as e:
             logger.warning(f"⚠️ Alpha Vantage collector failed: {e}")
 
-    def run_complete_pipeline(self, hours: int = 3) -> Dict:
-        """Run the complete pipeline and return results"""
+    def run_complete_pipeline(self, hours: int = 3,
+                              on_thai_line=None) -> Dict:
+        """Run the complete pipeline and return results
+
+        on_thai_line, when given, is called with each Thai line as its
+        translation completes - a streaming broadcaster can push early
+        lines while the rest are still translating.
+        """
         start_time = time.time()
-        logger.info(f"🚀 Starting Stock News Pipeline for last {hours} hours")
+        # %-style args defer the format work until a handler actually
+        # emits the record
+        logger.info("🚀 Starting Stock News Pipeline for last %d hours", hours)
 
         try:
             # Step 1: Collect news
@@ -77,7 +109,7 @@ class StockNewsPipeline:
                 return self._empty_results("No news articles found")
 
             # Step 2: Analyze impact
-            logger.info(f"🧠 Step 2: Analyzing impact for {len(raw_articles)} articles...")
+            logger.info("🧠 Step 2: Analyzing impact for %d articles...", len(raw_articles))
             analyzed_articles = self._analyze_articles(raw_articles)
 
             if not analyzed_articles:
@@ -85,12 +117,12 @@ class StockNewsPipeline:
                 return self._empty_results("No high-impact news found")
 
             # Step 3: Rank articles
-            logger.info(f"🏆 Step 3: Ranking {len(analyzed_articles)} analyzed articles...")
+            logger.info("🏆 Step 3: Ranking %d analyzed articles...", len(analyzed_articles))
             ranked_articles = self._rank_articles(analyzed_articles)
 
             # Step 4: Translate to Thai
-            logger.info(f"🇹🇭 Step 4: Translating top {len(ranked_articles)} articles to Thai...")
-            thai_news = self._translate_articles(ranked_articles)
+            logger.info("🇹🇭 Step 4: Translating top %d articles to Thai...", len(ranked_articles))
+            thai_news = self._translate_articles(ranked_articles, on_thai_line)
 
             # Step 5: Format final message
             logger.info("📱 Step 5: Formatting final message...")
@@ -119,9 +151,12 @@ class StockNewsPipeline:
 
             self.last_run = datetime.now()
             self.last_results = results
+            self._run_store.save_results(results)
 
-            logger.info(f"✅ Pipeline completed successfully in {processing_time:.2f}s")
-            logger.info(f"📊 Results: {results['raw_collected']} collected → {results['analyzed_count']} analyzed → {results['final_ranked']} ranked → {results['thai_translated']} translated")
+            logger.info("✅ Pipeline completed successfully in %.2fs", processing_time)
+            logger.info("📊 Results: %d collected → %d analyzed → %d ranked → %d translated",
+                        results['raw_collected'], results['analyzed_count'],
+                        results['final_ranked'], results['thai_translated'])
 
             return results
 
@@ -171,10 +206,18 @@ class StockNewsPipeline:
             logger.error(f"Error ranking articles: {e}")
             return []
 
-    def _translate_articles(self, ranked_articles: List[Dict]) -> List[str]:
-        """Translate ranked articles to Thai"""
+    def _translate_articles(self, ranked_articles: List[Dict],
+                            on_thai_line=None) -> List[str]:
+        """Translate ranked articles to Thai, streaming lines as ready"""
         try:
-            thai_news = self.thai_translator.translate_ranked_news(ranked_articles)
+            thai_news = []
+            for line in self.thai_translator.iter_translate_ranked_news(ranked_articles):
+                thai_news.append(line)
+                if on_thai_line is not None:
+                    try:
+                        on_thai_line(line)
+                    except Exception as e:
+                        logger.error(f"Streaming consumer failed: {e}")
             logger.info(f"🇹🇭 Translated {len(thai_news)} articles to Thai")
 
             return thai_news
@@ -195,14 +238,39 @@ class StockNewsPipeline:
             logger.error(f"Error formatting message: {e}")
             return "❌ Error formatting news message"
 
+    # Below this size the plain-Python loop beats the DataFrame setup cost
+    _VECTORIZED_DEDUP_THRESHOLD = 200
+
     def _remove_global_duplicates(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicates across different sources"""
+        """Remove duplicates across different sources
+
+        With datasketch installed, titles dedup by MinHash similarity
+        so reworded variants of the same story ("Tesla Q3 earnings
+        beat" vs "Tesla Q3 earnings beat expectations") collapse to
+        one article before any LLM spend. Large batches otherwise
+        dedup through pandas so the per-article lower/strip
+        normalization runs as C-level Series.str ops instead of a
+        CPython loop; small batches (and trees without either library)
+        keep the plain loop.
+        """
+        if DATASKETCH_AVAILABLE:
+            try:
+                return self._remove_global_duplicates_minhash(articles)
+            except Exception as e:
+                logger.error(f"MinHash dedup failed, using exact match: {e}")
+
+        if PANDAS_AVAILABLE and len(articles) > self._VECTORIZED_DEDUP_THRESHOLD:
+            try:
+                return self._remove_global_duplicates_vectorized(articles)
+            except Exception as e:
+                logger.error(f"Vectorized dedup failed, using plain loop: {e}")
+
         seen_titles = set()
         seen_urls = set()
         unique_articles = []
 
         for article in articles:
-            title = article.get('title', '').lower().strip()
+            title = normalize_title(article.get('title', ''))
             url = article.get('url', '').lower().strip()
 
             # Skip if title or URL already seen
@@ -215,6 +283,64 @@ class StockNewsPipeline:
 
         return unique_articles
 
+    @staticmethod
+    def _title_minhash(title: str) -> 'MinHash':
+        """MinHash over word trigrams of a normalized title"""
+        tokens = title.split()
+        mh = MinHash(num_perm=MINHASH_PERMUTATIONS)
+        for i in range(max(len(tokens) - 2, 1)):
+            mh.update(' '.join(tokens[i:i + 3]).encode('utf-8'))
+        return mh
+
+    @staticmethod
+    def _remove_global_duplicates_minhash(articles: List[Dict]) -> List[Dict]:
+        """Near-duplicate dedup via MinHash LSH over titles
+
+        Exact URL matches stay a set lookup; titles go through an LSH
+        index so any earlier title above NEAR_DUPLICATE_THRESHOLD
+        Jaccard similarity counts as the same story.
+        """
+        lsh = MinHashLSH(threshold=NEAR_DUPLICATE_THRESHOLD,
+                         num_perm=MINHASH_PERMUTATIONS)
+        seen_urls = set()
+        unique_articles = []
+
+        for index, article in enumerate(articles):
+            title = normalize_title(article.get('title', ''))
+            url = article.get('url', '').lower().strip()
+
+            if url in seen_urls or len(title) < 10:
+                continue
+
+            mh = StockNewsPipeline._title_minhash(title)
+            if lsh.query(mh):
+                continue
+
+            lsh.insert(str(index), mh)
+            seen_urls.add(url)
+            unique_articles.append(article)
+
+        return unique_articles
+
+    @staticmethod
+    def _remove_global_duplicates_vectorized(articles: List[Dict]) -> List[Dict]:
+        """Vectorized dedup over normalized title/url keys
+
+        Only the keys go into the DataFrame; survivors are picked from
+        the original list by index so article dicts pass through
+        untouched (no NaN-filled records round-trip).
+        """
+        df = pd.DataFrame({
+            'tk': pd.Series([a.get('title', '') for a in articles]).str.lower().str.strip(),
+            'uk': pd.Series([a.get('url', '') for a in articles]).str.lower().str.strip()
+        })
+        keep = (
+            (df['tk'].str.len() >= 10)
+            & ~df['tk'].duplicated()
+            & ~df['uk'].duplicated()
+        )
+        return [articles[i] for i in df.index[keep]]
+
     def _empty_results(self, reason: str) -> Dict:
         """Return empty results when pipeline fails"""
         return {
@@ -250,18 +376,22 @@ class StockNewsPipeline:
             }
 
     def get_last_results(self) -> Optional[Dict]:
-        """Get results from last pipeline run"""
-        return self.last_results
-
-# Global pipeline instance
-pipeline_instance = None
-
+        """Get results from last pipeline run
+
+        Falls back to the persisted run when this process has not
+        completed one yet (e.g. right after a restart).
+        """
+        if self.last_results is not None:
+            return self.last_results
+        return self._run_store.get_last_results()
+
+# lru_cache gives a thread-safe singleton - the unguarded global check
+# could double-construct the pipeline (and its collector setup) when
+# the scheduler thread and a web request raced on first call
+@functools.lru_cache(maxsize=1)
 def get_pipeline() -> StockNewsPipeline:
     """Get or create pipeline instance"""
-    global pipeline_instance
-    if pipeline_instance is None:
-        pipeline_instance = StockNewsPipeline()
-    return pipeline_instance
+    return StockNewsPipeline()
 
 # Quick function for testing
 def test_pipeline():
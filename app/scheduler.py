@@ -1,15 +1,67 @@
+import functools
 import logging
 import schedule
 import time
 import threading
 from datetime import datetime
+
+# Optional: APScheduler sleeps until the next cron fire instead of the
+# schedule library's wake-every-minute polling loop
+try:
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    APSCHEDULER_AVAILABLE = True
+except ImportError:
+    APSCHEDULER_AVAILABLE = False
+
 from app.pipeline.stock_news_pipeline import get_pipeline
 from app.line_bot.line_pusher import LINEPusher
 from app.line_bot.message_formatter import LineMessageFormatter
-from config import BROADCAST_TIMES
+from config import BROADCAST_TIMES, BROADCAST_TIMES_RAW
 
 logger = logging.getLogger(__name__)
 
+# Flush a streamed broadcast chunk once this many lines or chars buffer
+STREAM_FLUSH_LINES = 5
+STREAM_FLUSH_CHARS = 1500
+
+
+class _StreamBroadcaster:
+    """Buffers Thai lines and pushes chunks to LINE as they arrive
+
+    The first lines reach users while later articles are still
+    translating, instead of the whole broadcast waiting on the slowest
+    translation. Chunks stay far under LINE's 5000-char message limit.
+    """
+
+    def __init__(self, pusher, formatter):
+        self.pusher = pusher
+        self.formatter = formatter
+        self.buffer = []
+        self.buffered_chars = 0
+        self.sent_any = False
+
+    def add(self, line: str):
+        self.buffer.append(line)
+        self.buffered_chars += len(line) + 1
+        if (len(self.buffer) >= STREAM_FLUSH_LINES
+                or self.buffered_chars >= STREAM_FLUSH_CHARS):
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if not self.pusher.available:
+            self.buffer.clear()
+            self.buffered_chars = 0
+            return
+        message = self.formatter.format_text_message("\n".join(self.buffer))
+        if self.pusher.broadcast_message(message):
+            self.sent_any = True
+        self.buffer.clear()
+        self.buffered_chars = 0
+
+
 class NewsScheduler:
     """Schedule automated news processing and broadcasting"""
 
@@ -19,17 +71,40 @@ class NewsScheduler:
         self.message_formatter = LineMessageFormatter()
         self.is_running = False
         self.scheduler_thread = None
+        self._apscheduler = None
 
     def start_scheduler(self):
-        """Start the scheduler in background thread"""
+        """Start the scheduler in background
+
+        With APScheduler installed, cron triggers fire exactly at each
+        BROADCAST_TIMES slot and the thread sleeps until then - no
+        minute-granularity polling and no firing jitter. Without it,
+        the schedule-library polling loop is used.
+        """
         if self.is_running:
             logger.warning("Scheduler is already running")
             return
 
-        # Schedule news processing
-        for broadcast_time in BROADCAST_TIMES:
+        if APSCHEDULER_AVAILABLE:
+            self._apscheduler = BackgroundScheduler()
+            for broadcast_time in BROADCAST_TIMES:
+                self._apscheduler.add_job(
+                    self._process_and_broadcast,
+                    CronTrigger(hour=broadcast_time.hour,
+                                minute=broadcast_time.minute))
+                logger.info("📅 Scheduled news processing at %s",
+                            broadcast_time.strftime('%H:%M'))
+
+            self._apscheduler.add_job(self._health_check, 'interval', hours=1)
+            self._apscheduler.start()
+            self.is_running = True
+            logger.info("🚀 News scheduler started (APScheduler)")
+            return
+
+        # Schedule news processing (the schedule library wants HH:MM strings)
+        for broadcast_time in BROADCAST_TIMES_RAW:
             schedule.every().day.at(broadcast_time).do(self._process_and_broadcast)
-            logger.info(f"📅 Scheduled news processing at {broadcast_time}")
+            logger.info("📅 Scheduled news processing at %s", broadcast_time)
 
         # Add hourly collection check (optional)
         schedule.every().hour.do(self._health_check)
@@ -44,7 +119,11 @@ class NewsScheduler:
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.is_running = False
-        schedule.clear()
+        if self._apscheduler is not None:
+            self._apscheduler.shutdown(wait=False)
+            self._apscheduler = None
+        else:
+            schedule.clear()
         logger.info("⏹️ News scheduler stopped")
 
     def _run_scheduler(self):
@@ -63,14 +142,20 @@ class NewsScheduler:
         try:
             logger.info(f"🚀 Starting scheduled news processing at {datetime.now()}")
 
-            # Run pipeline
-            results = self.pipeline.run_complete_pipeline(hours=3)
+            # Run pipeline, streaming Thai lines to LINE as they are
+            # translated instead of waiting for the full message
+            broadcaster = _StreamBroadcaster(self.line_pusher, self.message_formatter)
+            results = self.pipeline.run_complete_pipeline(hours=3,
+                                                          on_thai_line=broadcaster.add)
 
             if results and results.get('success'):
                 logger.info(f"✅ Pipeline successful: {results.get('thai_translated', 0)} articles")
 
-                # TODO: Add LINE broadcasting here
-                self._broadcast_to_line(results.get('final_message', ''))
+                broadcaster.flush()
+                if not broadcaster.sent_any:
+                    # Nothing streamed (e.g. pusher came up late or no
+                    # lines) - send the assembled message in one push
+                    self._broadcast_to_line(results.get('final_message', ''))
 
             else:
                 logger.error(f"❌ Pipeline failed: {results.get('error', 'Unknown error')}")
@@ -114,26 +199,25 @@ class NewsScheduler:
 
     def get_schedule_status(self):
         """Get current scheduler status"""
-        next_runs = []
-        for job in schedule.jobs:
-            next_runs.append(str(job.next_run))
+        if self._apscheduler is not None:
+            jobs = self._apscheduler.get_jobs()
+            next_runs = [str(job.next_run_time) for job in jobs]
+        else:
+            jobs = schedule.jobs
+            next_runs = [str(job.next_run) for job in jobs]
 
         return {
             'is_running': self.is_running,
-            'scheduled_jobs': len(schedule.jobs),
+            'scheduled_jobs': len(jobs),
             'next_runs': next_runs,
-            'broadcast_times': BROADCAST_TIMES
+            'broadcast_times': BROADCAST_TIMES_RAW
         }
 
-# Global scheduler instance
-scheduler_instance = None
-
+# lru_cache gives a thread-safe singleton without the racy global check
+@functools.lru_cache(maxsize=1)
 def get_scheduler() -> NewsScheduler:
     """Get or create scheduler instance"""
-    global scheduler_instance
-    if scheduler_instance is None:
-        scheduler_instance = NewsScheduler()
-    return scheduler_instance
+    return NewsScheduler()
 
 # Quick scheduler management
 def start_news_scheduler():
@@ -154,7 +238,7 @@ def run_immediate_news():
 if __name__ == "__main__":
     # Simple test runner
     print("🚀 Starting Stock News Scheduler...")
-    print("📅 Scheduled times:", BROADCAST_TIMES)
+    print("📅 Scheduled times:", BROADCAST_TIMES_RAW)
 
     try:
         start_news_scheduler()
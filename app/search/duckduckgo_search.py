@@ -3,7 +3,9 @@ DuckDuckGo Web Search Integration
 Free, no API key required
 """
 
+import asyncio
 import logging
+import threading
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
@@ -16,14 +18,46 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Concurrent context queries in flight at once (DDG rate limits)
+CONTEXT_CONCURRENCY = 8
+
 class DuckDuckGoSearch:
-    """DuckDuckGo web search client"""
+    """DuckDuckGo web search client
+
+    One DDGS client lives for the lifetime of this object - its
+    underlying HTTP session keeps TCP+TLS connections alive across
+    queries instead of paying the handshake on every call.
+    """
 
     def __init__(self):
         self.available = DDGS_AVAILABLE
+        self._ddgs = None
+        self._lock = threading.Lock()
         if not self.available:
             logger.warning("⚠️ DuckDuckGo search not available - library not installed")
 
+    def _client(self) -> 'DDGS':
+        """Get the long-lived DDGS client, creating it on first use"""
+        with self._lock:
+            if self._ddgs is None:
+                self._ddgs = DDGS()
+            return self._ddgs
+
+    def _reset_client(self):
+        """Drop a client whose session failed so the next call rebuilds it"""
+        with self._lock:
+            self._ddgs = None
+
+    def close(self):
+        """Release the underlying HTTP session"""
+        with self._lock:
+            if self._ddgs is not None:
+                try:
+                    self._ddgs.__exit__(None, None, None)
+                except Exception:
+                    pass
+                self._ddgs = None
+
     def search(self, query: str, max_results: int = 5, region: str = 'us-en') -> List[Dict]:
         """
         Search the web using DuckDuckGo
@@ -41,19 +75,19 @@ class DuckDuckGoSearch:
             return []
 
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(
-                    query,
-                    region=region,
-                    safesearch='off',
-                    max_results=max_results
-                ))
+            results = list(self._client().text(
+                query,
+                region=region,
+                safesearch='off',
+                max_results=max_results
+            ))
 
-                logger.info(f"🔍 DuckDuckGo search: '{query}' → {len(results)} results")
-                return results
+            logger.info("🔍 DuckDuckGo search: '%s' → %d results", query, len(results))
+            return results
 
         except Exception as e:
             logger.error(f"DuckDuckGo search error: {e}")
+            self._reset_client()
             return []
 
     def search_news(self, query: str, max_results: int = 5, region: str = 'us-en') -> List[Dict]:
@@ -73,21 +107,55 @@ class DuckDuckGoSearch:
             return []
 
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.news(
-                    query,
-                    region=region,
-                    safesearch='off',
-                    max_results=max_results
-                ))
+            results = list(self._client().news(
+                query,
+                region=region,
+                safesearch='off',
+                max_results=max_results
+            ))
 
-                logger.info(f"📰 DuckDuckGo news: '{query}' → {len(results)} results")
-                return results
+            logger.info("📰 DuckDuckGo news: '%s' → %d results", query, len(results))
+            return results
 
         except Exception as e:
             logger.error(f"DuckDuckGo news search error: {e}")
+            self._reset_client()
             return []
 
+    async def search_async(self, query: str, max_results: int = 5,
+                           region: str = 'us-en') -> List[Dict]:
+        """Async wrapper so callers can overlap multiple searches"""
+        return await asyncio.to_thread(self.search, query, max_results, region)
+
+    async def search_news_async(self, query: str, max_results: int = 5,
+                                region: str = 'us-en') -> List[Dict]:
+        """Async wrapper so callers can overlap multiple news searches"""
+        return await asyncio.to_thread(self.search_news, query, max_results, region)
+
+    @staticmethod
+    def _build_context_query(article: Dict) -> str:
+        """Build the context search query for one article"""
+        title = article.get('title', '')
+        tickers = article.get('analysis', {}).get('tickers', [])
+
+        query_parts = [title]
+        if tickers:
+            query_parts.append(' '.join(tickers[:3]))  # Top 3 tickers
+        query_parts.append('stock news')
+
+        return ' '.join(query_parts)
+
+    @staticmethod
+    def _format_context(results: List[Dict]) -> str:
+        """Format search results into the numbered context block"""
+        context_parts = []
+        for i, result in enumerate(results, 1):
+            context_parts.append(f"{i}. {result.get('title', '')}")
+            body = result.get('body', '')
+            if body:
+                context_parts.append(f"   {body[:200]}...")
+        return "\n".join(context_parts)
+
     def get_context_for_article(self, article: Dict, max_results: int = 3) -> str:
         """
         Get additional context for a news article
@@ -103,33 +171,15 @@ class DuckDuckGoSearch:
             return ""
 
         try:
-            title = article.get('title', '')
-            tickers = article.get('analysis', {}).get('tickers', [])
-
-            # Build search query
-            query_parts = [title]
-            if tickers:
-                query_parts.append(' '.join(tickers[:3]))  # Top 3 tickers
-            query_parts.append('stock news')
-
-            search_query = ' '.join(query_parts)
-
             # Search for context
-            results = self.search_news(search_query, max_results=max_results)
+            results = self.search_news(self._build_context_query(article),
+                                       max_results=max_results)
 
             if not results:
                 return ""
 
-            # Format context
-            context_parts = []
-            for i, result in enumerate(results, 1):
-                context_parts.append(f"{i}. {result.get('title', '')}")
-                body = result.get('body', '')
-                if body:
-                    context_parts.append(f"   {body[:200]}...")
-
-            context = "\n".join(context_parts)
-            logger.info(f"✅ Retrieved context for: {title[:50]}...")
+            context = self._format_context(results)
+            logger.info("✅ Retrieved context for: %.50s...", article.get('title', ''))
 
             return context
 
@@ -137,6 +187,35 @@ class DuckDuckGoSearch:
             logger.error(f"Error getting context: {e}")
             return ""
 
+    def get_contexts_for_articles(self, articles: List[Dict],
+                                  max_results: int = 3) -> List[str]:
+        """Fetch context for a batch of articles with overlapping queries
+
+        Each context is one independent news query, so the batch fans
+        out concurrently - wall time approaches one round trip instead
+        of one per article. Results come back in input order.
+        """
+        if not self.available or not articles:
+            return ["" for _ in articles]
+
+        async def fetch_all() -> List[str]:
+            semaphore = asyncio.Semaphore(CONTEXT_CONCURRENCY)
+
+            async def fetch_one(article: Dict) -> str:
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        self.get_context_for_article, article, max_results)
+
+            return await asyncio.gather(
+                *[fetch_one(article) for article in articles])
+
+        try:
+            return asyncio.run(fetch_all())
+        except RuntimeError:
+            # Already inside an event loop - fetch sequentially
+            return [self.get_context_for_article(article, max_results)
+                    for article in articles]
+
     def verify_news(self, headline: str, tickers: List[str] = None) -> Dict:
         """
         Verify news by searching for corroborating sources
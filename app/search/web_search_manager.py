@@ -3,8 +3,12 @@ Web Search Manager
 Smart manager for web search with fallback logic and caching
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional
+from collections import ChainMap
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from config import (
     WEB_SEARCH_ENABLED, WEB_SEARCH_MAX_RESULTS,
@@ -19,8 +23,60 @@ try:
 except ImportError:
     SEARCH_AVAILABLE = False
 
+# Optional: size+TTL bounded cache. The plain dict only expires
+# entries on read, so under sustained volume it grows without limit.
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+from app.llm_cache import LLMCache
+
 logger = logging.getLogger(__name__)
 
+# Concurrent verification queries in flight at once
+VERIFY_CONCURRENCY = 8
+
+# Search cache bounds - entries evict on size pressure and age
+SEARCH_CACHE_MAXSIZE = 1024
+SEARCH_CACHE_TTL = 3600
+
+# Confidence is quantized into 0.05 buckets so the memoized decision
+# below stays dense over the five axes that actually matter
+_CONFIDENCE_BUCKET = 0.05
+
+
+@lru_cache(maxsize=4096)
+def _search_reasons(confidence_bucket: int, impact_score: int,
+                    ticker_count: int, category: str,
+                    flags: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Reasons to search for one combination of decision inputs
+
+    Pure function of the five axes should_search inspects - the list
+    building, threshold checks and reason formatting run once per
+    distinct combination instead of per article.
+    """
+    reasons = []
+    confidence = confidence_bucket * _CONFIDENCE_BUCKET
+
+    if SEARCH_ON_UNCERTAINTY and confidence < UNCERTAINTY_THRESHOLD:
+        reasons.append(f"low_confidence ({confidence:.2f})")
+
+    if SEARCH_ON_HIGH_IMPACT and impact_score >= HIGH_IMPACT_THRESHOLD:
+        reasons.append(f"high_impact ({impact_score})")
+
+    if SEARCH_ON_MISSING_TICKERS and ticker_count < MIN_TICKERS_REQUIRED:
+        reasons.append(f"missing_tickers ({ticker_count})")
+
+    if category in ('uncertain', 'unknown', ''):
+        reasons.append("uncertain_category")
+
+    if 'truncated' in flags or 'incomplete' in flags:
+        reasons.append("incomplete_content")
+
+    return tuple(reasons)
+
 class WebSearchManager:
     """
     Manages web search operations with intelligent fallback
@@ -30,8 +86,23 @@ class WebSearchManager:
     def __init__(self):
         self.enabled = WEB_SEARCH_ENABLED and SEARCH_AVAILABLE
         self.search_client = None
-        self.cache = {}  # Simple in-memory cache
-        self.cache_ttl = timedelta(hours=1)
+        if CACHETOOLS_AVAILABLE:
+            # Evicts on both size and age in O(1), no manual TTL checks
+            self.cache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE,
+                                  ttl=SEARCH_CACHE_TTL)
+        else:
+            self.cache = {}  # Simple in-memory cache
+        self.cache_ttl = timedelta(seconds=SEARCH_CACHE_TTL)
+
+        # Disk layer under the in-memory cache - the scheduler runs as
+        # a fresh process per slot, so memory-only contexts never
+        # survive to the next broadcast
+        try:
+            self._disk_cache = LLMCache(path='search_cache.db',
+                                        ttl=SEARCH_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Search disk cache unavailable: {e}")
+            self._disk_cache = None
 
         if self.enabled:
             try:
@@ -56,36 +127,20 @@ class WebSearchManager:
         if not self.enabled:
             return False
 
-        # Check various uncertainty indicators
-        reasons = []
-
-        # 1. Low confidence / uncertainty
-        confidence = analysis.get('confidence', 1.0)
-        if SEARCH_ON_UNCERTAINTY and confidence < UNCERTAINTY_THRESHOLD:
-            reasons.append(f"low_confidence ({confidence:.2f})")
-
-        # 2. High impact news (need to be accurate)
-        impact_score = analysis.get('impact_score', 0)
-        if SEARCH_ON_HIGH_IMPACT and impact_score >= HIGH_IMPACT_THRESHOLD:
-            reasons.append(f"high_impact ({impact_score})")
-
-        # 3. Missing or insufficient tickers
-        tickers = analysis.get('tickers', [])
-        if SEARCH_ON_MISSING_TICKERS and len(tickers) < MIN_TICKERS_REQUIRED:
-            reasons.append(f"missing_tickers ({len(tickers)})")
-
-        # 4. Category is uncertain
-        category = analysis.get('category', '')
-        if category in ['uncertain', 'unknown', '']:
-            reasons.append("uncertain_category")
-
-        # 5. Truncated or incomplete content
-        flags = analysis.get('flags', [])
-        if 'truncated' in flags or 'incomplete' in flags:
-            reasons.append("incomplete_content")
+        # Memoized over quantized inputs - repeated articles with the
+        # same uncertainty profile reuse the computed decision
+        reasons = _search_reasons(
+            round(analysis.get('confidence', 1.0) / _CONFIDENCE_BUCKET),
+            analysis.get('impact_score', 0),
+            len(analysis.get('tickers', [])),
+            analysis.get('category', ''),
+            tuple(analysis.get('flags', []))
+        )
 
         if reasons:
-            logger.info(f"🔍 Web search needed: {', '.join(reasons)}")
+            # Join only when a handler will actually emit the record
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔍 Web search needed: %s", ', '.join(reasons))
             return True
 
         return False
@@ -119,19 +174,22 @@ class WebSearchManager:
                 # Store in cache
                 self._set_cached(cache_key, {'context': context, 'timestamp': datetime.now()})
 
-                # Merge context with analysis
-                enhanced = analysis.copy()
-                enhanced['web_search_context'] = context
-                enhanced['enhanced_by_search'] = True
-                enhanced['search_provider'] = 'DuckDuckGo'
+                # Layer the search fields over the analysis instead of
+                # copying it - the overlay is O(1) however large the
+                # underlying analysis payload is
+                overlay = {
+                    'web_search_context': context,
+                    'enhanced_by_search': True,
+                    'search_provider': 'DuckDuckGo'
+                }
 
                 # Potentially boost confidence if we found corroborating info
                 if len(context) > 100:  # Got substantial context
-                    original_confidence = enhanced.get('confidence', 0.5)
-                    enhanced['confidence'] = min(original_confidence + 0.2, 1.0)
-                    logger.info(f"📈 Boosted confidence: {original_confidence:.2f} → {enhanced['confidence']:.2f}")
+                    original_confidence = analysis.get('confidence', 0.5)
+                    overlay['confidence'] = min(original_confidence + 0.2, 1.0)
+                    logger.info("📈 Boosted confidence: %.2f → %.2f", original_confidence, overlay['confidence'])
 
-                return enhanced
+                return ChainMap(overlay, analysis)
 
             return analysis
 
@@ -157,7 +215,7 @@ class WebSearchManager:
             tickers = article.get('analysis', {}).get('tickers', [])
 
             verification = self.search_client.verify_news(title, tickers)
-            logger.info(f"✅ Verification: {verification}")
+            logger.info("✅ Verification: %s", verification)
 
             return verification
 
@@ -165,6 +223,33 @@ class WebSearchManager:
             logger.error(f"Error verifying article: {e}")
             return {'verified': False, 'reason': str(e)}
 
+    def verify_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Verify a batch of articles with overlapping DDG queries
+
+        Each verification is one independent news search, so the whole
+        batch fans out concurrently instead of paying one round trip
+        per article. Results come back in input order.
+        """
+        if not self.enabled or not articles:
+            return [{'verified': False, 'reason': 'search_disabled'}
+                    for _ in articles]
+
+        async def verify_all() -> List[Dict]:
+            semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
+
+            async def verify_one(article: Dict) -> Dict:
+                async with semaphore:
+                    return await asyncio.to_thread(self.verify_article, article)
+
+            return await asyncio.gather(
+                *[verify_one(article) for article in articles])
+
+        try:
+            return asyncio.run(verify_all())
+        except RuntimeError:
+            # Already inside an event loop - verify sequentially
+            return [self.verify_article(article) for article in articles]
+
     def search_latest_news(self, ticker: str, max_results: int = 5) -> List[Dict]:
         """
         Search for latest news about a specific ticker
@@ -188,35 +273,67 @@ class WebSearchManager:
             logger.error(f"Error searching news for {ticker}: {e}")
             return []
 
-    def _get_cache_key(self, article: Dict) -> str:
-        """Generate cache key for article"""
+    def _get_cache_key(self, article: Dict) -> bytes:
+        """Generate cache key for article
+
+        Hashing the full title+url avoids the collisions the old
+        50-char prefix key produced for aggregator articles sharing a
+        title prefix; the 16-byte digest also hashes faster as a dict
+        key than a 100-char string.
+        """
         title = article.get('title', '')
         url = article.get('url', '')
-        return f"{title[:50]}_{url[:50]}"
+        return hashlib.blake2b(f"{title}\x1f{url}".encode('utf-8'),
+                               digest_size=16).digest()
 
-    def _get_cached(self, key: str) -> Optional[Dict]:
+    def _get_cached(self, key: bytes) -> Optional[Dict]:
         """Get cached search result if not expired"""
-        if key in self.cache:
-            cached = self.cache[key]
-            timestamp = cached.get('timestamp', datetime.min)
-            if datetime.now() - timestamp < self.cache_ttl:
+        if CACHETOOLS_AVAILABLE:
+            # TTLCache expires entries itself
+            cached = self.cache.get(key)
+        else:
+            cached = None
+            if key in self.cache:
+                cached = self.cache[key]
+                timestamp = cached.get('timestamp', datetime.min)
+                if datetime.now() - timestamp >= self.cache_ttl:
+                    # Expired, remove from cache
+                    del self.cache[key]
+                    cached = None
+
+        if cached is not None:
+            return cached
+
+        # Memory miss - the disk layer may still have it from an
+        # earlier process
+        if self._disk_cache is not None:
+            try:
+                context = self._disk_cache.get(key.hex())
+            except Exception as e:
+                logger.error(f"Search disk cache read failed: {e}")
+                return None
+            if context:
+                cached = {'context': context, 'timestamp': datetime.now()}
+                self.cache[key] = cached
                 return cached
-            else:
-                # Expired, remove from cache
-                del self.cache[key]
         return None
 
-    def _set_cached(self, key: str, value: Dict):
-        """Set cached value"""
+    def _set_cached(self, key: bytes, value: Dict):
+        """Set cached value in memory and on disk"""
         self.cache[key] = value
+        if self._disk_cache is not None and value.get('context'):
+            try:
+                self._disk_cache.put(key.hex(), value['context'])
+            except Exception as e:
+                logger.error(f"Search disk cache write failed: {e}")
 
     def _merge_analysis(self, analysis: Dict, cached: Dict) -> Dict:
-        """Merge cached data with analysis"""
-        enhanced = analysis.copy()
-        enhanced['web_search_context'] = cached.get('context', '')
-        enhanced['enhanced_by_search'] = True
-        enhanced['from_cache'] = True
-        return enhanced
+        """Merge cached data with analysis as an O(1) layered view"""
+        return ChainMap({
+            'web_search_context': cached.get('context', ''),
+            'enhanced_by_search': True,
+            'from_cache': True
+        }, analysis)
 
     def get_status(self) -> Dict:
         """Get web search manager status"""
@@ -234,7 +351,7 @@ class WebSearchManager:
         """Clear search cache"""
         old_size = len(self.cache)
         self.cache.clear()
-        logger.info(f"🗑️ Cleared {old_size} cached search results")
+        logger.info("🗑️ Cleared %d cached search results", old_size)
 
 
 def test_web_search_manager():
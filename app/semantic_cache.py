@@ -0,0 +1,120 @@
+"""
+Semantic LLM Response Cache
+Embedding-similarity lookup for near-duplicate articles
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+# Optional: embedding + vector index stack. Without it the cache is
+# inert and callers fall through to their exact-match path.
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_DEPS_AVAILABLE = True
+except ImportError:
+    SEMANTIC_DEPS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+EMBED_DIM = 384
+
+# Cosine similarity above which two articles count as the same story
+DEFAULT_SIMILARITY = 0.92
+
+
+class SemanticCache:
+    """Similarity cache over article embeddings
+
+    Exact-hash caching misses the minor rewordings every wire service
+    produces; those still cost full LLM calls. Here the title+lede is
+    embedded with a small local model and looked up in a FAISS inner-
+    product index - any earlier story above the similarity threshold
+    returns its cached analysis. The index and payloads persist to
+    disk so the cache survives scheduler restarts.
+    """
+
+    def __init__(self, path: str = 'semantic_cache',
+                 threshold: float = DEFAULT_SIMILARITY):
+        self.available = SEMANTIC_DEPS_AVAILABLE
+        self.threshold = threshold
+        if not self.available:
+            logger.info("ℹ️ Semantic cache disabled (faiss/sentence-transformers not installed)")
+            return
+
+        self._lock = threading.Lock()
+        self._model = None  # loaded lazily - the model is ~80MB
+        self._index_path = Path(f'{path}.faiss')
+        self._data_path = Path(f'{path}.json')
+
+        try:
+            if self._index_path.exists() and self._data_path.exists():
+                self._index = faiss.read_index(str(self._index_path))
+                self._analyses = json.loads(self._data_path.read_text(encoding='utf-8'))
+                logger.info(f"📦 Semantic cache loaded with {self._index.ntotal} entries")
+                return
+        except Exception as e:
+            logger.error(f"Failed to load semantic cache, starting empty: {e}")
+
+        self._index = faiss.IndexFlatIP(EMBED_DIM)
+        self._analyses = []
+
+    def _encode(self, text: str):
+        """Normalized embedding for one text (inner product = cosine)"""
+        if self._model is None:
+            self._model = SentenceTransformer(EMBED_MODEL)
+        return self._model.encode([text], normalize_embeddings=True)
+
+    @staticmethod
+    def article_key(article: dict) -> str:
+        """Embedding input: title plus the first 500 chars of content"""
+        return f"{article.get('title', '')} {article.get('content', '')[:500]}"
+
+    def get(self, text: str):
+        """Return the cached analysis for a similar article, or None"""
+        if not self.available:
+            return None
+        try:
+            with self._lock:
+                if self._index.ntotal == 0:
+                    return None
+                distances, indices = self._index.search(self._encode(text), 1)
+                if distances[0][0] >= self.threshold:
+                    logger.info("📦 Semantic cache hit - skipping model call")
+                    return self._analyses[indices[0][0]]
+        except Exception as e:
+            logger.error(f"Semantic cache read failed: {e}")
+        return None
+
+    def put(self, text: str, analysis: dict):
+        """Add one analysis under its article embedding"""
+        if not self.available:
+            return
+        try:
+            with self._lock:
+                self._index.add(self._encode(text))
+                self._analyses.append(analysis)
+        except Exception as e:
+            logger.error(f"Semantic cache write failed: {e}")
+
+    def save(self):
+        """Persist the index and payloads to disk"""
+        if not self.available:
+            return
+        try:
+            with self._lock:
+                faiss.write_index(self._index, str(self._index_path))
+                self._data_path.write_text(json.dumps(self._analyses),
+                                           encoding='utf-8')
+        except Exception as e:
+            logger.error(f"Semantic cache persist failed: {e}")
+
+    def stats(self) -> dict:
+        """Entry count and availability for status endpoints"""
+        if not self.available:
+            return {'available': False, 'entries': 0}
+        return {'available': True, 'entries': self._index.ntotal}
@@ -1,33 +1,84 @@
 import logging
-from typing import List, Dict, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from app.analysis.glm_client import GLMClient
 
 logger = logging.getLogger(__name__)
 
+# Translation calls in flight at once; bounded for GLM rate limits
+TRANSLATE_CONCURRENCY = 5
+
+# The whole Thai Unicode block - one compiled char-class scan at C
+# speed instead of rebuilding a character set per call
+_THAI_RE = re.compile('[\\u0E00-\\u0E7F]')
+
+# Per-rank line locators, compiled once - finds the [N.] line in one
+# multiline scan instead of splitting the whole response into a list
+_RANK_RE_CACHE: Dict[int, 're.Pattern'] = {}
+
+
+def _rank_re(rank: int) -> 're.Pattern':
+    return _RANK_RE_CACHE.setdefault(
+        rank, re.compile(rf'^\s*\[{rank}\.\].*$', re.MULTILINE))
+
+
+# Captures the quoted headline and runs of Thai text in one pass over
+# the response, replacing separate find/split scans in the fallback
+_FALLBACK_RE = re.compile('("[^"]*")|([\\u0E00-\\u0E7F]+(?:\\s+[\\u0E00-\\u0E7F]+)*)')
+
 class ThaiNewsTranslator:
     """Translate and format news to Thai using GLM"""
 
     def __init__(self):
         self.glm_client = GLMClient()
 
+        # Read the persona prompt once - it went to disk for every
+        # article translated
+        try:
+            with open('Prompt.txt', 'r', encoding='utf-8') as f:
+                self._real_prompt = f.read()
+        except FileNotFoundError:
+            self._real_prompt = "Persona: US Stock Market Screener"
+
+    def iter_translate_ranked_news(self, ranked_articles: List[Dict]) -> Iterator[str]:
+        """Yield Thai lines in rank order as translations complete
+
+        All translations are submitted up front so the network round-
+        trips overlap; lines still come out in rank order, and rank 1
+        streams to consumers (the LINE broadcaster) without waiting
+        for later articles.
+        """
+        articles = ranked_articles[:10]  # Top 10 articles
+        if not articles:
+            return
+
+        with ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY) as pool:
+            futures = [
+                pool.submit(self._translate_single_article, article, i + 1)
+                for i, article in enumerate(articles)
+            ]
+
+            for i, (article, future) in enumerate(zip(articles, futures)):
+                try:
+                    thai_format = future.result()
+                    if thai_format:
+                        # Slice the title only when a handler will
+                        # actually emit the record
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info("Translated article %d: %.30s...", i + 1,
+                                        article.get('original_article', {}).get('title', 'Unknown'))
+                        yield thai_format
+                    else:
+                        logger.warning("Failed to translate article %d", i + 1)
+
+                except Exception as e:
+                    logger.error("Error translating article %d: %s", i + 1, e)
+                    continue
+
     def translate_ranked_news(self, ranked_articles: List[Dict]) -> List[str]:
         """Translate top ranked news to Thai format"""
-        thai_news_list = []
-
-        for i, article in enumerate(ranked_articles[:10]):  # Top 10 articles
-            try:
-                thai_format = self._translate_single_article(article, i + 1)
-                if thai_format:
-                    thai_news_list.append(thai_format)
-                    logger.info(f"Translated article {i+1}: {article.get('original_article', {}).get('title', 'Unknown')[:30]}...")
-                else:
-                    logger.warning(f"Failed to translate article {i+1}")
-
-            except Exception as e:
-                logger.error(f"Error translating article {i+1}: {e}")
-                continue
-
-        return thai_news_list
+        return list(self.iter_translate_ranked_news(ranked_articles))
 
     def _translate_single_article(self, article: Dict, rank: int) -> Optional[str]:
         """Translate single article to Thai format"""
@@ -64,12 +115,7 @@ class ThaiNewsTranslator:
                                  source: str) -> str:
         """Build prompt for Thai translation using your Prompt.txt persona"""
 
-        # Read the real prompt from Prompt.txt
-        try:
-            with open('Prompt.txt', 'r', encoding='utf-8') as f:
-                real_prompt = f.read()
-        except FileNotFoundError:
-            real_prompt = "Persona: US Stock Market Screener"
+        real_prompt = self._real_prompt
 
         prompt = f"""
 {real_prompt}
@@ -98,12 +144,10 @@ Return ONLY the formatted line in Thai following your exact persona and format.
     def _extract_thai_format(self, response: str, expected_rank: int) -> Optional[str]:
         """Extract and validate Thai format from GLM response"""
         try:
-            # Look for the specific format pattern
-            lines = response.strip().split('\n')
-
-            for line in lines:
-                line = line.strip()
-                if line.startswith(f'[{expected_rank}.]') and '|' in line:
+            # Locate candidate [N.] lines in one multiline regex scan
+            for match in _rank_re(expected_rank).finditer(response):
+                line = match.group(0).strip()
+                if '|' in line:
                     # Validate format components
                     parts = line.split('|')
                     if len(parts) >= 7:  # Should have 7 parts for complete format
@@ -124,32 +168,26 @@ Return ONLY the formatted line in Thai following your exact persona and format.
 
     def _contains_thai(self, text: str) -> bool:
         """Check if text contains Thai characters"""
-        thai_chars = set('กขฃคฅฆงจฉชซฌญฎฏฐฑฒณดตถทธนบปผฝพฟภมยรลวศษสหฬอฮฤฦะาำิีึืฺุูๆเแโใไๅๆ็่้๊๋๋๎๏')
-        return any(char in thai_chars for char in text)
+        return bool(_THAI_RE.search(text))
 
     def _fallback_format_extraction(self, response: str, rank: int) -> Optional[str]:
         """Fallback method to extract or create Thai format"""
         try:
-            # Extract title (usually in quotes)
+            # One regex pass captures the quoted title and Thai runs
+            # together, instead of separate find and per-word scans
             title_match = ""
-            if '"' in response:
-                start = response.find('"')
-                end = response.find('"', start + 1)
-                if end > start:
-                    title_match = response[start:end+1]
-
-            # Extract any Thai text
             thai_parts = []
-            words = response.split()
-            for word in words:
-                if self._contains_thai(word):
-                    thai_parts.append(word)
+            for quoted, thai_run in _FALLBACK_RE.findall(response):
+                if quoted and not title_match:
+                    title_match = quoted
+                elif thai_run:
+                    thai_parts.extend(thai_run.split())
 
             # If we have some components, try to construct format
             if title_match and thai_parts:
                 thai_summary = ' '.join(thai_parts[:10])  # Limit length
                 fallback_line = f'[{rank}.] | {title_match} | {thai_summary} | Various | News | Price impact | Score/10'
-                logger.info(f"Constructed fallback format: {fallback_line[:100]}...")
+                logger.info("Constructed fallback format: %.100s...", fallback_line)
                 return fallback_line
 
         except Exception as e:
@@ -3,5 +3,6 @@ Utility modules for Stock News System
 """
 
 from .safe_logger import get_safe_logger, safe_print, remove_emoji
+from .text import normalize_title
 
-__all__ = ['get_safe_logger', 'safe_print', 'remove_emoji']
+__all__ = ['get_safe_logger', 'safe_print', 'remove_emoji', 'normalize_title']
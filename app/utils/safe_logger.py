@@ -3,11 +3,30 @@ Safe Logger - Remove emoji for Windows compatibility
 Handles emoji encoding issues on Windows console
 """
 
+import atexit
+import functools
 import logging
+import queue
+import re
 import sys
+import threading
+import types
+from logging.handlers import QueueHandler, QueueListener
+
+# C-level JSON serialization for structured log output when available
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _json_dumps(obj):
+        return json.dumps(obj)
 
 # Emoji mapping untuk safe output
-EMOJI_MAP = {
+_EMOJI_MAP_RAW = {
     '✅': '[OK]',
     '❌': '[FAIL]',
     '⚠️': '[WARN]',
@@ -47,10 +66,8 @@ EMOJI_MAP = {
     '🌐': '[GLOBE]',
     '🗺️': '[MAP]',
     '🔗': '[LINK]',
-    '🔐': '[LOCK]',
     '🔓': '[UNLOCK]',
     '💻': '[PC]',
-    '📱': '[PHONE]',
     '⌚': '[WATCH]',
     '🖥️': '[DESKTOP]',
     '⌨️': '[KEYBOARD]',
@@ -58,58 +75,157 @@ EMOJI_MAP = {
     '🖨️': '[PRINTER]',
 }
 
+# Guard against duplicate literal keys silently overriding earlier
+# entries (the dict literal once carried two and nobody noticed)
+if __debug__:
+    assert len(_EMOJI_MAP_RAW) == 46, len(_EMOJI_MAP_RAW)
+
+# Read-only view for importers - the map feeds precomputed tables
+# below, so a stray write elsewhere would silently stop matching
+EMOJI_MAP = types.MappingProxyType(_EMOJI_MAP_RAW)
+
+# Single-codepoint emoji (the majority of the map) go through one
+# C-level str.translate pass; only multi-codepoint sequences (VS16
+# variants, flag pairs) need the alternation regex, matched longest
+# first so sequences win over their prefixes
+_TRANS = str.maketrans({ord(emoji): replacement
+                        for emoji, replacement in _EMOJI_MAP_RAW.items()
+                        if len(emoji) == 1})
+_MULTI_RE = re.compile('|'.join(
+    re.escape(emoji)
+    for emoji in sorted((e for e in _EMOJI_MAP_RAW if len(e) > 1),
+                        key=len, reverse=True)))
+
+# Bound method avoids a global dict lookup per match in the sub callback
+_EMOJI_GET = _EMOJI_MAP_RAW.__getitem__
+
+# Periodic log lines repeat the same emoji-laden strings every run -
+# the memo returns the cleaned string without rescanning
+@functools.lru_cache(maxsize=4096)
 def remove_emoji(text: str) -> str:
     """Remove emoji from text and replace with safe alternatives"""
-    if not text:
+    # Most log lines are plain ASCII - isascii is a single C byte
+    # scan, far cheaper than the replace/encode cycle below
+    if not text or text.isascii():
         return text
 
-    result = text
-    for emoji, replacement in EMOJI_MAP.items():
-        result = result.replace(emoji, replacement)
+    result = _MULTI_RE.sub(lambda m: _EMOJI_GET(m.group(0)), text)
+    result = result.translate(_TRANS)
 
-    # Remove any remaining emoji
-    result = result.encode('ascii', 'ignore').decode('ascii')
+    # When every emoji was in the map, the result is already pure
+    # ASCII and the bytes round-trip is skipped; only strings with
+    # unmapped non-ASCII still pay the encode/decode fallback
+    if not result.isascii():
+        result = result.encode('ascii', 'ignore').decode('ascii')
 
     return result
 
-def safe_print(text: str, **kwargs):
-    """Print text safely without emoji encoding errors"""
-    safe_text = remove_emoji(str(text))
-    print(safe_text, **kwargs)
+def safe_print(*args, sep: str = ' ', end: str = '\n'):
+    """Print safely without emoji encoding errors, in one write
+
+    A single sys.stdout.write replaces print's per-argument writes
+    and lock round-trips - one syscall per call on slow consoles.
+    """
+    safe_text = remove_emoji(sep.join(str(arg) for arg in args))
+    sys.stdout.write(safe_text + end)
 
 class SafeFormatter(logging.Formatter):
-    """Custom formatter that removes emoji"""
+    """Custom formatter that removes emoji
 
-    def format(self, record):
-        # Remove emoji from the message
-        record.msg = remove_emoji(str(record.msg))
+    Stripping only happens when ascii_only is set - a UTF-8 stream
+    (or a log file) keeps the emoji and skips the pass entirely.
+
+    With json_mode the record is emitted as one JSON object per line
+    instead of %-formatted text; the serializer is injectable and
+    defaults to orjson when installed.
+    """
 
-        # Format the record
-        formatted = super().format(record)
+    def __init__(self, fmt=None, datefmt=None, ascii_only=True,
+                 json_mode=False, dumps=_json_dumps):
+        super().__init__(fmt, datefmt)
+        self.ascii_only = ascii_only
+        self.json_mode = json_mode
+        self._dumps = dumps
+
+    def format(self, record):
+        if not self.json_mode:
+            return super().format(record)
+
+        message = record.getMessage()
+        if self.ascii_only and not message.isascii():
+            message = remove_emoji(message)
+        payload = {
+            'time': self.formatTime(record, self.datefmt),
+            'name': record.name,
+            'level': record.levelname,
+            'message': message,
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return self._dumps(payload)
+
+    def formatMessage(self, record):
+        # ASCII messages (most records) skip the emoji pass entirely
+        if self.ascii_only and not record.message.isascii():
+            # Clean a copy - the record is shared by every handler, and
+            # rewriting msg in place would hand downstream formatters a
+            # pre-substituted template with stale %-args
+            record = logging.makeLogRecord(record.__dict__)
+            record.message = remove_emoji(record.message)
+        return super().formatMessage(record)
+
+# One background listener drains all safe loggers' records to the
+# console, so logger.info callers never block on the (slow, especially
+# on Windows) console write or the emoji pass
+_log_queue = None
+_queue_listener = None
+_listener_lock = threading.Lock()
+
+
+def _get_log_queue() -> queue.SimpleQueue:
+    """Get the shared log queue, starting the listener thread once"""
+    global _log_queue, _queue_listener
+    if _log_queue is None:
+        with _listener_lock:
+            if _log_queue is None:
+                console_handler = logging.StreamHandler(sys.stdout)
+                encoding = (getattr(console_handler.stream, 'encoding', '')
+                            or '').lower()
+                console_handler.setFormatter(SafeFormatter(
+                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S',
+                    ascii_only=encoding not in ('utf-8', 'utf8')
+                ))
+                log_queue = queue.SimpleQueue()
+                _queue_listener = QueueListener(log_queue, console_handler)
+                _queue_listener.start()
+                atexit.register(_queue_listener.stop)
+                _log_queue = log_queue
+    return _log_queue
 
-        return formatted
 
 def get_safe_logger(name: str, level=logging.INFO) -> logging.Logger:
-    """Get a logger with safe emoji handling"""
+    """Get a logger with safe emoji handling
+
+    Records are handed to a background listener thread that runs the
+    SafeFormatter and console write, so the calling thread returns as
+    soon as the record is enqueued.
+    """
     logger = logging.getLogger(name)
+
+    # Already configured by an earlier call - don't tear down and
+    # rebuild the handler on every import
+    if getattr(logger, '_safe_configured', False):
+        return logger
+
     logger.setLevel(level)
 
     # Remove existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
 
-    # Create console handler with safe formatter
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-
-    # Create safe formatter
-    formatter = SafeFormatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
-
-    logger.addHandler(console_handler)
+    logger.addHandler(QueueHandler(_get_log_queue()))
+    logger._safe_configured = True
 
     return logger
 
@@ -0,0 +1,23 @@
+"""
+Text normalization helpers
+Shared title cleanup for dedup, analysis, and ranking
+"""
+
+import re
+from functools import lru_cache
+
+# Collapses runs of whitespace (tabs, newlines, doubled spaces) so two
+# feeds' renderings of the same headline normalize identically
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def normalize_title(title: str) -> str:
+    """Lowercase and whitespace-normalize a title
+
+    Cached because the same title passes through dedup, analysis, and
+    ranking within one pipeline run - and recurs across scheduler
+    runs - so repeat normalizations become a dict hit instead of new
+    string allocations.
+    """
+    return _WHITESPACE_RE.sub(' ', title.lower()).strip()
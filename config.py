@@ -1,28 +1,72 @@
 import os
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment-derived settings, read and coerced exactly once
+
+    Frozen + slots: attribute reads skip __dict__ lookups, and derived
+    values (like the MISTRAL_ENABLE_SEARCH bool) are computed at load
+    instead of wherever they happen to be used.
+    """
+    news_api_key: str
+    alpha_vantage_key: str
+    line_channel_access_token: str
+    line_channel_secret: str
+    glm_api_key: str
+    glm_model: str
+    mistral_api_key: str
+    mistral_model: str
+    mistral_enable_search: bool
+    database_url: str
+    redis_url: str
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load .env and build the Settings singleton"""
+    load_dotenv()
+    return Settings(
+        news_api_key=os.getenv('NEWS_API_KEY', 'YOUR_NEWSAPI_KEY'),
+        alpha_vantage_key=os.getenv('ALPHA_VANTAGE_KEY', 'YOUR_ALPHA_VANTAGE_KEY'),
+        line_channel_access_token=os.getenv('LINE_CHANNEL_ACCESS_TOKEN', 'YOUR_LINE_TOKEN'),
+        line_channel_secret=os.getenv('LINE_CHANNEL_SECRET', 'YOUR_LINE_SECRET'),
+        glm_api_key=os.getenv('GLM_API_KEY'),
+        glm_model="glm-4.6",
+        mistral_api_key=os.getenv('MISTRAL_API_KEY'),
+        mistral_model=os.getenv('MISTRAL_MODEL', 'mistral-large-latest'),
+        mistral_enable_search=os.getenv('MISTRAL_ENABLE_SEARCH', 'True').lower() == 'true',
+        database_url=os.getenv('DATABASE_URL', 'sqlite:///stocknews.db'),
+        redis_url=os.getenv('REDIS_URL', 'redis://localhost:6379'),
+    )
+
+
+settings = get_settings()
+
+# Module-level names kept for existing `from config import X` callers
 
 # API Keys
-NEWS_API_KEY = os.getenv('NEWS_API_KEY', 'YOUR_NEWSAPI_KEY')
-ALPHA_VANTAGE_KEY = os.getenv('ALPHA_VANTAGE_KEY', 'YOUR_ALPHA_VANTAGE_KEY')
-LINE_CHANNEL_ACCESS_TOKEN = os.getenv('LINE_CHANNEL_ACCESS_TOKEN', 'YOUR_LINE_TOKEN')
-LINE_CHANNEL_SECRET = os.getenv('LINE_CHANNEL_SECRET', 'YOUR_LINE_SECRET')
+NEWS_API_KEY = settings.news_api_key
+ALPHA_VANTAGE_KEY = settings.alpha_vantage_key
+LINE_CHANNEL_ACCESS_TOKEN = settings.line_channel_access_token
+LINE_CHANNEL_SECRET = settings.line_channel_secret
 
 # GLM Configuration
-GLM_API_KEY = os.getenv('GLM_API_KEY')
-GLM_MODEL = "glm-4.6"
+GLM_API_KEY = settings.glm_api_key
+GLM_MODEL = settings.glm_model
 
 # Mistral AI Configuration
-MISTRAL_API_KEY = os.getenv('MISTRAL_API_KEY')
-MISTRAL_MODEL = os.getenv('MISTRAL_MODEL', 'mistral-large-latest')
-MISTRAL_ENABLE_SEARCH = os.getenv('MISTRAL_ENABLE_SEARCH', 'True').lower() == 'true'
+MISTRAL_API_KEY = settings.mistral_api_key
+MISTRAL_MODEL = settings.mistral_model
+MISTRAL_ENABLE_SEARCH = settings.mistral_enable_search
 
 # Database
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///stocknews.db')
-REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
+DATABASE_URL = settings.database_url
+REDIS_URL = settings.redis_url
 
 # News Collection Settings
 NEWS_TIME_RANGE_HOURS = 3
@@ -30,23 +74,36 @@ MAX_ARTICLES_PER_SOURCE = 20
 MIN_IMPACT_SCORE = 5  # Only analyze articles with potential impact >= 5
 
 # Large Cap Stocks (Priority List)
-LARGE_CAP_STOCKS = [
+# Kept in priority order (collectors slice the top N); the old list
+# carried HD and CRM twice, padding queries with duplicate keywords
+LARGE_CAP_STOCKS = (
     'AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NVDA', 'TSLA',
     'JPM', 'V', 'PG', 'JNJ', 'WMT', 'UNH', 'HD', 'MA', 'BAC', 'XOM',
     'CVX', 'LLY', 'ABBV', 'PFE', 'KO', 'PEP', 'TMO', 'AVGO', 'COST',
     'CRM', 'ACN', 'NKE', 'ADBE', 'TXN', 'NFLX', 'CMCSA', 'INTC',
-    'AMD', 'HD', 'PYPL', 'DIS', 'VZ', 'CSCO', 'CRM'
-]
+    'AMD', 'PYPL', 'DIS', 'VZ', 'CSCO'
+)
+
+# O(1) membership checks (ticker validation)
+LARGE_CAP_STOCK_SET = frozenset(LARGE_CAP_STOCKS)
 
 # Reliable News Sources (Priority)
-RELIABLE_SOURCES = [
+RELIABLE_SOURCES = (
     'bloomberg.com', 'reuters.com', 'wsj.com', 'cnbc.com',
     'yahoo.com', 'marketwatch.com', 'barrons.com', 'seekingalpha.com',
     'fool.com', 'investopedia.com', 'benzinga.com'
-]
+)
+
+# O(1) membership checks (source filtering)
+RELIABLE_SOURCE_SET = frozenset(RELIABLE_SOURCES)
 
 # Scheduling
-BROADCAST_TIMES = ['09:00', '13:00', '17:00']  # 9AM, 1PM, 5PM
+# Raw HH:MM strings for display and the schedule library's .at();
+# BROADCAST_TIMES is parsed once here so the scheduler compares
+# integers instead of re-parsing strings
+BROADCAST_TIMES_RAW = ('09:00', '13:00', '17:00')  # 9AM, 1PM, 5PM
+BROADCAST_TIMES = tuple(datetime.strptime(t, '%H:%M').time()
+                        for t in BROADCAST_TIMES_RAW)
 NEWS_COLLECTION_INTERVAL = 15  # Every 15 minutes
 
 # Output Format (from Prompt.txt)
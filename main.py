@@ -7,31 +7,67 @@ Hybrid Architecture: Free News APIs + GLM Analysis + LINE Bot
 import logging
 import os
 import sys
+import threading
 from datetime import datetime
 
 # Add app directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.pipeline.stock_news_pipeline import test_pipeline, get_pipeline
-from app.scheduler import start_news_scheduler, run_immediate_news
-from config import BROADCAST_TIMES
-
-# Setup logging
+# Probe the console encoding once instead of paying a try/except
+# UnicodeEncodeError on every emoji print (it always fails on cp1252)
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except Exception:
+    pass
+_ASCII_ONLY = (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8')
+
+from config import BROADCAST_TIMES_RAW
+
+# Pipeline and scheduler imports pull in collectors, the GLM client,
+# requests and feedparser - deferred into each mode function so the
+# banner and menu come up fast and option 5 never loads them
+
+from app.utils.safe_logger import SafeFormatter
+
+# Setup logging - the UTF-8 log file keeps emoji intact; only the
+# console strips them, and only when its encoding can't show them
+_file_handler = logging.FileHandler('stocknews.log', encoding='utf-8')
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(SafeFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    ascii_only=_ASCII_ONLY
+))
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('stocknews.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_file_handler, _console_handler]
 )
 
 logger = logging.getLogger(__name__)
 
+def safe_emit(s_emoji, s_ascii=None):
+    """Print the emoji or ASCII variant based on the console probe
+
+    One flag check replaces the try/except UnicodeEncodeError copies
+    that used to wrap every emoji print in main().
+    """
+    print(s_ascii if _ASCII_ONLY and s_ascii is not None else s_emoji)
+
 def print_banner():
     """Print application banner"""
-    try:
-        banner = """
+    if _ASCII_ONLY:
+        print("\n".join([
+            "=" * 60,
+            "STOCK NEWS SYSTEM - Hybrid AI-Powered News Analysis",
+            "Sources: NewsAPI, RSS Feeds, Alpha Vantage",
+            "Analysis: GLM AI Impact Scoring",
+            "Translation: Thai Language Formatting",
+            "Output: LINE Bot Broadcasting",
+            "=" * 60,
+        ]))
+        return
+
+    banner = """
 ╔═══════════════════════════════════════════════════════════════╗
 ║                    📈 STOCK NEWS SYSTEM                     ║
 ║              Hybrid AI-Powered News Analysis                ║
@@ -42,31 +78,11 @@ def print_banner():
 ║  📱 Output: LINE Bot Broadcasting                            ║
 ╚═══════════════════════════════════════════════════════════════╝
 """
-        print(banner)
-    except UnicodeEncodeError:
-        print("="*60)
-        print("STOCK NEWS SYSTEM - Hybrid AI-Powered News Analysis")
-        print("Sources: NewsAPI, RSS Feeds, Alpha Vantage")
-        print("Analysis: GLM AI Impact Scoring")
-        print("Translation: Thai Language Formatting")
-        print("Output: LINE Bot Broadcasting")
-        print("="*60)
+    print(banner)
 
 def show_menu():
     """Show main menu"""
-    try:
-        menu = """
-🚀 Stock News System Menu:
-
-1. 🧪 Test Pipeline (Run once)
-2. ⚡ Run Immediate News Analysis
-3. 📅 Start Scheduled News Bot
-4. 📊 Show System Status
-5. ❌ Exit
-
-Please select option (1-5): """
-        return input(menu).strip()
-    except UnicodeEncodeError:
+    if _ASCII_ONLY:
         menu = """
 Stock News System Menu:
 
@@ -77,7 +93,18 @@ Stock News System Menu:
 5. Exit
 
 Please select option (1-5): """
-        return input(menu).strip()
+    else:
+        menu = """
+🚀 Stock News System Menu:
+
+1. 🧪 Test Pipeline (Run once)
+2. ⚡ Run Immediate News Analysis
+3. 📅 Start Scheduled News Bot
+4. 📊 Show System Status
+5. ❌ Exit
+
+Please select option (1-5): """
+    return input(menu).strip()
 
 def test_pipeline_mode():
     """Test the complete pipeline"""
@@ -86,16 +113,21 @@ def test_pipeline_mode():
     print("="*60)
 
     try:
+        from app.pipeline.stock_news_pipeline import test_pipeline
+
         results = test_pipeline()
 
         if results and results.get('success'):
-            print("\n✅ PIPELINE TEST SUCCESSFUL!")
-            print(f"📊 Statistics:")
-            print(f"   • Articles collected: {results.get('raw_collected', 0)}")
-            print(f"   • Articles analyzed: {results.get('analyzed_count', 0)}")
-            print(f"   • Articles ranked: {results.get('final_ranked', 0)}")
-            print(f"   • Articles translated: {results.get('thai_translated', 0)}")
-            print(f"   • Processing time: {results.get('processing_time', 0)}s")
+            # One buffered write instead of a syscall per line
+            sys.stdout.write("\n".join([
+                "\n✅ PIPELINE TEST SUCCESSFUL!",
+                "📊 Statistics:",
+                f"   • Articles collected: {results.get('raw_collected', 0)}",
+                f"   • Articles analyzed: {results.get('analyzed_count', 0)}",
+                f"   • Articles ranked: {results.get('final_ranked', 0)}",
+                f"   • Articles translated: {results.get('thai_translated', 0)}",
+                f"   • Processing time: {results.get('processing_time', 0)}s",
+            ]) + "\n")
 
             # Ask if user wants to see the message
             show_msg = input("\n📱 Show the translated message? (y/n): ").strip().lower()
@@ -120,19 +152,24 @@ def run_immediate_mode():
     print("This will process the latest news and show results.\n")
 
     try:
+        from app.scheduler import run_immediate_news
+
         results = run_immediate_news(hours=3)
 
         if results and results.get('success'):
-            print(f"✅ Analysis completed!")
-            print(f"📊 Found {results.get('thai_translated', 0)} high-impact news articles")
-            print(f"⏱️  Processing time: {results.get('processing_time', 0)}s")
+            lines = [
+                "✅ Analysis completed!",
+                f"📊 Found {results.get('thai_translated', 0)} high-impact news articles",
+                f"⏱️  Processing time: {results.get('processing_time', 0)}s",
+            ]
 
             # Preview message
             message = results.get('final_message', '')
             if len(message) > 200:
-                print(f"📱 Message preview: {message[:200]}...")
+                lines.append(f"📱 Message preview: {message[:200]}...")
             else:
-                print(f"📱 Message: {message}")
+                lines.append(f"📱 Message: {message}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print(f"❌ Analysis failed: {results.get('error', 'Unknown error')}")
 
@@ -144,16 +181,16 @@ def run_immediate_mode():
 def start_scheduler_mode():
     """Start the scheduled news bot"""
     print("\n📅 Starting scheduled news bot...")
-    print(f"🕐 Schedule times: {', '.join(BROADCAST_TIMES)}")
+    print(f"🕐 Schedule times: {', '.join(BROADCAST_TIMES_RAW)}")
     print("Press Ctrl+C to stop the scheduler.\n")
 
     try:
+        from app.scheduler import start_news_scheduler
+
         start_news_scheduler()
 
-        # Keep the program running
-        while True:
-            import time
-            time.sleep(1)
+        # Block until Ctrl+C - no once-a-second wakeups just to stay alive
+        threading.Event().wait()
 
     except KeyboardInterrupt:
         print("\n⏹️ Stopping scheduler...")
@@ -171,27 +208,33 @@ def show_system_status():
     print("="*60)
 
     try:
+        from app.pipeline.stock_news_pipeline import get_pipeline
+
         pipeline = get_pipeline()
         status = pipeline.get_system_status()
 
-        print(f"🏥 System Health: {status.get('system_health', 'unknown').upper()}")
-        print(f"🕐 Last Run: {status.get('last_run', 'Never')}")
-        print(f"📰 Collectors: {status.get('collectors_count', 0)}")
-
-        print("\n📰 Collector Status:")
+        # Build the whole report, then flush it in one write
+        lines = [
+            f"🏥 System Health: {status.get('system_health', 'unknown').upper()}",
+            f"🕐 Last Run: {status.get('last_run', 'Never')}",
+            f"📰 Collectors: {status.get('collectors_count', 0)}",
+            "",
+            "📰 Collector Status:",
+        ]
         collectors = status.get('collectors_status', {})
         for name, collector_status in collectors.items():
-            print(f"   • {name}: {collector_status.get('status', 'unknown')}")
+            lines.append(f"   • {name}: {collector_status.get('status', 'unknown')}")
 
         # Last results if available
         last_results = pipeline.get_last_results()
         if last_results:
-            print(f"\n📈 Last Results:")
-            print(f"   • Success: {last_results.get('success', False)}")
-            print(f"   • Processed: {last_results.get('raw_collected', 0)} → {last_results.get('thai_translated', 0)} articles")
-            print(f"   • Processing time: {last_results.get('processing_time', 0)}s")
+            lines.append("\n📈 Last Results:")
+            lines.append(f"   • Success: {last_results.get('success', False)}")
+            lines.append(f"   • Processed: {last_results.get('raw_collected', 0)} → {last_results.get('thai_translated', 0)} articles")
+            lines.append(f"   • Processing time: {last_results.get('processing_time', 0)}s")
         else:
-            print(f"\n📈 No previous results found")
+            lines.append("\n📈 No previous results found")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     except Exception as e:
         print(f"❌ Error getting status: {e}")
@@ -216,28 +259,17 @@ def main():
             elif choice == '4':
                 show_system_status()
             elif choice == '5':
-                try:
-                    print("\n👋 Goodbye!")
-                except UnicodeEncodeError:
-                    print("\nGoodbye!")
+                safe_emit("\n👋 Goodbye!", "\nGoodbye!")
                 break
             else:
-                try:
-                    print("❌ Invalid option. Please try again.")
-                except UnicodeEncodeError:
-                    print("Invalid option. Please try again.")
+                safe_emit("❌ Invalid option. Please try again.",
+                          "Invalid option. Please try again.")
 
         except KeyboardInterrupt:
-            try:
-                print("\n\n👋 Goodbye!")
-            except UnicodeEncodeError:
-                print("\n\nGoodbye!")
+            safe_emit("\n\n👋 Goodbye!", "\n\nGoodbye!")
             break
         except Exception as e:
-            try:
-                print(f"❌ Error: {e}")
-            except UnicodeEncodeError:
-                print(f"Error: {e}")
+            safe_emit(f"❌ Error: {e}", f"Error: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,100 +6,126 @@ Run this to verify everything is working
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add app to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def test_imports():
     """Test that all modules can be imported"""
-    print("🔍 Testing imports...")
+    lines = ["🔍 Testing imports..."]
+    ok = True
 
     try:
         from app.collectors.newsapi_collector import NewsAPICollector
-        print("✅ NewsAPI collector imported")
+        lines.append("✅ NewsAPI collector imported")
     except Exception as e:
-        print(f"❌ NewsAPI import error: {e}")
+        ok = False
+        lines.append(f"❌ NewsAPI import error: {e}")
 
     try:
         from app.collectors.rss_collector import RSSCollector
-        print("✅ RSS collector imported")
+        lines.append("✅ RSS collector imported")
     except Exception as e:
-        print(f"❌ RSS import error: {e}")
+        ok = False
+        lines.append(f"❌ RSS import error: {e}")
 
     try:
         from app.analysis.glm_client import GLMClient
-        print("✅ GLM client imported")
+        lines.append("✅ GLM client imported")
     except Exception as e:
-        print(f"❌ GLM client import error: {e}")
+        ok = False
+        lines.append(f"❌ GLM client import error: {e}")
 
     try:
         from app.pipeline.stock_news_pipeline import get_pipeline
-        print("✅ Pipeline imported")
+        lines.append("✅ Pipeline imported")
     except Exception as e:
-        print(f"❌ Pipeline import error: {e}")
+        ok = False
+        lines.append(f"❌ Pipeline import error: {e}")
+
+    return 'imports', ok, "\n".join(lines)
 
 def test_glm():
     """Test GLM connection"""
-    print("\n🤖 Testing GLM connection...")
+    lines = ["🤖 Testing GLM connection..."]
+    ok = True
 
     try:
         from app.analysis.glm_client import test_glm_connection
         is_working = test_glm_connection()
 
         if is_working:
-            print("✅ GLM connection working!")
+            lines.append("✅ GLM connection working!")
         else:
-            print("⚠️ GLM using mock responses - connect your GLM function")
+            lines.append("⚠️ GLM using mock responses - connect your GLM function")
 
     except Exception as e:
-        print(f"❌ GLM test error: {e}")
+        ok = False
+        lines.append(f"❌ GLM test error: {e}")
+
+    return 'glm', ok, "\n".join(lines)
 
 def test_collectors():
     """Test news collectors"""
-    print("\n📰 Testing news collectors...")
+    lines = ["📰 Testing news collectors..."]
+    ok = True
 
     try:
         from app.collectors.rss_collector import RSSCollector
         rss = RSSCollector()
         status = rss.get_feed_status()
-        print(f"✅ RSS collector status: {status['working_feeds']}/{status['total_feeds']} feeds working")
+        lines.append(f"✅ RSS collector status: {status['working_feeds']}/{status['total_feeds']} feeds working")
 
     except Exception as e:
-        print(f"❌ RSS collector error: {e}")
+        ok = False
+        lines.append(f"❌ RSS collector error: {e}")
 
     try:
         from app.collectors.alphavantage_collector import AlphaVantageCollector
         av = AlphaVantageCollector()
         status = av.get_api_status()
-        print(f"✅ Alpha Vantage status: {status['status']}")
+        lines.append(f"✅ Alpha Vantage status: {status['status']}")
 
     except Exception as e:
-        print(f"❌ Alpha Vantage collector error: {e}")
+        ok = False
+        lines.append(f"❌ Alpha Vantage collector error: {e}")
+
+    return 'collectors', ok, "\n".join(lines)
 
 def test_pipeline():
     """Test the complete pipeline"""
-    print("\n🚀 Testing complete pipeline...")
+    lines = ["🚀 Testing complete pipeline..."]
+    ok = True
 
     try:
         from app.pipeline.stock_news_pipeline import get_pipeline
         pipeline = get_pipeline()
 
         # This will use mock data since we don't want to make real API calls in tests
-        print("✅ Pipeline initialized successfully")
-        print("💡 Run 'python main.py' and select option 1 for full pipeline test")
+        lines.append("✅ Pipeline initialized successfully")
+        lines.append("💡 Run 'python main.py' and select option 1 for full pipeline test")
 
     except Exception as e:
-        print(f"❌ Pipeline test error: {e}")
+        ok = False
+        lines.append(f"❌ Pipeline test error: {e}")
+
+    return 'pipeline', ok, "\n".join(lines)
 
 def main():
-    """Run all tests"""
+    """Run all tests
+
+    The GLM and collector checks are network-bound, so the independent
+    tests run through a thread pool and their round-trips overlap;
+    printing stays in the main thread so output never interleaves.
+    """
     print("🧪 Stock News System - Quick Tests")
     print("=" * 50)
 
-    test_imports()
-    test_glm()
-    test_collectors()
-    test_pipeline()
+    checks = [test_imports, test_glm, test_collectors, test_pipeline]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for name, ok, msg in executor.map(lambda f: f(), checks):
+            print("\n" + msg)
 
     print("\n" + "=" * 50)
     print("📊 Test Summary:")
@@ -110,4 +136,4 @@ def main():
     print("\n🎯 Ready when all major components show ✅")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()